@@ -1,5 +1,7 @@
 import os
 import sys
+import time
+import asyncio
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
@@ -11,6 +13,13 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.yescity_recommendation_ai.api.routes import router as api_router
 from src.yescity_recommendation_ai.utils.logger import setup_logger
 from src.yescity_recommendation_ai.database.mongodb_client import mongodb_client
+from src.yescity_recommendation_ai.api.dependencies import providers
+from src.yescity_recommendation_ai.database.indexes import ensure_indexes
+from src.yescity_recommendation_ai.database.collection_registry import collection_registry
+from src.yescity_recommendation_ai.database.facets import facets_cache
+from src.yescity_recommendation_ai.database.derived_fields import derived_fields_maintainer
+from src.yescity_recommendation_ai.database.projections import find_missing_name_fields
+from src.yescity_recommendation_ai.services.response_cache import response_cache
 
 load_dotenv()
 
@@ -22,18 +31,76 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events."""
     # Startup
     logger.info("🚀 Starting YesCity Recommendation API")
+    startup_started = time.perf_counter()
     try:
-        # Test MongoDB connection
-        mongodb_client.db.command("ping")
+        # Create this worker's MongoDB clients (post-fork) and load collection metadata
+        await mongodb_client.startup()
         logger.info("✅ MongoDB connection established")
     except Exception as e:
         logger.error(f"❌ MongoDB connection failed: {e}")
     
+    if os.getenv("MONGODB_ENSURE_INDEXES", "true").lower() == "true":
+        try:
+            # Idempotent: existing indexes are left untouched
+            await asyncio.to_thread(ensure_indexes, mongodb_client.db)
+            logger.info("✅ MongoDB indexes ensured")
+        except Exception as e:
+            logger.error(f"❌ Ensuring MongoDB indexes failed: {e}")
+    
+    try:
+        # Food scores (minRating, ranking) and location points (nearby search)
+        # are stored: rewrite stale ones (or, with DERIVED_FIELDS_BACKFILL=false,
+        # report them), then keep them in step with later writes
+        await asyncio.to_thread(derived_fields_maintainer.ensure, mongodb_client.db)
+        derived_fields_maintainer.start(mongodb_client.db)
+        logger.info("✅ Derived fields checked")
+    except Exception as e:
+        logger.error(f"❌ Checking derived fields failed: {e}")
+    
+    try:
+        # Only foods has a known schema; the other collections are assumed to use "name"
+        missing_names = await asyncio.to_thread(find_missing_name_fields, mongodb_client.db)
+        if missing_names:
+            logger.warning(
+                f"⚠️ No documents with the expected name field in: {', '.join(missing_names)} "
+                f"(declare name_field in database/search_specs.py)"
+            )
+    except Exception as e:
+        logger.error(f"❌ Checking name fields failed: {e}")
+    
+    try:
+        # Reload collection metadata (index creation may add collections), then keep it fresh
+        await asyncio.to_thread(collection_registry.refresh, mongodb_client.db)
+        collection_registry.start(mongodb_client.db)
+        logger.info("✅ Collection metadata loaded")
+    except Exception as e:
+        logger.error(f"❌ Collection metadata loading failed: {e}")
+    
+    try:
+        # Distinct cities/categories for /cities and /categories; data changes
+        # it detects also invalidate cached recommendations for that collection
+        if response_cache is not None:
+            facets_cache.add_change_listener(response_cache.invalidate)
+        await asyncio.to_thread(facets_cache.refresh, mongodb_client.db)
+        facets_cache.start(mongodb_client.db)
+        logger.info("✅ Facets cache loaded")
+    except Exception as e:
+        logger.error(f"❌ Facets cache loading failed: {e}")
+    
+    # Services are imported on first use; crew templates warm in the background
+    await providers.startup()
+    
+    logger.info(f"✅ Startup completed in {(time.perf_counter() - startup_started) * 1000:.0f}ms (pid {os.getpid()})")
+    
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down YesCity Recommendation API")
-    mongodb_client.close()
+    collection_registry.stop()
+    facets_cache.stop()
+    derived_fields_maintainer.stop()
+    await providers.shutdown()
+    await mongodb_client.shutdown()
 
 # Create FastAPI app
 app = FastAPI(
@@ -69,6 +136,8 @@ async def root():
             "recommend": "/api/v1/recommend (POST)",
             "category_search": "/api/v1/category-search (POST)",
             "foods": "/api/v1/foods (GET)",
+            "search": "/api/v1/search/{collection}?city= (GET)",
+            "nearby": "/api/v1/nearby?lat=&lon=&radius= (GET)",
             "health": "/api/v1/health (GET)",
             "docs": "/docs"
         }
@@ -79,7 +148,7 @@ async def health_check():
     """Health check endpoint."""
     try:
         # Check MongoDB
-        mongodb_client.db.command("ping")
+        await mongodb_client.async_db.command("ping")
         db_status = "healthy"
     except Exception as e:
         db_status = f"unhealthy: {str(e)}"
@@ -96,13 +165,17 @@ if __name__ == "__main__":
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", 8000))
     debug = os.getenv("DEBUG", "true").lower() == "true"
+    # Each worker is a separate process with its own MongoDB pools
+    # (MONGODB_MAX_POOL_SIZE is per worker); reload only works with one worker
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
     
-    logger.info(f"🌐 Starting server on {host}:{port}")
+    logger.info(f"🌐 Starting server on {host}:{port} with {workers} worker(s)")
     
     uvicorn.run(
         "main:app",
         host=host,
         port=port,
-        reload=debug,
+        reload=debug and workers == 1,
+        workers=workers,
         log_level="info"
     )
\ No newline at end of file
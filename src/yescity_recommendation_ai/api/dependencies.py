@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import os
+from typing import Optional
+
+class ServiceProviders:
+    """
+    Lazily created services for the API routes.
+
+    Routes receive services through FastAPI Depends() instead of importing
+    them at module level, so importing the router does not pull in crewai,
+    litellm or langchain_community. Each service is imported on first use;
+    startup()/shutdown() are driven by the lifespan in main.py.
+    """
+
+    def __init__(self):
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._batcher = None
+
+    @property
+    def query_classifier(self):
+        from ..services.query_classifier import query_classifier
+        return query_classifier
+
+    @property
+    def classification_batcher(self):
+        from ..services.classification_batcher import classification_batcher
+        self._batcher = classification_batcher
+        return classification_batcher
+
+    @property
+    def recommendation_service(self):
+        from ..services.recommendation_service import recommendation_service
+        return recommendation_service
+
+    @property
+    def crew_manager(self):
+        from ..crew.crew_manager import crew_manager
+        return crew_manager
+
+    def _load_gazetteer(self):
+        # Imports the classifier module and runs one distinct query per collection
+        self.query_classifier.fast_classifier.load_cities_from_database()
+
+    def _warm(self):
+        # One thread imports the heavy packages in order (langchain_community,
+        # then crewai/litellm) so they are not imported concurrently
+        self.query_classifier.llm
+        # crewai's telemetry tries to install signal handlers on import and
+        # logs a traceback off the main thread; uvicorn owns the signals anyway
+        logging.getLogger("crewai.telemetry.telemetry").setLevel(logging.ERROR)
+        # Parses the crew YAML configs and builds the agent templates
+        self.crew_manager.warm_templates()
+        print("✅ Classifier and crew templates loaded")
+
+    async def startup(self):
+        """
+        Load the fast-path city gazetteer, then warm the classifier LLM and
+        crew templates off the startup path (PROVIDERS_WARM_UP).
+
+        The app accepts requests, including fast-path classification and data
+        access, while the heavy packages load in a background thread.
+        """
+        try:
+            # City gazetteer of the fast-path classifier, loaded before requests arrive
+            await asyncio.to_thread(self._load_gazetteer)
+        except Exception as e:
+            print(f"⚠️ Fast-path gazetteer not loaded at startup: {e}")
+
+        if os.getenv("PROVIDERS_WARM_UP", "true").lower() != "true":
+            return
+        self._warmup_task = asyncio.create_task(asyncio.to_thread(self._warm))
+        self._warmup_task.add_done_callback(self._log_warmup_failure)
+
+    @staticmethod
+    def _log_warmup_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            print(f"❌ Service warm-up failed: {task.exception()}")
+
+    async def shutdown(self):
+        """Wait for pending classification batches and warm-up so the process exits cleanly."""
+        if self._batcher is not None:
+            await self._batcher.shutdown()
+        if self._warmup_task is not None and not self._warmup_task.done():
+            try:
+                await self._warmup_task
+            except Exception:
+                pass
+        self._warmup_task = None
+
+# Create singleton instance
+providers = ServiceProviders()
+
+def get_query_classifier():
+    return providers.query_classifier
+
+def get_classification_batcher():
+    return providers.classification_batcher
+
+def get_recommendation_service():
+    return providers.recommendation_service
@@ -1,43 +1,46 @@
+import asyncio
 import time
-from fastapi import APIRouter, HTTPException, Query, Depends
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import Optional, List, Dict, Any
 from bson import ObjectId
 
 from .schemas import (
     UserQueryRequest, 
+    BatchClassifyRequest,
     CategoryQueryRequest,
     RecommendationResponse,
     ErrorResponse,
     HealthCheckResponse
 )
-from ..services.recommendation_service import recommendation_service
-from ..services.query_classifier import query_classifier
+from .dependencies import get_classification_batcher, get_query_classifier, get_recommendation_service
+from ..models.user_query import QueryContext
+from ..services.category_search_service import category_search_service
+from ..services.export_service import export_service
+from ..services.response_cache import response_cache
+from ..services.single_flight import recommendation_flights
 from ..database.mongodb_client import mongodb_client
+from ..database.collection_registry import DATA_COLLECTIONS, collection_registry
+from ..database.facets import facets_cache
+from ..database.derived_fields import derived_fields_maintainer
+from ..database.query_builder import QueryBuilder
+from ..database.projections import get_full_view_projection
+from ..database.pagination import count_cache, decode_cursor, encode_cursor
+from ..database.search_specs import resolve_category
+from ..database.geo import GEO_COLLECTIONS, DISTANCE_FIELD, build_geo_near_pipeline
+from ..crew.crew_scheduler import crew_scheduler, CrewQueueFullError
 from ..utils.logger import logger
+from ..utils.serialization import BSONJSONResponse
 
 router = APIRouter()
 
-def convert_objectid_to_str(data: Any) -> Any:
-    """
-    Recursively convert all ObjectId instances to strings in nested structures.
-    
-    Args:
-        data: Any data structure (dict, list, ObjectId, or primitive)
-        
-    Returns:
-        The same structure with all ObjectId instances converted to strings
-    """
-    if isinstance(data, ObjectId):
-        return str(data)
-    elif isinstance(data, dict):
-        return {key: convert_objectid_to_str(value) for key, value in data.items()}
-    elif isinstance(data, list):
-        return [convert_objectid_to_str(item) for item in data]
-    else:
-        return data
-
 @router.post("/recommend", response_model=RecommendationResponse, tags=["Recommendations"])
-async def get_recommendations(request: UserQueryRequest):
+async def get_recommendations(
+    request: UserQueryRequest,
+    classification_batcher = Depends(get_classification_batcher),
+    recommendation_service = Depends(get_recommendation_service)
+):
     """
     Get travel recommendations based on natural language query.
     Uses Ollama for query classification and CrewAI for recommendations.
@@ -46,29 +49,40 @@ async def get_recommendations(request: UserQueryRequest):
     start_time = time.time()
     
     try:
-        result = recommendation_service.get_recommendations(request.query)
+        # Classify through the micro-batcher so concurrent requests share LLM calls
+        context = QueryContext(user_query=request.query)
+        with context.timed("classify"):
+            context.classification = await classification_batcher.classify(request.query)
+        
+        result = await recommendation_service.aget_recommendations(request.query, context=context)
         processing_time = time.time() - start_time
         
         if result.get("success"):
-            response = RecommendationResponse(
-                success=True,
-                message="Recommendations retrieved successfully",
-                category=result.get("category", "unknown"),
-                city=result.get("city"),
-                parameters=result.get("parameters", {}),
-                recommendations=[
-                    {
-                        "_id": rec["_id"],
-                        "name": rec["name"],
-                        "type": result.get("category")
-                    }
-                    for rec in result.get("recommendations", [])
-                ],
-                full_data=result.get("full_data", []),
-                processing_time=round(processing_time, 3)
-            )
-            logger.info(f"✅ Processed in {processing_time:.3f}s - Found {len(response.recommendations)} items")
-            return response
+            # Documents are encoded straight from BSON; the payload follows
+            # RecommendationResponse without re-validating full_data
+            recommendations = [
+                {
+                    "_id": rec["_id"],
+                    "name": rec["name"],
+                    "type": result.get("category")
+                }
+                for rec in result.get("recommendations", [])
+            ]
+            stage_timings = result.get("stage_timings", {})
+            logger.info(f"✅ Processed in {processing_time:.3f}s {stage_timings} - Found {len(recommendations)} items")
+            return BSONJSONResponse({
+                "success": True,
+                "message": "Recommendations retrieved successfully",
+                "category": result.get("category", "unknown"),
+                "city": result.get("city"),
+                "parameters": result.get("parameters", {}),
+                "recommendations": recommendations,
+                "full_data": result.get("full_data", []),
+                "processing_time": round(processing_time, 3),
+                "stage_timings": stage_timings,
+                "cache": result.get("cache"),
+                "timestamp": datetime.now()
+            })
         else:
             logger.warning(f"❌ Failed: {result.get('error')}")
             raise HTTPException(
@@ -78,6 +92,24 @@ async def get_recommendations(request: UserQueryRequest):
                 ).dict()
             )
             
+    except HTTPException:
+        raise
+    except CrewQueueFullError as e:
+        logger.warning(f"🚦 Rejected: {str(e)}")
+        error_response = ErrorResponse(
+            error="Too many recommendation requests in progress, please retry later.",
+            details={"category": e.category, "retry_after": e.retry_after}
+        )
+        return JSONResponse(
+            status_code=429,
+            headers={"Retry-After": str(e.retry_after)},
+            content={
+                "success": error_response.success,
+                "error": error_response.error,
+                "details": error_response.details,
+                "timestamp": error_response.timestamp.isoformat()
+            }
+        )
     except Exception as e:
         logger.error(f"💥 Error: {str(e)}")
         error_response = ErrorResponse(
@@ -94,50 +126,97 @@ async def get_recommendations(request: UserQueryRequest):
         )
 
 @router.post("/category-search", response_model=RecommendationResponse, tags=["Recommendations"])
-async def category_search(request: CategoryQueryRequest):
+async def category_search(
+    request: CategoryQueryRequest,
+    recommendation_service = Depends(get_recommendation_service)
+):
     """
     Get recommendations by category (for UI buttons).
     Example: {"category": "foods", "city": "Agra", "filters": {"category": "Sweets"}}
+    
+    Served by one indexed, server-side ranked database query without any
+    LLM call. Set rerank=true to have the crew pick and order the results.
     """
     logger.info(f"🔍 Category search: {request.category} in {request.city}")
     start_time = time.time()
     
     try:
-        result = recommendation_service.get_recommendations_by_category(
-            category=request.category,
-            city=request.city,
-            **request.filters
-        )
+        # Validated here so an unknown category never reaches the crew
+        category = resolve_category(request.category)
+        if request.rerank:
+            result = await recommendation_service.aget_recommendation_by_category(
+                category,
+                request.city,
+                **request.filters
+            )
+        else:
+            result = await category_search_service.search(
+                category,
+                request.city,
+                filters=request.filters,
+                limit=request.limit
+            )
         
         processing_time = time.time() - start_time
         
         if result.get("success"):
-            response = RecommendationResponse(
-                success=True,
-                message=f"{request.category.capitalize()} recommendations retrieved",
-                category=request.category,
-                city=request.city,
-                parameters=request.filters,
-                recommendations=[
-                    {
-                        "_id": rec["_id"],
-                        "name": rec["name"],
-                        "type": request.category
-                    }
-                    for rec in result.get("recommendations", [])
-                ],
-                full_data=result.get("full_data", []),
-                processing_time=round(processing_time, 3)
-            )
-            return response
+            recommendations = [
+                {
+                    "_id": rec["_id"],
+                    "name": rec["name"],
+                    "type": category
+                }
+                for rec in result.get("recommendations", [])
+            ]
+            logger.info(f"✅ Category search in {processing_time:.3f}s - Found {len(recommendations)} items")
+            return BSONJSONResponse({
+                "success": True,
+                "message": f"{category.capitalize()} recommendations retrieved",
+                "category": category,
+                "city": request.city,
+                "parameters": request.filters,
+                "recommendations": recommendations,
+                "full_data": result.get("full_data", []),
+                "processing_time": round(processing_time, 3),
+                "stage_timings": result.get("stage_timings", {}),
+                "cache": result.get("cache"),
+                "timestamp": datetime.now()
+            })
         else:
+            error_response = ErrorResponse(
+                error=result.get("error", "Unknown error")
+            )
             raise HTTPException(
-                status_code=501 if "not implemented" in result.get("error", "").lower() else 400,
-                detail=ErrorResponse(
-                    error=result.get("error", "Unknown error")
-                ).dict()
+                status_code=501 if "not implemented" in error_response.error.lower() else 400,
+                detail={
+                    "success": error_response.success,
+                    "error": error_response.error,
+                    "details": error_response.details,
+                    "timestamp": error_response.timestamp.isoformat()
+                }
             )
             
+    except HTTPException:
+        raise
+    except ValueError as e:
+        # Unknown category or unsupported filter
+        raise HTTPException(status_code=400, detail=str(e))
+    except CrewQueueFullError as e:
+        logger.warning(f"🚦 Rejected: {str(e)}")
+        error_response = ErrorResponse(
+            error="Too many recommendation requests in progress, please retry later.",
+            details={"category": e.category, "retry_after": e.retry_after}
+        )
+        return JSONResponse(
+            status_code=429,
+            headers={"Retry-After": str(e.retry_after)},
+            content={
+                "success": error_response.success,
+                "error": error_response.error,
+                "details": error_response.details,
+                "timestamp": error_response.timestamp.isoformat()
+            }
+        )
     except Exception as e:
         logger.error(f"💥 Category search error: {str(e)}")
         error_response = ErrorResponse(
@@ -158,32 +237,75 @@ async def get_foods(
     city: Optional[str] = Query(None, description="Filter by city"),
     category: Optional[str] = Query(None, description="Filter by category"),
     limit: int = Query(10, ge=1, le=100),
-    skip: int = Query(0, ge=0)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(False, description="Also return the total number of matches"),
+    skip: int = Query(0, ge=0, description="Deprecated: offset paging, use cursor instead")
 ):
-    """Direct access to foods collection with filtering."""
+    """
+    Direct access to foods collection with filtering.
+    
+    Pages are keyset-paginated on _id: pass the returned next_cursor to get
+    the next page. The total is only computed when include_total=true.
+    """
+    filters = {"city": city, "category": category}
     try:
-        collection = mongodb_client.get_foods_collection()
-        query = {}
+        after_id = decode_cursor(cursor, filters) if cursor else None
+    except ValueError as e:
+        error_response = ErrorResponse(error=str(e))
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": error_response.success,
+                "error": error_response.error,
+                "details": error_response.details,
+                "timestamp": error_response.timestamp.isoformat()
+            }
+        )
+    
+    try:
+        collection = mongodb_client.get_async_foods_collection()
+        builder = QueryBuilder()
         
         if city:
-            query["cityName"] = {"$regex": city, "$options": "i"}
+            builder.equals("cityName", city)
         if category:
-            query["category"] = {"$regex": category, "$options": "i"}
-        
-        cursor = collection.find(query).skip(skip).limit(limit)
-        results = list(cursor)
+            builder.equals("category", category)
+        count_query, collation = builder.build()
+        query = dict(count_query)
+        if after_id is not None:
+            query["_id"] = {"$gt": after_id}
         
-        # Convert all ObjectId fields to strings recursively
-        results = convert_objectid_to_str(results)
+        # One extra document tells whether another page exists
+        find_cursor = collection.find(query, collation=collation).sort("_id", 1)
+        if skip and after_id is None:
+            find_cursor = find_cursor.skip(skip)
+        results = await find_cursor.limit(limit + 1).to_list()
+        has_more = len(results) > limit
+        results = results[:limit]
+        next_cursor = encode_cursor(results[-1]["_id"], filters) if has_more else None
         
-        return {
+        response = {
             "success": True,
             "count": len(results),
-            "total": collection.count_documents(query),
-            "filters": {"city": city, "category": category},
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+            "filters": filters,
             "data": results
         }
         
+        if include_total:
+            if not count_query:
+                # Collection metadata, no scan
+                response["total"] = await collection.estimated_document_count()
+            else:
+                total = count_cache.get("foods", filters)
+                if total is None:
+                    total = await collection.count_documents(count_query, collation=collation)
+                    count_cache.set("foods", filters, total)
+                response["total"] = total
+        
+        return BSONJSONResponse(response)
+        
     except Exception as e:
         error_response = ErrorResponse(
             error=f"Error accessing foods: {str(e)}"
@@ -202,28 +324,25 @@ async def get_foods(
 async def get_food_by_id(food_id: str):
     """Get specific food document by ID."""
     try:
-        collection = mongodb_client.get_foods_collection()
+        collection = mongodb_client.get_async_foods_collection()
         
         # Try to find by ObjectId
-        try:
-            doc = collection.find_one({"_id": ObjectId(food_id)})
-        except:
-            doc = None
+        doc = None
+        if ObjectId.is_valid(food_id):
+            doc = await collection.find_one({"_id": ObjectId(food_id)})
         
         # If not found by ObjectId, try by foodPlace name
         if not doc:
-            doc = collection.find_one({"foodPlace": {"$regex": f"^{food_id}$", "$options": "i"}})
+            query, collation = QueryBuilder().equals("foodPlace", food_id).build()
+            doc = await collection.find_one(query, collation=collation)
         
         if not doc:
             raise HTTPException(status_code=404, detail="Food place not found")
         
-        # Convert all ObjectId fields to strings recursively
-        doc = convert_objectid_to_str(doc)
-        
-        return {
+        return BSONJSONResponse({
             "success": True,
             "data": doc
-        }
+        })
         
     except HTTPException:
         raise
@@ -241,26 +360,231 @@ async def get_food_by_id(food_id: str):
             }
         )
 
-@router.get("/cities", tags=["Utilities"])
-async def get_cities():
-    """Get all unique cities from foods collection."""
+@router.get("/search/{collection}", tags=["Data Access"])
+async def search_collection(
+    collection: str,
+    request: Request,
+    city: str = Query(..., description="City name"),
+    limit: int = Query(10, ge=1, le=100)
+):
+    """
+    Structured search of any collection, e.g. /search/accommodations?city=Goa&category=Hostel
+    
+    Any other query parameters are filters declared for the collection in
+    database/search_specs.py; results are ranked server-side where the
+    collection has a ranking.
+    """
+    filters = {
+        key: value for key, value in request.query_params.items()
+        if key not in ("city", "limit")
+    }
+    try:
+        result = await category_search_service.search(collection, city, filters=filters, limit=limit)
+    except ValueError as e:
+        # Unknown collection or unsupported filter
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        error_response = ErrorResponse(
+            error=f"Error searching {collection}: {str(e)}"
+        )
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "success": error_response.success,
+                "error": error_response.error,
+                "details": error_response.details,
+                "timestamp": error_response.timestamp.isoformat()
+            }
+        )
+    
+    return BSONJSONResponse({
+        "success": True,
+        "collection": collection,
+        "city": city,
+        "filters": filters,
+        "count": len(result["full_data"]),
+        "stage_timings": result["stage_timings"],
+        "data": result["full_data"]
+    })
+
+@router.get("/nearby", tags=["Data Access"])
+async def get_nearby(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude"),
+    radius: float = Query(2000, gt=0, le=50000, description="Search radius in meters"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    collection: str = Query("foods", description="Collection to search"),
+    limit: int = Query(10, ge=1, le=100),
+    skip: int = Query(0, ge=0)
+):
+    """Places near a location, nearest first, served by the 2dsphere index."""
+    if collection not in GEO_COLLECTIONS:
+        error_response = ErrorResponse(
+            error=f"Nearby search is not available for '{collection}'",
+            details={"collections": GEO_COLLECTIONS}
+        )
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": error_response.success,
+                "error": error_response.error,
+                "details": error_response.details,
+                "timestamp": error_response.timestamp.isoformat()
+            }
+        )
+    
     try:
-        collection = mongodb_client.get_foods_collection()
+        builder = QueryBuilder()
+        if category:
+            builder.equals("category", category)
+        query, collation = builder.build()
         
-        pipeline = [
-            {"$group": {"_id": "$cityName"}},
-            {"$sort": {"_id": 1}},
-            {"$limit": 50}
-        ]
+        # One extra document tells whether another page exists
+        pipeline = build_geo_near_pipeline(
+            lat, lon, radius,
+            query_filter=query,
+            skip=skip,
+            limit=limit + 1,
+            projection=get_full_view_projection(collection)
+        )
+        mongo_collection = mongodb_client.get_async_collection(collection)
+        results = await (await mongo_collection.aggregate(pipeline, collation=collation)).to_list()
+        has_more = len(results) > limit
+        results = results[:limit]
+        for doc in results:
+            doc[DISTANCE_FIELD] = round(doc.get(DISTANCE_FIELD, 0))
         
-        results = list(collection.aggregate(pipeline))
-        cities = [doc["_id"] for doc in results if doc.get("_id")]
+        return BSONJSONResponse({
+            "success": True,
+            "count": len(results),
+            "has_more": has_more,
+            "next_skip": skip + limit if has_more else None,
+            "filters": {"lat": lat, "lon": lon, "radius": radius, "category": category, "collection": collection},
+            "data": results
+        })
         
-        return {
+    except Exception as e:
+        error_response = ErrorResponse(
+            error=f"Error searching nearby {collection}: {str(e)}"
+        )
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "success": error_response.success,
+                "error": error_response.error,
+                "details": error_response.details,
+                "timestamp": error_response.timestamp.isoformat()
+            }
+        )
+
+@router.get("/export/{collection}", tags=["Data Access"])
+async def export_collection(
+    collection: str,
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    city: Optional[str] = Query(None, description="Filter by city"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include"),
+    batch_size: int = Query(500, ge=1, le=5000, description="Documents fetched per round trip"),
+    gzip: Optional[bool] = Query(None, description="Force (true) or disable (false) compression; by default follows Accept-Encoding")
+):
+    """
+    Stream a collection as NDJSON or CSV straight from a Mongo cursor.
+    
+    Memory use is independent of the result size, so whole cities (or whole
+    collections) can be pulled in one request.
+    """
+    if collection not in DATA_COLLECTIONS:
+        error_response = ErrorResponse(
+            error=f"Unknown collection '{collection}'",
+            details={"collections": DATA_COLLECTIONS}
+        )
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": error_response.success,
+                "error": error_response.error,
+                "details": error_response.details,
+                "timestamp": error_response.timestamp.isoformat()
+            }
+        )
+    
+    field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    projection = export_service.build_projection(collection, field_list)
+    # CSV needs its columns up front: the requested fields or the collection's full view
+    csv_fields = field_list or (list(projection) if projection else None)
+    if format == "csv" and not csv_fields:
+        error_response = ErrorResponse(
+            error=f"CSV export of '{collection}' needs fields=<comma-separated fields>",
+            details={"collection": collection}
+        )
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": error_response.success,
+                "error": error_response.error,
+                "details": error_response.details,
+                "timestamp": error_response.timestamp.isoformat()
+            }
+        )
+    documents = export_service.iter_documents(
+        collection, city=city, category=category, projection=projection, batch_size=batch_size
+    )
+    
+    if format == "csv":
+        chunks = export_service.csv_chunks(documents, csv_fields)
+        media_type = "text/csv"
+    else:
+        chunks = export_service.ndjson_chunks(documents)
+        media_type = "application/x-ndjson"
+    
+    headers = {"Content-Disposition": f'attachment; filename="{collection}.{format}"'}
+    if gzip is None:
+        headers["Vary"] = "Accept-Encoding"
+        gzip = export_service.accepts_gzip(request.headers.get("accept-encoding", ""))
+    if gzip:
+        chunks = export_service.gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    
+    logger.info(f"📤 Exporting {collection} as {format} (city={city}, category={category})")
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+async def _load_facets():
+    """Build the facets on first use if they were not loaded at startup."""
+    if not facets_cache.loaded:
+        await asyncio.to_thread(facets_cache.ensure_loaded, mongodb_client.db)
+
+def _validate_facet_collection(collection: Optional[str]):
+    if collection is not None and collection not in DATA_COLLECTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown collection '{collection}'. Use one of: {', '.join(DATA_COLLECTIONS)}"
+        )
+
+@router.get("/cities", tags=["Utilities"])
+async def get_cities(
+    collection: Optional[str] = Query(None, description="Limit to one collection; all collections by default"),
+    include_counts: bool = Query(False, description="Include document counts per city")
+):
+    """
+    Get all unique cities, served from the materialized facets cache.
+    
+    The listing is complete (not capped) and sorted by name.
+    """
+    _validate_facet_collection(collection)
+    try:
+        await _load_facets()
+        view = facets_cache.cities(collection)
+        
+        response = {
             "success": True,
-            "count": len(cities),
-            "cities": cities
+            "collection": collection,
+            "count": len(view["names"]),
+            "cities": view["names"]
         }
+        if include_counts:
+            response["counts"] = view["counts"]
+        return response
         
     except Exception as e:
         error_response = ErrorResponse(
@@ -276,26 +600,65 @@ async def get_cities():
             }
         )
 
-@router.get("/categories", tags=["Utilities"])
-async def get_categories():
-    """Get all unique categories from foods collection."""
+@router.get("/cities/{city}", tags=["Utilities"])
+async def get_city_facets(city: str):
+    """Get document counts per collection and the categories available in one city."""
     try:
-        collection = mongodb_client.get_foods_collection()
+        await _load_facets()
+        counts = facets_cache.city_collections(city)
+        if not counts:
+            raise HTTPException(status_code=404, detail=f"City '{city}' not found")
         
-        pipeline = [
-            {"$group": {"_id": "$category"}},
-            {"$sort": {"_id": 1}},
-            {"$limit": 50}
-        ]
+        return {
+            "success": True,
+            "city": city,
+            "total": sum(counts.values()),
+            "collections": counts,
+            "categories": facets_cache.categories(city=city)["counts"]
+        }
         
-        results = list(collection.aggregate(pipeline))
-        categories = [doc["_id"] for doc in results if doc.get("_id")]
+    except HTTPException:
+        raise
+    except Exception as e:
+        error_response = ErrorResponse(
+            error=f"Error fetching city facets: {str(e)}"
+        )
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "success": error_response.success,
+                "error": error_response.error,
+                "details": error_response.details,
+                "timestamp": error_response.timestamp.isoformat()
+            }
+        )
+
+@router.get("/categories", tags=["Utilities"])
+async def get_categories(
+    collection: Optional[str] = Query(None, description="Limit to one collection; all collections by default"),
+    city: Optional[str] = Query(None, description="Only categories present in this city"),
+    include_counts: bool = Query(False, description="Include document counts per category")
+):
+    """
+    Get all unique categories, served from the materialized facets cache.
+    
+    The listing is complete (not capped) and sorted by name.
+    """
+    _validate_facet_collection(collection)
+    try:
+        await _load_facets()
+        view = facets_cache.categories(collection, city)
         
-        return {
+        response = {
             "success": True,
-            "count": len(categories),
-            "categories": categories
+            "collection": collection,
+            "city": city,
+            "count": len(view["names"]),
+            "categories": view["names"]
         }
+        if include_counts:
+            response["counts"] = view["counts"]
+        return response
         
     except Exception as e:
         error_response = ErrorResponse(
@@ -312,10 +675,13 @@ async def get_categories():
         )
 
 @router.get("/classify", tags=["Utilities"])
-async def classify_query(query: str = Query(..., min_length=2)):
+async def classify_query(
+    query: str = Query(..., min_length=2),
+    classification_batcher = Depends(get_classification_batcher)
+):
     """Classify a query using Ollama."""
     try:
-        classification = query_classifier.classify_query(query)
+        classification = await classification_batcher.classify(query)
         return {
             "query": query,
             "classification": classification.dict()
@@ -334,8 +700,44 @@ async def classify_query(query: str = Query(..., min_length=2)):
             }
         )
 
+@router.post("/classify/batch", tags=["Utilities"])
+async def classify_batch(
+    request: BatchClassifyRequest,
+    classification_batcher = Depends(get_classification_batcher)
+):
+    """Classify several queries in one call, batching the ones that need Ollama."""
+    try:
+        classifications = await classification_batcher.classify_many(request.queries)
+        return {
+            "success": True,
+            "count": len(classifications),
+            "classifications": [
+                {
+                    "query": query,
+                    "classification": classification.dict()
+                }
+                for query, classification in zip(request.queries, classifications)
+            ]
+        }
+    except Exception as e:
+        error_response = ErrorResponse(
+            error=f"Error classifying queries: {str(e)}"
+        )
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "success": error_response.success,
+                "error": error_response.error,
+                "details": error_response.details,
+                "timestamp": error_response.timestamp.isoformat()
+            }
+        )
+
 @router.get("/health/detailed", tags=["Monitoring"])
-async def detailed_health_check():
+async def detailed_health_check(
+    query_classifier = Depends(get_query_classifier),
+    classification_batcher = Depends(get_classification_batcher)
+):
     """Detailed health check with all dependencies."""
     health_info = {
         "api": "running",
@@ -345,11 +747,11 @@ async def detailed_health_check():
     
     try:
         # Check MongoDB
-        mongodb_client.db.command("ping")
+        await mongodb_client.async_db.command("ping")
         health_info["dependencies"]["mongodb"] = {
             "status": "healthy",
-            "database": mongodb_client.db.name,
-            "collections": len(mongodb_client.db.list_collection_names())
+            "database": mongodb_client.async_db.name,
+            "collections": len(collection_registry.collection_names())
         }
     except Exception as e:
         health_info["dependencies"]["mongodb"] = {
@@ -358,11 +760,11 @@ async def detailed_health_check():
         }
     
     try:
-        # Check Ollama
-        classification = query_classifier.classify_query("test")
+        # Check Ollama (lists models; nothing is generated)
+        ollama = await query_classifier.aping()
         health_info["dependencies"]["ollama"] = {
-            "status": "healthy",
-            "model": query_classifier.llm.model
+            "status": "healthy" if ollama["model_available"] else "unhealthy",
+            **ollama
         }
     except Exception as e:
         health_info["dependencies"]["ollama"] = {
@@ -370,6 +772,17 @@ async def detailed_health_check():
             "error": str(e)
         }
     
+    if query_classifier.cache is not None:
+        health_info["classification_cache"] = query_classifier.cache.stats()
+    health_info["classification_batcher"] = classification_batcher.stats()
+    health_info["crew_scheduler"] = crew_scheduler.stats()
+    health_info["collection_metadata"] = collection_registry.snapshot()
+    health_info["facets"] = facets_cache.snapshot()
+    health_info["derived_fields"] = derived_fields_maintainer.snapshot()
+    if response_cache is not None:
+        health_info["response_cache"] = response_cache.stats()
+    health_info["request_coalescing"] = recommendation_flights.stats()
+    
     # Overall status
     all_healthy = all(
         dep["status"] == "healthy" 
@@ -377,4 +790,14 @@ async def detailed_health_check():
     )
     health_info["overall"] = "healthy" if all_healthy else "degraded"
     
-    return health_info
\ No newline at end of file
+    return health_info
+
+@router.get("/metrics/crews", tags=["Monitoring"])
+async def crew_metrics():
+    """Crew pool occupancy, rejections and queue wait times."""
+    return crew_scheduler.stats()
+
+@router.get("/metrics/mongodb", tags=["Monitoring"])
+async def mongodb_pool_metrics():
+    """MongoDB connection pool usage, checkout wait times and settings."""
+    return mongodb_client.pool_stats()
@@ -20,6 +20,8 @@ class RecommendationResponse(BaseModel):
     recommendations: List[RecommendationItem] = Field(default_factory=list)
     full_data: List[Dict[str, Any]] = Field(default_factory=list)
     processing_time: Optional[float] = None
+    stage_timings: Dict[str, float] = Field(default_factory=dict, description="Per-stage latency breakdown in seconds (classify, crew, hydrate, total)")
+    cache: Optional[Dict[str, Any]] = Field(None, description="Set when served from the response cache: status (hit or stale) and age_seconds")
     timestamp: datetime = Field(default_factory=datetime.now)
     
     class Config:
@@ -33,11 +35,17 @@ class UserQueryRequest(BaseModel):
     user_id: Optional[str] = Field(None, description="Optional user identifier for personalization")
     session_id: Optional[str] = Field(None, description="Optional session identifier")
 
+class BatchClassifyRequest(BaseModel):
+    """Request schema for classifying several queries at once."""
+    queries: List[str] = Field(..., min_length=1, max_length=100, description="Natural language queries to classify")
+
 class CategoryQueryRequest(BaseModel):
     """Request schema for category-based queries (from UI buttons)."""
-    category: str = Field(..., description="Category like food, accommodation, etc.")
+    category: str = Field(..., description="Collection to search (foods, accommodations, shopping, ...); singular forms such as food or accommodation are accepted")
     city: str = Field(..., description="City name")
     filters: Dict[str, str] = Field(default_factory=dict, description="Additional filters")
+    limit: int = Field(10, ge=1, le=50, description="Maximum number of results")
+    rerank: bool = Field(False, description="Have the LLM crew pick and order the results (slow) instead of the ranked database query")
 
 class ErrorResponse(BaseModel):
     """Error response schema."""
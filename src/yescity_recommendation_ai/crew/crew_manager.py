@@ -1,17 +1,64 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+from dataclasses import dataclass
 import os
+import threading
 from crewai import Agent, Task, Crew, Process,LLM
 from langchain_community.llms import Ollama
 from ..services.query_classifier import query_classifier, QueryCategory
+from ..models.user_query import QueryContext
 from .yaml_loader import YAMLLoader
+from ..database.search_specs import SEARCH_SPECS
 from ..tools.food_tools import food_search_tool
+from ..tools.nearby_spots_tools import nearby_spots_tool
+from ..tools.accomodation_tools import accommodation_search_tool
+from ..tools.activity_tools import activity_search_tool
+from ..tools.connectivity_tools import connectivity_search_tool
+from ..tools.gems_tools import hidden_gems_search_tool
+from ..tools.general_info_tools import city_info_search_tool
+from ..tools.places_tools import places_search_tool
+from ..tools.shopping_tools import shopping_search_tool
+from ..tools.transport_tools import transport_search_tool
 from .crew_output_parser import CrewOutputParser
+from .crew_scheduler import crew_scheduler
+
+# Tools available to the food crew
+FOOD_TOOLS = [food_search_tool, nearby_spots_tool]
+
+# Search tool of each category; collections with locations also get nearby search
+SEARCH_TOOLS = {
+    "foods": food_search_tool,
+    "accommodations": accommodation_search_tool,
+    "activities": activity_search_tool,
+    "connectivities": connectivity_search_tool,
+    "hiddengems": hidden_gems_search_tool,
+    "cityinfos": city_info_search_tool,
+    "placestovisits": places_search_tool,
+    "shopping": shopping_search_tool,
+    "localtransports": transport_search_tool,
+}
+CATEGORY_TOOLS = {
+    category: [tool, nearby_spots_tool] if SEARCH_SPECS[category].geo else [tool]
+    for category, tool in SEARCH_TOOLS.items()
+}
+
+# Task config per category; categories without their own task share the generic one
+CATEGORY_TASKS = {"foods": "food_recommendation"}
+DEFAULT_TASK = "category_recommendation"
+
+@dataclass(frozen=True)
+class CrewTemplate:
+    """Pre-built agent plus parsed task config for one agent/task YAML pair."""
+    agent: Agent
+    task_config: Mapping[str, Any]
+    version: Tuple[int, int]
 
 class CrewManager:
     """Manages crew creation and execution based on query type."""
     
     def __init__(self):
         self.yaml_loader = YAMLLoader()
+        self._templates: Dict[Tuple[str, str], CrewTemplate] = {}
+        self._templates_lock = threading.Lock()
         self.available_agents = self.yaml_loader.get_available_agents()
         self.available_tasks = self.yaml_loader.get_available_tasks()
         
@@ -36,113 +83,186 @@ class CrewManager:
             max_tokens=2000,
         )
     
-    def create_food_crew(self, city: str, query_details: str) -> Crew:
-        """Create a crew for food recommendations."""
-        
-        # Load agent configuration
-        agent_config = self.yaml_loader.load_agent_config("food_critic")
-        
-        # Create agent
-        agent = Agent(
-            role=agent_config["role"],
-            goal=agent_config["goal"],
-            backstory=agent_config["backstory"],
-            verbose=agent_config.get("verbose", True),
-            allow_delegation=agent_config.get("allow_delegation", False),
-            tools=[food_search_tool],
-            llm=self.llm  # Explicitly use Ollama LLM
-        )
+    def get_crew_template(self, agent_name: str, task_name: str, tools: List[Any]) -> CrewTemplate:
+        """
+        Return the cached template for an agent/task pair.
         
-        # Load task configuration
-        task_config = self.yaml_loader.load_task_config("food_recommendation")
+        The template is rebuilt only when either YAML file's mtime changes,
+        so config edits are picked up without a restart.
+        """
+        key = (agent_name, task_name)
+        version = self.yaml_loader.get_config_version(agent_name, task_name)
+        template = self._templates.get(key)
+        if template is not None and template.version == version:
+            return template
         
-        # Create task with dynamic parameters
-        description = task_config["description"].format(
-            cityName=city,
-            user_query_details=query_details
-        )
+        with self._templates_lock:
+            template = self._templates.get(key)
+            if template is not None and template.version == version:
+                return template
+            
+            agent_config = self.yaml_loader.load_agent_config(agent_name)
+            agent = Agent(
+                role=agent_config["role"],
+                goal=agent_config["goal"],
+                backstory=agent_config["backstory"],
+                verbose=agent_config.get("verbose", True),
+                allow_delegation=agent_config.get("allow_delegation", False),
+                tools=tools,
+                llm=self.llm  # Explicitly use Ollama LLM
+            )
+            template = CrewTemplate(
+                agent=agent,
+                task_config=self.yaml_loader.load_task_config(task_name),
+                version=version
+            )
+            self._templates[key] = template
+            print(f"🧩 Built crew template {agent_name}/{task_name}")
+            return template
+    
+    def warm_templates(self):
+        """Build every crew template up front (called at startup)."""
+        for category in CATEGORY_TOOLS:
+            spec = SEARCH_SPECS[category]
+            self.get_crew_template(spec.agent, CATEGORY_TASKS.get(category, DEFAULT_TASK), CATEGORY_TOOLS[category])
+    
+    def _build_crew(self, template: CrewTemplate, description_inputs: Dict[str, str]) -> Crew:
+        """Clone the template agent and interpolate a fresh task for one request."""
+        # Agents carry per-run executor state, so each crew gets its own copy
+        agent = template.agent.copy()
+        task_config = template.task_config
         
         task = Task(
-            description=description,
+            description=task_config["description"].format(**description_inputs),
             expected_output=task_config["expected_output"],
             agent=agent,
             async_execution=task_config.get("async_execution", False),
             output_file=task_config.get("output_file")
         )
         
-        # Create crew
-        crew = Crew(
+        return Crew(
             agents=[agent],
             tasks=[task],
             process=Process.sequential,
             verbose=True,
             manager_llm=self.llm  # Explicitly use Ollama for crew manager
         )
-        
-        return crew
     
-    def process_query(self, user_query: str) -> Dict[str, Any]:
+    def create_food_crew(self, context: QueryContext) -> Crew:
+        """Create a crew for food recommendations from an already classified query."""
+        return self.create_crew(context)
+    
+    def create_crew(self, context: QueryContext) -> Crew:
+        """Create the crew of the query's category from an already classified query."""
+        category = context.classification.category
+        spec = SEARCH_SPECS[category]
+        tools = CATEGORY_TOOLS[category]
+        template = self.get_crew_template(spec.agent, CATEGORY_TASKS.get(category, DEFAULT_TASK), tools)
+        return self._build_crew(template, {
+            "cityName": context.classification.cityName,
+            "user_query_details": self._build_query_details(context),
+            "label": spec.label,
+            "collection": spec.collection,
+            "name_field": spec.name_field,
+            "tool_name": tools[0].name
+        })
+    
+    @staticmethod
+    def _build_query_details(context: QueryContext) -> str:
+        """Describe the user's request for the task prompt."""
+        classification = context.classification
+        spec = SEARCH_SPECS.get(classification.category)
+        query_details = f"Looking for {spec.label if spec else classification.category} in {classification.cityName}"
+        if classification.parameters:
+            query_details += f" with parameters: {classification.parameters}"
+        return query_details
+    
+    def process_query(self, user_query: str, context: Optional[QueryContext] = None) -> Dict[str, Any]:
         """
         Process a user query and return recommendations.
         
         Args:
             user_query: The natural language query from user
+            context: Request context carrying the classification. When omitted,
+                the query is classified here; callers that already classified
+                the query should pass it to avoid a second LLM round trip.
             
         Returns:
             Dictionary with recommendations and metadata
         """
-        # Step 1: Classify the query
-        classification = query_classifier.classify_query(user_query)
+        # Step 1: Classify the query (only if the caller has not done so)
+        if context is None:
+            context = QueryContext(user_query=user_query)
+        if context.classification is None:
+            with context.timed("classify"):
+                context.classification = query_classifier.classify_query(user_query)
+        classification = context.classification
+        
+        # Step 2: Create the crew of the query's category
+        category = classification.category
+        if category not in CATEGORY_TOOLS:
+            return {
+                "success": False,
+                "error": f"Category '{category}' not implemented yet.",
+                "category": category,
+                "city": classification.cityName
+            }
+        
+        spec = SEARCH_SPECS[category]
+        if not classification.cityName:
+            return {
+                "success": False,
+                "error": f"Please specify a city for {spec.label} recommendations.",
+                "category": category
+            }
+        
+        params = classification.parameters
         
-        # Step 2: Create appropriate crew based on category
-        if classification.category == "foods":
-            if not classification.cityName:
-                return {
-                    "success": False,
-                    "error": "Please specify a city for food recommendations.",
-                    "category": "foods"
-                }
+        try:
+            with context.timed("crew"):
+                crew = self.create_crew(context)
+                result = crew.kickoff()
+            print(f"Crew Output: {result}")
             
-            # Extract parameters for food search
-            params = classification.parameters
-            query_details = f"Looking for food in {classification.cityName}"
-            if params:
-                query_details += f" with parameters: {params}"
+            # Parse the output to get recommendations
+            recommendations = CrewOutputParser.parse_recommendations(str(result), name_field=spec.name_field)
             
-            # Create and execute food crew
-            crew = self.create_food_crew(classification.cityName, query_details)
+            return {
+                "success": True,
+                "category": category,
+                "city": classification.cityName,
+                "parameters": params,
+                "recommendations": recommendations,
+                "raw_output": str(result)
+            }
             
-            try:
-                result = crew.kickoff()
-                print(f"Crew Output: {result}")
-                
-                # Parse the output to get recommendations
-                recommendations = CrewOutputParser.parse_food_recommendations(str(result))
-                
-                return {
-                    "success": True,
-                    "category": "foods",
-                    "city": classification.cityName,
-                    "parameters": params,
-                    "recommendations": recommendations,
-                    "raw_output": str(result)
-                }
-                
-            except Exception as e:
-                return {
-                    "success": False,
-                    "error": f"Error executing crew: {str(e)}",
-                    "category": "foods"
-                }
-        
-        else:
-            # For now, return placeholder for other categories
+        except Exception as e:
             return {
                 "success": False,
-                "error": f"Category '{classification.category}' not implemented yet.",
-                "category": classification.category,
-                "city": classification.cityName
+                "error": f"Error executing crew: {str(e)}",
+                "category": category
             }
 
+    async def aprocess_query(self, user_query: str, context: Optional[QueryContext] = None) -> Dict[str, Any]:
+        """
+        Async variant of process_query.
+        
+        Classification (if still needed) happens on the event loop via the
+        async LLM client; the crew itself runs on the crew scheduler's
+        bounded worker pool.
+        
+        Raises:
+            CrewQueueFullError: If the crew queue is full
+        """
+        if context is None:
+            context = QueryContext(user_query=user_query)
+        if context.classification is None:
+            with context.timed("classify"):
+                context.classification = await query_classifier.aclassify_query(user_query)
+        
+        return await crew_scheduler.submit(
+            context.classification.category, self.process_query, user_query, context
+        )
+
 # Create singleton instance
 crew_manager = CrewManager()
\ No newline at end of file
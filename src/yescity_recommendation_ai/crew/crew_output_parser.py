@@ -13,6 +13,21 @@ class CrewOutputParser:
         Args:
             output: The raw output string from the crew
             
+        Returns:
+            List of dictionaries with _id and name
+        """
+        # The food task answers with the foodPlace field instead of name
+        return CrewOutputParser.parse_recommendations(output, name_field="foodPlace")
+    
+    @staticmethod
+    def parse_recommendations(output: str, name_field: str = "name") -> List[Dict[str, str]]:
+        """
+        Parse crew output to extract recommendation IDs and names.
+        
+        Args:
+            output: The raw output string from the crew
+            name_field: Collection name field accepted in place of "name"
+            
         Returns:
             List of dictionaries with _id and name
         """
@@ -31,10 +46,11 @@ class CrewOutputParser:
                     # Validate each recommendation has _id and name
                     valid_recs = []
                     for rec in recommendations:
-                        if "_id" in rec and "name" in rec:
+                        name = rec.get("name", rec.get(name_field))
+                        if "_id" in rec and name:
                             valid_recs.append({
                                 "_id": str(rec["_id"]),
-                                "name": rec["name"]
+                                "name": name
                             })
                     
                     return valid_recs
@@ -42,7 +58,7 @@ class CrewOutputParser:
             # If JSON parsing fails, try to extract manually
             return CrewOutputParser._extract_from_text(output)
             
-        except (json.JSONDecodeError, KeyError) as e:
+        except (json.JSONDecodeError, KeyError, AttributeError) as e:
             print(f"Error parsing crew output: {e}")
             return CrewOutputParser._extract_from_text(output)
     
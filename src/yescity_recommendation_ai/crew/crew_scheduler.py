@@ -0,0 +1,147 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+class CrewQueueFullError(Exception):
+    """Raised when the crew queue is full and a request must be rejected."""
+
+    def __init__(self, category: str, retry_after: int):
+        self.category = category
+        self.retry_after = retry_after
+        super().__init__(f"Crew queue is full for '{category}', retry after {retry_after}s")
+
+def _parse_category_limits(value: str) -> Dict[str, int]:
+    """Parse "foods=2,accommodations=1" into {"foods": 2, "accommodations": 1}."""
+    limits = {}
+    for item in value.split(","):
+        if "=" in item:
+            category, limit = item.split("=", 1)
+            limits[category.strip()] = int(limit)
+    return limits
+
+class CrewScheduler:
+    """
+    Runs blocking crew executions on a fixed worker pool with admission control.
+
+    At most max_workers crews run at once; up to max_queue more wait for a
+    worker. Anything beyond that is rejected immediately with
+    CrewQueueFullError so the API can answer 429 instead of piling work onto
+    Ollama. Optional per-category limits cap how many crews of one category
+    run concurrently.
+    """
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            max_queue: Optional[int] = None,
+            category_limits: Optional[Dict[str, int]] = None,
+            default_retry_after: Optional[int] = None
+    ):
+        self.max_workers = max_workers or int(os.getenv("CREW_MAX_WORKERS", "4"))
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("CREW_MAX_QUEUE", "16"))
+        self.category_limits = (
+            category_limits
+            if category_limits is not None
+            else _parse_category_limits(os.getenv("CREW_CATEGORY_LIMITS", ""))
+        )
+        self.default_retry_after = default_retry_after or int(os.getenv("CREW_RETRY_AFTER_SECONDS", "10"))
+
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crew")
+        self._worker_slots: Optional[asyncio.Semaphore] = None
+        self._category_slots: Dict[str, asyncio.Semaphore] = {}
+
+        self.in_flight = 0
+        self.running = 0
+        self.running_by_category: Dict[str, int] = {}
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._queue_waits = deque(maxlen=1000)
+        self._run_times = deque(maxlen=100)
+
+    def _slots_for(self, category: str):
+        if self._worker_slots is None:
+            self._worker_slots = asyncio.Semaphore(self.max_workers)
+        category_slots = None
+        if category in self.category_limits:
+            if category not in self._category_slots:
+                self._category_slots[category] = asyncio.Semaphore(self.category_limits[category])
+            category_slots = self._category_slots[category]
+        return self._worker_slots, category_slots
+
+    def retry_after(self) -> int:
+        """Estimate seconds until a queue slot frees up."""
+        if not self._run_times:
+            return self.default_retry_after
+        avg_run = sum(self._run_times) / len(self._run_times)
+        queued = max(self.in_flight - self.running, 1)
+        return max(1, math.ceil(avg_run * queued / self.max_workers))
+
+    async def submit(self, category: str, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run fn(*args) on the crew pool once a worker (and category slot) is free.
+
+        Raises:
+            CrewQueueFullError: If all workers are busy and the queue is full
+        """
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise CrewQueueFullError(category, self.retry_after())
+
+        worker_slots, category_slots = self._slots_for(category)
+        self.in_flight += 1
+        enqueued_at = time.perf_counter()
+        try:
+            if category_slots is not None:
+                await category_slots.acquire()
+            try:
+                async with worker_slots:
+                    started_at = time.perf_counter()
+                    self._queue_waits.append(started_at - enqueued_at)
+                    self.running += 1
+                    self.running_by_category[category] = self.running_by_category.get(category, 0) + 1
+                    try:
+                        loop = asyncio.get_running_loop()
+                        result = await loop.run_in_executor(self.executor, fn, *args)
+                        self.completed += 1
+                        return result
+                    except Exception:
+                        self.failed += 1
+                        raise
+                    finally:
+                        self._run_times.append(time.perf_counter() - started_at)
+                        self.running -= 1
+                        self.running_by_category[category] -= 1
+            finally:
+                if category_slots is not None:
+                    category_slots.release()
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool occupancy and queue wait time metrics (seconds)."""
+        waits = sorted(self._queue_waits)
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "category_limits": self.category_limits,
+            "running": self.running,
+            "queued": self.in_flight - self.running,
+            "running_by_category": {k: v for k, v in self.running_by_category.items() if v},
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "queue_wait": {
+                "samples": len(waits),
+                "avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                "p95": round(waits[max(math.ceil(len(waits) * 0.95) - 1, 0)], 3) if waits else 0.0,
+                "max": round(waits[-1], 3) if waits else 0.0,
+            },
+        }
+
+# Create singleton instance
+crew_scheduler = CrewScheduler()
@@ -1,59 +1,104 @@
 import yaml
 import os
-from typing import Dict, Any
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Tuple
 from pathlib import Path
 
+CONFIG_DIR = Path(__file__).parent.parent / "config"
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
 class YAMLLoader:
-    """Utility class to load YAML configuration files."""
-    
-    @staticmethod
-    def load_agent_config(agent_name: str) -> Dict[str, Any]:
-        """Load agent configuration from YAML file."""
-        config_path = Path(__file__).parent.parent / "config" / "agents" / f"{agent_name}.yaml"
-        
-        if not config_path.exists():
-            raise FileNotFoundError(f"Agent config not found: {config_path}")
-        
+    """
+    Utility class to load YAML configuration files.
+
+    Parsed configs are cached as immutable mappings keyed by path and reloaded
+    only when the file's modification time changes, so editing a YAML file
+    takes effect on the next request without re-reading unchanged files.
+    """
+
+    _cache: Dict[Path, Tuple[int, Mapping[str, Any]]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _load_cached(cls, config_path: Path, kind: str) -> Mapping[str, Any]:
+        try:
+            mtime = config_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{kind} config not found: {config_path}")
+
+        cached = cls._cache.get(config_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
         with open(config_path, 'r', encoding='utf-8') as file:
-            config = yaml.safe_load(file)
-        
+            config = _freeze(yaml.safe_load(file) or {})
+
+        with cls._lock:
+            cls._cache[config_path] = (mtime, config)
         return config
-    
+
     @staticmethod
-    def load_task_config(task_name: str) -> Dict[str, Any]:
-        """Load task configuration from YAML file."""
-        config_path = Path(__file__).parent.parent / "config" / "tasks" / f"{task_name}.yaml"
-        
-        if not config_path.exists():
-            raise FileNotFoundError(f"Task config not found: {config_path}")
-        
-        with open(config_path, 'r', encoding='utf-8') as file:
-            config = yaml.safe_load(file)
-        
-        return config
-    
+    def _agent_path(agent_name: str) -> Path:
+        return CONFIG_DIR / "agents" / f"{agent_name}.yaml"
+
+    @staticmethod
+    def _task_path(task_name: str) -> Path:
+        return CONFIG_DIR / "tasks" / f"{task_name}.yaml"
+
+    @classmethod
+    def load_agent_config(cls, agent_name: str) -> Mapping[str, Any]:
+        """Load agent configuration from YAML file (cached, read-only)."""
+        return cls._load_cached(cls._agent_path(agent_name), "Agent")
+
+    @classmethod
+    def load_task_config(cls, task_name: str) -> Mapping[str, Any]:
+        """Load task configuration from YAML file (cached, read-only)."""
+        return cls._load_cached(cls._task_path(task_name), "Task")
+
+    @classmethod
+    def get_config_version(cls, agent_name: str, task_name: str) -> Tuple[int, int]:
+        """Return the modification times of an agent/task config pair."""
+        return (
+            cls._agent_path(agent_name).stat().st_mtime_ns,
+            cls._task_path(task_name).stat().st_mtime_ns,
+        )
+
+    @classmethod
+    def clear_cache(cls):
+        """Forget every parsed config."""
+        with cls._lock:
+            cls._cache.clear()
+
     @staticmethod
     def get_available_agents() -> list:
         """Get list of available agent configurations."""
-        agents_dir = Path(__file__).parent.parent / "config" / "agents"
+        agents_dir = CONFIG_DIR / "agents"
         if not agents_dir.exists():
             return []
-        
+
         agents = []
         for file in agents_dir.glob("*.yaml"):
             agents.append(file.stem)  # Get filename without extension
-        
+
         return agents
-    
+
     @staticmethod
     def get_available_tasks() -> list:
         """Get list of available task configurations."""
-        tasks_dir = Path(__file__).parent.parent / "config" / "tasks"
+        tasks_dir = CONFIG_DIR / "tasks"
         if not tasks_dir.exists():
             return []
-        
+
         tasks = []
         for file in tasks_dir.glob("*.yaml"):
             tasks.append(file.stem)  # Get filename without extension
-        
-        return tasks
\ No newline at end of file
+
+        return tasks
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from pymongo.database import Database
+
+# YesCity3 collections holding travel data
+DATA_COLLECTIONS = [
+    "foods", "accommodations", "activities", "cityinfos", "localtransports",
+    "hiddengems", "connectivities", "placestovisits", "shopping",
+]
+
+class CollectionRegistry:
+    """
+    In-memory view of the database's collections and their stats.
+
+    Loaded once when the client connects and refreshed by a background
+    thread, so hot paths such as get_collection() never pay a
+    list_collection_names() round trip.
+    """
+
+    def __init__(self, refresh_interval: Optional[float] = None):
+        self.refresh_interval = refresh_interval if refresh_interval is not None else float(
+            os.getenv("COLLECTION_REGISTRY_REFRESH_SECONDS", "300")
+        )
+        self._collections: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def _collection_stats(self, db: Database, name: str) -> Dict[str, Any]:
+        try:
+            stats = next(db[name].aggregate([{"$collStats": {"storageStats": {}}}]), {})
+            storage = stats.get("storageStats", {})
+            return {
+                "count": storage.get("count"),
+                "size_bytes": storage.get("size"),
+                "avg_obj_size_bytes": storage.get("avgObjSize"),
+                "indexes": storage.get("nindexes"),
+                "index_size_bytes": storage.get("totalIndexSize"),
+            }
+        except Exception:
+            # $collStats needs clusterMonitor-style privileges; fall back to metadata count
+            return {"count": db[name].estimated_document_count()}
+
+    def refresh(self, db: Database) -> Dict[str, Dict[str, Any]]:
+        """
+        Reload collection names and stats from the server.
+
+        Returns:
+            Mapping of collection name to its metadata
+        """
+        collections = {}
+        for info in db.list_collections():
+            name = info["name"]
+            metadata = {"type": info.get("type", "collection")}
+            if metadata["type"] == "collection":
+                metadata.update(self._collection_stats(db, name))
+            collections[name] = metadata
+
+        with self._lock:
+            self._collections = collections
+            self._loaded_at = time.time()
+            self.refreshes += 1
+        return collections
+
+    def has_collection(self, name: str) -> Optional[bool]:
+        """True/False once loaded; None if the registry has not been loaded yet."""
+        if not self.loaded:
+            return None
+        return name in self._collections
+
+    def collection_names(self) -> list:
+        return sorted(self._collections)
+
+    def _refresh_loop(self, db: Database):
+        while not self._stop_event.wait(self.refresh_interval):
+            try:
+                self.refresh(db)
+            except Exception as e:
+                self.refresh_errors += 1
+                self.last_error = str(e)
+                print(f"⚠️ Collection metadata refresh failed: {e}")
+
+    def start(self, db: Database):
+        """Start refreshing in the background every refresh_interval seconds."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self.refresh_interval <= 0:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._refresh_loop, args=(db,), name="collection-registry", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cached metadata for monitoring endpoints."""
+        with self._lock:
+            collections = {name: dict(metadata) for name, metadata in self._collections.items()}
+            loaded_at = self._loaded_at
+        return {
+            "loaded": loaded_at is not None,
+            "age_seconds": round(time.time() - loaded_at, 1) if loaded_at else None,
+            "refresh_interval_seconds": self.refresh_interval,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "last_error": self.last_error,
+            "collections": collections,
+        }
+
+# Create singleton instance
+collection_registry = CollectionRegistry()
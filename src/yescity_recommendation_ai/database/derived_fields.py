@@ -0,0 +1,230 @@
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pymongo.database import Database
+from pymongo.errors import PyMongoError
+
+from .geo import GEO_COLLECTIONS, location_fields_expression, stale_location_filter
+from .ratings import RATING_FIELDS, rating_fields_expression, stale_rating_filter
+
+@dataclass(frozen=True)
+class DerivedFields:
+    """
+    Stored fields computed from other fields of the same document.
+
+    The values are written by a pipeline update ($set of an aggregation
+    expression), so MongoDB computes them from the document as stored.
+    """
+    label: str
+    collections: Tuple[str, ...]
+    # Fields the derived values are computed from
+    source_fields: Tuple[str, ...]
+    # $set stage content of the pipeline update
+    expression: Callable[[], Dict[str, Any]]
+    # Documents whose stored values are missing or out of date
+    stale_filter: Callable[[], Dict[str, Any]]
+    # migrations command that rewrites every document
+    migration: str
+
+    def update(self) -> List[Dict[str, Any]]:
+        return [{"$set": self.expression()}]
+
+DERIVED_FIELDS: List[DerivedFields] = [
+    DerivedFields(
+        "avgRating/compositeScore", ("foods",), tuple(RATING_FIELDS),
+        rating_fields_expression, stale_rating_filter, "backfill-ratings",
+    ),
+    # GeoJSON point behind /nearby and the nearby spots tool
+    DerivedFields(
+        "location", tuple(GEO_COLLECTIONS), ("lat", "lon"),
+        location_fields_expression, stale_location_filter, "backfill-locations",
+    ),
+]
+
+def refresh_stale(db: Database, derived: DerivedFields) -> Dict[str, int]:
+    """
+    Rewrite the derived fields of every document where they are stale.
+
+    Returns:
+        Mapping of collection name to number of documents updated
+    """
+    updated = {}
+    for collection_name in derived.collections:
+        result = db[collection_name].update_many(derived.stale_filter(), derived.update())
+        updated[collection_name] = result.modified_count
+        if result.modified_count:
+            print(f"🔁 {collection_name}: {derived.label} rewritten on {result.modified_count} documents")
+    return updated
+
+def count_stale(db: Database, derived: DerivedFields) -> Dict[str, int]:
+    """Number of documents per collection whose derived fields are stale."""
+    return {
+        collection_name: db[collection_name].count_documents(derived.stale_filter())
+        for collection_name in derived.collections
+    }
+
+class DerivedFieldsMaintainer:
+    """
+    Keeps derived fields (the food scores behind minRating and the ranking,
+    the location points behind nearby search) in step with the fields they
+    are computed from.
+
+    ensure() rewrites stale documents at startup. Afterwards, with
+    DERIVED_FIELDS_CHANGE_STREAMS=true, each insert, replace or update that
+    touches a source field is followed by a rewrite of that document; without
+    change streams, stale documents are rewritten every refresh_interval
+    seconds. The rewrite itself only sets derived fields, so it does not
+    trigger another one.
+
+    With DERIVED_FIELDS_BACKFILL=false nothing is written; ensure() only
+    reports stale documents.
+    """
+
+    def __init__(
+            self,
+            derived: Optional[List[DerivedFields]] = None,
+            refresh_interval: Optional[float] = None,
+            use_change_streams: Optional[bool] = None,
+            backfill: Optional[bool] = None
+    ):
+        self.derived = derived if derived is not None else DERIVED_FIELDS
+        self.refresh_interval = refresh_interval if refresh_interval is not None else float(
+            os.getenv("DERIVED_FIELDS_REFRESH_SECONDS", "300")
+        )
+        self.use_change_streams = use_change_streams if use_change_streams is not None else (
+            os.getenv("DERIVED_FIELDS_CHANGE_STREAMS", "false").lower() == "true"
+        )
+        self.backfill = backfill if backfill is not None else (
+            os.getenv("DERIVED_FIELDS_BACKFILL", "true").lower() == "true"
+        )
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.mode = "manual"
+        self.rewrites = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    def ensure(self, db: Database) -> Dict[str, Dict[str, int]]:
+        """
+        Rewrite (or, with backfill disabled, report) stale derived fields.
+
+        Returns:
+            {label: {collection: documents rewritten or still stale}}
+        """
+        results = {}
+        for derived in self.derived:
+            if self.backfill:
+                results[derived.label] = refresh_stale(db, derived)
+                continue
+            stale = count_stale(db, derived)
+            for collection_name, count in stale.items():
+                if count:
+                    print(
+                        f"⚠️ {count} {collection_name} documents have missing or stale {derived.label}. "
+                        f"Run: python -m yescity_recommendation_ai.database.migrations {derived.migration}"
+                    )
+            results[derived.label] = stale
+        return results
+
+    def affected(self, change: Dict[str, Any]) -> List[DerivedFields]:
+        """Derived fields a change-stream event makes stale."""
+        collection_name = change.get("ns", {}).get("coll")
+        operation = change.get("operationType")
+        description = change.get("updateDescription") or {}
+        touched = set(description.get("updatedFields") or {}) | set(description.get("removedFields") or [])
+        # Nested updates are reported as "field.sub"
+        touched = {field.split(".", 1)[0] for field in touched}
+        return [
+            derived for derived in self.derived
+            if collection_name in derived.collections and (
+                operation in ("insert", "replace")
+                or (operation == "update" and touched & set(derived.source_fields))
+            )
+        ]
+
+    def apply(self, db: Database, change: Dict[str, Any]):
+        """Rewrite the derived fields of the document a change-stream event refers to."""
+        document_id = change.get("documentKey", {}).get("_id")
+        if document_id is None:
+            return
+        collection_name = change["ns"]["coll"]
+        for derived in self.affected(change):
+            db[collection_name].update_one({"_id": document_id}, derived.update())
+            self.rewrites += 1
+
+    def _collections(self) -> List[str]:
+        return sorted({name for derived in self.derived for name in derived.collections})
+
+    def _safe_refresh(self, db: Database):
+        try:
+            for derived in self.derived:
+                self.rewrites += sum(refresh_stale(db, derived).values())
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+            print(f"⚠️ Derived fields refresh failed: {e}")
+
+    def _refresh_loop(self, db: Database):
+        self.mode = "interval"
+        while not self._stop_event.wait(self.refresh_interval):
+            self._safe_refresh(db)
+
+    def _watch_loop(self, db: Database):
+        pipeline = [{"$match": {
+            "ns.coll": {"$in": self._collections()},
+            "operationType": {"$in": ["insert", "replace", "update"]},
+        }}]
+        try:
+            with db.watch(pipeline, max_await_time_ms=1000) as stream:
+                self.mode = "change_stream"
+                # Writes made while the stream was being opened
+                self._safe_refresh(db)
+                while not self._stop_event.is_set():
+                    change = stream.try_next()
+                    if change is None:
+                        continue
+                    try:
+                        self.apply(db, change)
+                    except PyMongoError as e:
+                        self.errors += 1
+                        self.last_error = str(e)
+                        print(f"⚠️ Rewriting derived fields failed: {e}")
+        except PyMongoError as e:
+            # Change streams need a replica set or sharded cluster
+            self.last_error = str(e)
+            print(f"⚠️ Derived fields change stream unavailable, refreshing every {self.refresh_interval}s: {e}")
+            if self.refresh_interval > 0:
+                self._refresh_loop(db)
+
+    def start(self, db: Database):
+        """Keep derived fields current in the background (change stream or interval)."""
+        if not self.backfill:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if not self.use_change_streams and self.refresh_interval <= 0:
+            return
+        self._stop_event.clear()
+        target = self._watch_loop if self.use_change_streams else self._refresh_loop
+        self._thread = threading.Thread(target=target, args=(db,), name="derived-fields", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background maintenance."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "rewrites": self.rewrites,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+# Create singleton instance
+derived_fields_maintainer = DerivedFieldsMaintainer()
@@ -0,0 +1,265 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pymongo.database import Database
+from pymongo.errors import PyMongoError
+
+from .collection_registry import DATA_COLLECTIONS
+
+FacetKey = Tuple[Optional[str], Optional[str]]
+
+def _facet_pipeline() -> List[Dict[str, Any]]:
+    """Count documents per (cityName, category); collections without categories group under None."""
+    return [
+        {"$group": {"_id": {"city": "$cityName", "category": "$category"}, "count": {"$sum": 1}}},
+    ]
+
+def _view(counts: Dict[str, int]) -> Dict[str, Any]:
+    names = sorted(counts)
+    return {"names": names, "counts": {name: counts[name] for name in names}}
+
+def build_facets(rows: Iterable[Dict[str, Any]]) -> Dict[str, Dict[Any, Dict[str, Any]]]:
+    """
+    Precompute every listing the facet endpoints can serve.
+
+    Args:
+        rows: Dicts with collection, city, category and count
+
+    Returns:
+        {"cities": {collection: view}, "categories": {(collection, city): view},
+        "city_collections": {city: {collection: count}}} where a None collection
+        or city means "all" and each view holds sorted names plus counts
+    """
+    cities: Dict[Optional[str], Dict[str, int]] = {}
+    categories: Dict[FacetKey, Dict[str, int]] = {}
+    city_collections: Dict[str, Dict[str, int]] = {}
+
+    for row in rows:
+        collection, count = row["collection"], row["count"]
+        city = row.get("city")
+        category = row.get("category")
+        if isinstance(city, str) and city.strip():
+            city = city.strip()
+            for key in (collection, None):
+                cities.setdefault(key, {})
+                cities[key][city] = cities[key].get(city, 0) + count
+            per_city = city_collections.setdefault(city, {})
+            per_city[collection] = per_city.get(collection, 0) + count
+        else:
+            city = None
+        if isinstance(category, str) and category.strip():
+            category = category.strip()
+            keys = {(collection, None), (None, None)}
+            if city:
+                keys |= {(collection, city.casefold()), (None, city.casefold())}
+            for key in keys:
+                categories.setdefault(key, {})
+                categories[key][category] = categories[key].get(category, 0) + count
+
+    return {
+        "cities": {key: _view(counts) for key, counts in cities.items()},
+        "categories": {key: _view(counts) for key, counts in categories.items()},
+        "city_collections": city_collections,
+    }
+
+EMPTY_VIEW = {"names": [], "counts": {}}
+
+class FacetsCache:
+    """
+    Materialized distinct cities and categories, with counts, for all collections.
+
+    One $group per collection builds every listing up front, so /cities and
+    /categories are dictionary lookups. The cache is rebuilt every
+    refresh_interval seconds or, with FACETS_CHANGE_STREAMS=true, shortly
+    after a change stream reports writes to a data collection.
+
+    Change listeners (e.g. the response cache) are called with the name of
+    each collection whose contents changed.
+    """
+
+    def __init__(
+            self,
+            refresh_interval: Optional[float] = None,
+            use_change_streams: Optional[bool] = None,
+            debounce_seconds: Optional[float] = None
+    ):
+        self.refresh_interval = refresh_interval if refresh_interval is not None else float(
+            os.getenv("FACETS_REFRESH_SECONDS", "300")
+        )
+        self.use_change_streams = use_change_streams if use_change_streams is not None else (
+            os.getenv("FACETS_CHANGE_STREAMS", "false").lower() == "true"
+        )
+        # Bursts of writes trigger one rebuild at most this often
+        self.debounce_seconds = debounce_seconds if debounce_seconds is not None else float(
+            os.getenv("FACETS_DEBOUNCE_SECONDS", "5")
+        )
+        self._facets: Optional[Dict[str, Dict[Any, Dict[str, Any]]]] = None
+        self._signatures: Optional[Dict[str, str]] = None
+        self._listeners: List[Callable[[str], None]] = []
+        self._loaded_at: Optional[float] = None
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.mode = "manual"
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.last_error: Optional[str] = None
+        self.last_refresh_ms: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._facets is not None
+
+    def add_change_listener(self, listener: Callable[[str], None]):
+        """Call listener(collection_name) whenever a data collection changes."""
+        self._listeners.append(listener)
+
+    def _notify(self, collection_names: Iterable[str]):
+        for collection_name in collection_names:
+            for listener in self._listeners:
+                try:
+                    listener(collection_name)
+                except Exception as e:
+                    print(f"⚠️ Facets change listener failed for {collection_name}: {e}")
+
+    def refresh(self, db: Database, changed: Iterable[str] = ()) -> Dict[str, Dict[Any, Dict[str, Any]]]:
+        """
+        Rebuild the facets from the data collections.
+
+        Listeners hear once about each collection that is in changed or whose
+        counts moved.
+
+        Args:
+            db: Database
+            changed: Collections known to have changed (e.g. from a change
+                stream), even if their counts did not
+
+        Returns:
+            The new facets (see build_facets)
+        """
+        with self._refresh_lock:
+            started = time.perf_counter()
+            rows = []
+            signatures = {}
+            for collection_name in DATA_COLLECTIONS:
+                groups = list(db[collection_name].aggregate(_facet_pipeline()))
+                signatures[collection_name] = repr(sorted(
+                    (repr(doc.get("_id")), doc.get("count", 0)) for doc in groups
+                ))
+                for doc in groups:
+                    group = doc.get("_id") or {}
+                    rows.append({
+                        "collection": collection_name,
+                        "city": group.get("city"),
+                        "category": group.get("category"),
+                        "count": doc.get("count", 0),
+                    })
+            facets = build_facets(rows)
+            # Swapped in one assignment; readers never see a partial rebuild
+            self._facets = facets
+            previous, self._signatures = self._signatures, signatures
+            self._loaded_at = time.time()
+            self.last_refresh_ms = round((time.perf_counter() - started) * 1000, 1)
+            self.refreshes += 1
+
+        changed = set(changed)
+        if previous is not None:
+            # Count changes per city/category are visible here even without change streams
+            changed.update(name for name in DATA_COLLECTIONS if previous.get(name) != signatures.get(name))
+        self._notify(name for name in DATA_COLLECTIONS if name in changed)
+        return facets
+
+    def ensure_loaded(self, db: Database):
+        """Load the facets on first use if startup could not."""
+        if not self.loaded:
+            self.refresh(db)
+
+    def cities(self, collection: Optional[str] = None) -> Dict[str, Any]:
+        """Sorted city names and document counts, for one collection or all of them."""
+        return (self._facets or {}).get("cities", {}).get(collection, EMPTY_VIEW)
+
+    def categories(self, collection: Optional[str] = None, city: Optional[str] = None) -> Dict[str, Any]:
+        """Sorted categories and counts, optionally within one collection and/or city."""
+        key = (collection, city.strip().casefold() if city else None)
+        return (self._facets or {}).get("categories", {}).get(key, EMPTY_VIEW)
+
+    def city_collections(self, city: str) -> Dict[str, int]:
+        """Documents per collection for one city (exact name as listed by cities())."""
+        return (self._facets or {}).get("city_collections", {}).get(city, {})
+
+    def _safe_refresh(self, db: Database, changed: Iterable[str] = ()):
+        try:
+            self.refresh(db, changed)
+        except Exception as e:
+            self.refresh_errors += 1
+            self.last_error = str(e)
+            print(f"⚠️ Facets refresh failed: {e}")
+            # Collections the change stream reported still changed
+            self._notify(name for name in DATA_COLLECTIONS if name in set(changed))
+
+    def _refresh_loop(self, db: Database):
+        self.mode = "interval"
+        while not self._stop_event.wait(self.refresh_interval):
+            self._safe_refresh(db)
+
+    def _watch_loop(self, db: Database):
+        pipeline = [{"$match": {"ns.coll": {"$in": DATA_COLLECTIONS}}}]
+        try:
+            with db.watch(pipeline, max_await_time_ms=1000) as stream:
+                self.mode = "change_stream"
+                changed = set()
+                last_refresh = time.monotonic()
+                while not self._stop_event.is_set():
+                    change = stream.try_next()
+                    if change is not None:
+                        changed.add(change.get("ns", {}).get("coll"))
+                    if changed and time.monotonic() - last_refresh >= self.debounce_seconds:
+                        # Updates that keep every count the same still invalidate listeners
+                        self._safe_refresh(db, changed)
+                        changed = set()
+                        last_refresh = time.monotonic()
+        except PyMongoError as e:
+            # Change streams need a replica set or sharded cluster
+            self.last_error = str(e)
+            print(f"⚠️ Facets change stream unavailable, refreshing every {self.refresh_interval}s: {e}")
+            if self.refresh_interval > 0:
+                self._refresh_loop(db)
+
+    def start(self, db: Database):
+        """Keep the facets fresh in the background (change stream or interval)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if not self.use_change_streams and self.refresh_interval <= 0:
+            return
+        self._stop_event.clear()
+        target = self._watch_loop if self.use_change_streams else self._refresh_loop
+        self._thread = threading.Thread(target=target, args=(db,), name="facets-cache", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cache state for monitoring endpoints."""
+        loaded_at = self._loaded_at
+        return {
+            "loaded": self.loaded,
+            "mode": self.mode,
+            "age_seconds": round(time.time() - loaded_at, 1) if loaded_at else None,
+            "refresh_interval_seconds": self.refresh_interval,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "last_refresh_ms": self.last_refresh_ms,
+            "last_error": self.last_error,
+            "cities": len(self.cities()["names"]),
+            "categories": len(self.categories()["names"]),
+        }
+
+# Create singleton instance
+facets_cache = FacetsCache()
@@ -0,0 +1,96 @@
+from typing import Any, Dict, List, Optional
+
+from .search_specs import SEARCH_SPECS
+
+# GeoJSON point derived from lat/lon: {"type": "Point", "coordinates": [lon, lat]}
+LOCATION_FIELD = "location"
+DISTANCE_FIELD = "distanceMeters"
+
+# Collections declared geo in search_specs (2dsphere index on LOCATION_FIELD)
+GEO_COLLECTIONS: List[str] = [spec.collection for spec in SEARCH_SPECS.values() if spec.geo]
+
+# Documents whose lat/lon can be turned into a valid point
+VALID_LAT_LON_FILTER: Dict[str, Any] = {
+    "lat": {"$type": "number", "$gte": -90, "$lte": 90},
+    "lon": {"$type": "number", "$gte": -180, "$lte": 180},
+}
+
+def geo_point(lat: float, lon: float) -> Dict[str, Any]:
+    """
+    Build a GeoJSON point, e.g. for the location field of a new document.
+
+    Raises:
+        ValueError: If lat/lon are out of range
+    """
+    if not -90 <= lat <= 90 or not -180 <= lon <= 180:
+        raise ValueError(f"Invalid coordinates lat={lat}, lon={lon}")
+    return {"type": "Point", "coordinates": [lon, lat]}
+
+def location_expression() -> Dict[str, Any]:
+    """Aggregation expression building the location point from lat/lon (for pipeline updates)."""
+    return {"type": "Point", "coordinates": ["$lon", "$lat"]}
+
+def _valid_coordinate(field: str, limit: float) -> Dict[str, Any]:
+    return {"$and": [
+        {"$isNumber": f"${field}"},
+        {"$gte": [f"${field}", -limit]},
+        {"$lte": [f"${field}", limit]},
+    ]}
+
+def location_fields_expression() -> Dict[str, Any]:
+    """
+    $set content keeping the location field in step with lat/lon.
+
+    Documents without valid coordinates lose a stale point instead of
+    getting an invalid one the 2dsphere index would reject.
+    """
+    valid = {"$and": [_valid_coordinate("lat", 90), _valid_coordinate("lon", 180)]}
+    return {LOCATION_FIELD: {"$cond": [valid, location_expression(), "$$REMOVE"]}}
+
+def stale_location_filter() -> Dict[str, Any]:
+    """Documents whose location point is missing, out of date, or left over from removed coordinates."""
+    return {"$or": [
+        {**VALID_LAT_LON_FILTER, "$expr": {"$ne": [f"${LOCATION_FIELD}", location_expression()]}},
+        {"$nor": [VALID_LAT_LON_FILTER], LOCATION_FIELD: {"$exists": True}},
+    ]}
+
+def build_geo_near_pipeline(
+        lat: float,
+        lon: float,
+        radius_meters: float,
+        query_filter: Optional[Dict[str, Any]] = None,
+        skip: int = 0,
+        limit: int = 10,
+        projection: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Aggregation pipeline returning documents within radius_meters, nearest first.
+
+    Args:
+        lat: Latitude of the search centre
+        lon: Longitude of the search centre
+        radius_meters: Maximum distance in meters
+        query_filter: Extra conditions; pass the builder's collation to aggregate()
+        skip: Number of results to skip (pagination)
+        limit: Maximum number of results
+        projection: Fields to return; the distance field is always included
+
+    Returns:
+        Pipeline for collection.aggregate()
+    """
+    pipeline: List[Dict[str, Any]] = [
+        {"$geoNear": {
+            "near": geo_point(lat, lon),
+            "key": LOCATION_FIELD,
+            "distanceField": DISTANCE_FIELD,
+            "maxDistance": radius_meters,
+            "spherical": True,
+            "query": query_filter or {},
+        }}
+    ]
+    if skip:
+        pipeline.append({"$skip": skip})
+    pipeline.append({"$limit": limit})
+    if projection:
+        pipeline.append({"$project": {**projection, DISTANCE_FIELD: 1}})
+    return pipeline
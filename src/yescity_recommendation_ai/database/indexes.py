@@ -0,0 +1,276 @@
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, IndexModel
+from pymongo.collation import Collation
+from pymongo.database import Database
+from pymongo.errors import OperationFailure
+
+from .query_builder import NORMALIZED_FIELDS
+from .search_specs import SEARCH_SPECS
+
+# Case-insensitive comparison; queries must pass the same collation to use these indexes
+CASE_INSENSITIVE = {"locale": "en", "strength": 2}
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """Declarative description of one MongoDB index."""
+    name: str
+    keys: Tuple[Tuple[str, Any], ...]
+    collation: Optional[Dict[str, Any]] = None
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    def to_index_model(self) -> IndexModel:
+        kwargs = dict(self.options)
+        if self.collation:
+            kwargs["collation"] = Collation(**self.collation)
+        return IndexModel(list(self.keys), name=self.name, **kwargs)
+
+def _key_name(field: str) -> str:
+    return "id" if field == "_id" else field
+
+def _index(mode: str, *keys: Tuple[str, Any]) -> IndexSpec:
+    """
+    Index on keys in the given match mode.
+
+    Text fields (see query_builder.NORMALIZED_FIELDS) are indexed the way
+    QueryBuilder queries them: with the case-insensitive collation
+    ("collation", names end in _ci) or through their stored *_norm copy
+    ("normalized").
+    """
+    if mode == "normalized":
+        keys = tuple((NORMALIZED_FIELDS.get(key, key), direction) for key, direction in keys)
+        return IndexSpec("_".join(_key_name(key) for key, _ in keys), keys)
+    return IndexSpec("_".join(_key_name(key) for key, _ in keys) + "_ci", tuple(keys), CASE_INSENSITIVE)
+
+def _location_index() -> IndexSpec:
+    # 2dsphere needs a GeoJSON point, so lat/lon are indexed through the
+    # derived "location" field ({"type": "Point", "coordinates": [lon, lat]})
+    return IndexSpec("location_2dsphere", (("location", GEOSPHERE),))
+
+def is_prefix_of(index: IndexSpec, other: IndexSpec) -> bool:
+    """True if other's keys start with all of index's keys, under the same collation and options."""
+    return (
+        len(index.keys) < len(other.keys)
+        and other.keys[:len(index.keys)] == index.keys
+        and index.collation == other.collation
+        and not index.options
+        and not other.options
+    )
+
+def without_prefix_redundant(specs: List[IndexSpec]) -> List[IndexSpec]:
+    """
+    Drop indexes whose keys are a prefix of another index on the collection.
+
+    MongoDB serves a query on {cityName} from {cityName, category, ...}
+    just as well, so the shorter index only costs writes and RAM.
+    """
+    return [spec for spec in specs if not any(is_prefix_of(spec, other) for other in specs)]
+
+def build_index_registry(mode: Optional[str] = None) -> Dict[str, List[IndexSpec]]:
+    """
+    Indexes per YesCity3 collection for one QUERY_MATCH_MODE, built from
+    the index key shapes and geo flag of each search_specs.CollectionSpec.
+
+    Only the active mode's family is built: the *_ci indexes for
+    "collation", the *_norm ones for "normalized".
+    """
+    mode = (mode or os.getenv("QUERY_MATCH_MODE", "collation")).lower()
+    registry = {
+        spec.collection: [_index(mode, *keys) for keys in spec.indexes]
+        + ([_location_index()] if spec.geo else [])
+        for spec in SEARCH_SPECS.values()
+    }
+    return {collection: without_prefix_redundant(specs) for collection, specs in registry.items()}
+
+# Indexes per YesCity3 collection, for the QUERY_MATCH_MODE of this process
+INDEX_REGISTRY: Dict[str, List[IndexSpec]] = build_index_registry()
+
+def get_hot_queries() -> List[Dict[str, Any]]:
+    """
+    Hot query shapes used by the tools and API, checked with explain().
+
+    Filters come from QueryBuilder so they match whatever QUERY_MATCH_MODE
+    the application is running with.
+    """
+    from .query_builder import QueryBuilder
+
+    shapes = [
+        ("foods by city", QueryBuilder().equals("cityName", "Agra")),
+        ("foods by city and category", QueryBuilder().equals("cityName", "Agra").equals("category", "Sweets")),
+        ("foods by category (/foods)", QueryBuilder().equals("category", "Sweets")),
+        ("foods by name (/foods/{id})", QueryBuilder().equals("foodPlace", "Panchi Petha")),
+    ]
+
+    hot_queries = []
+    for description, builder in shapes:
+        query_filter, collation = builder.build()
+        hot_queries.append({
+            "description": description,
+            "collection": "foods",
+            "filter": query_filter,
+            "collation": collation.document if collation else None,
+        })
+
+    # /foods pages: keyset on _id within a city
+    query_filter, collation = QueryBuilder().equals("cityName", "Agra").build()
+    hot_queries.append({
+        "description": "foods page by city (/foods)",
+        "collection": "foods",
+        "filter": {**query_filter, "_id": {"$gt": ObjectId("000000000000000000000000")}},
+        "collation": collation.document if collation else None,
+        "sort": [("_id", ASCENDING)],
+    })
+
+    # Search tools and /category-search: top-N by composite score within a city
+    for description, builder in [
+        ("top foods by city (FoodSearchTool)", QueryBuilder().equals("cityName", "Agra")),
+        ("top foods by city above a rating (FoodSearchTool)",
+         QueryBuilder().equals("cityName", "Agra").where("avgRating", {"$gte": 4})),
+        ("top foods by city and category (/category-search, search tools)",
+         QueryBuilder().equals("cityName", "Agra").equals("category", "Sweets")),
+    ]:
+        query_filter, collation = builder.build()
+        hot_queries.append({
+            "description": description,
+            "collection": "foods",
+            "filter": query_filter,
+            "collation": collation.document if collation else None,
+            "sort": [("compositeScore", DESCENDING)],
+        })
+
+    # /nearby and NearbySpotsTool use $geoNear; $near is the find() equivalent for explain()
+    hot_queries.append({
+        "description": "foods near a point (/nearby)",
+        "collection": "foods",
+        "filter": {"location": {"$near": {
+            "$geometry": {"type": "Point", "coordinates": [78.0421, 27.1751]},
+            "$maxDistance": 2000,
+        }}},
+        "collation": None,
+    })
+    return hot_queries
+
+def find_unregistered_indexes(db: Database, registry: Dict[str, List[IndexSpec]] = None) -> Dict[str, List[str]]:
+    """
+    Indexes present on the registered collections that the registry no longer declares.
+
+    These are left over from earlier registries or the other match mode and
+    only cost writes and RAM. The _id index is never reported.
+
+    Returns:
+        Mapping of collection name to unregistered index names
+    """
+    registry = registry or INDEX_REGISTRY
+    unregistered: Dict[str, List[str]] = {}
+    for collection_name, specs in registry.items():
+        declared = {spec.name for spec in specs} | {"_id_"}
+        names = [name for name in db[collection_name].index_information() if name not in declared]
+        if names:
+            unregistered[collection_name] = sorted(names)
+    return unregistered
+
+def ensure_indexes(
+        db: Database,
+        registry: Dict[str, List[IndexSpec]] = None,
+        drop_unregistered: Optional[bool] = None
+) -> Dict[str, List[str]]:
+    """
+    Create every declared index. Safe to call on every startup.
+
+    Existing identical indexes are a no-op for MongoDB; an index that exists
+    with different options is reported and skipped rather than failing startup.
+    Indexes the registry no longer declares are reported, and dropped first
+    when drop_unregistered is set (MONGODB_DROP_UNREGISTERED_INDEXES).
+
+    Returns:
+        Mapping of collection name to the index names that are in place
+    """
+    registry = registry or INDEX_REGISTRY
+    if drop_unregistered is None:
+        drop_unregistered = os.getenv("MONGODB_DROP_UNREGISTERED_INDEXES", "false").lower() == "true"
+
+    for collection_name, names in find_unregistered_indexes(db, registry).items():
+        for name in names:
+            if drop_unregistered:
+                db[collection_name].drop_index(name)
+                print(f"🗑️ Dropped unregistered index '{name}' on '{collection_name}'")
+            else:
+                print(
+                    f"⚠️ Index '{name}' on '{collection_name}' is not registered; "
+                    f"drop it with MONGODB_DROP_UNREGISTERED_INDEXES=true"
+                )
+
+    ensured: Dict[str, List[str]] = {}
+
+    for collection_name, specs in registry.items():
+        collection = db[collection_name]
+        ensured[collection_name] = []
+        for spec in specs:
+            try:
+                collection.create_indexes([spec.to_index_model()])
+                ensured[collection_name].append(spec.name)
+            except OperationFailure as e:
+                print(f"⚠️ Index '{spec.name}' on '{collection_name}' not created: {e}")
+
+    print(f"🗂️ Ensured {sum(len(names) for names in ensured.values())} indexes on {len(ensured)} collections")
+    return ensured
+
+def _plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """Flatten the stage names of an explain() plan tree."""
+    stages = [plan.get("stage", "")]
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            stages.extend(_plan_stages(plan[key]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+def uses_index(explain_output: Dict[str, Any]) -> bool:
+    """True if the winning plan reads from an index and never scans the collection."""
+    winning_plan = explain_output.get("queryPlanner", {}).get("winningPlan", {})
+    stages = _plan_stages(winning_plan)
+    return "COLLSCAN" not in stages and any(
+        stage in ("IXSCAN", "EXPRESS_IXSCAN", "GEO_NEAR_2DSPHERE", "IDHACK", "EXPRESS_IDHACK")
+        for stage in stages
+    )
+
+def check_hot_queries(db: Database, hot_queries: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Explain each hot query and report whether it is served by an index.
+
+    Returns:
+        One report per query with its stages and a uses_index flag
+    """
+    reports = []
+    for query in hot_queries or get_hot_queries():
+        collation = Collation(**query["collation"]) if query.get("collation") else None
+        cursor = db[query["collection"]].find(query["filter"], collation=collation)
+        if query.get("sort"):
+            cursor = cursor.sort(query["sort"]).limit(10)
+        explain_output = cursor.explain()
+        winning_plan = explain_output.get("queryPlanner", {}).get("winningPlan", {})
+        stages = _plan_stages(winning_plan)
+        reports.append({
+            "description": query["description"],
+            "collection": query["collection"],
+            "stages": stages,
+            # A SORT stage means the index did not provide the order
+            "uses_index": uses_index(explain_output) and "SORT" not in stages,
+        })
+    return reports
+
+if __name__ == "__main__":
+    # python -m yescity_recommendation_ai.database.indexes [--check] [--drop-unregistered]
+    from .mongodb_client import mongodb_client
+
+    ensure_indexes(mongodb_client.db, drop_unregistered="--drop-unregistered" in sys.argv or None)
+    if "--check" in sys.argv:
+        reports = check_hot_queries(mongodb_client.db)
+        for report in reports:
+            status = "✅" if report["uses_index"] else "❌"
+            print(f"{status} {report['description']}: {' <- '.join(report['stages'])}")
+        sys.exit(0 if all(report["uses_index"] for report in reports) else 1)
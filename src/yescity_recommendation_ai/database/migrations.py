@@ -0,0 +1,122 @@
+import argparse
+from typing import Dict, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+from .collection_registry import DATA_COLLECTIONS
+from .query_builder import NORMALIZED_FIELDS, normalized_fields
+from .ratings import rating_fields_expression, stale_rating_filter
+from .geo import GEO_COLLECTIONS, LOCATION_FIELD, VALID_LAT_LON_FILTER, location_expression
+
+
+def backfill_normalized_fields(
+        db: Database,
+        collections: Optional[List[str]] = None,
+        batch_size: int = 500
+) -> Dict[str, int]:
+    """
+    Store *_norm copies of cityName/category/foodPlace on existing documents.
+
+    Safe to re-run: only documents whose normalized values differ are updated.
+
+    Returns:
+        Mapping of collection name to number of documents updated
+    """
+    updated: Dict[str, int] = {}
+    projection = {field: 1 for field in NORMALIZED_FIELDS}
+    projection.update({norm_field: 1 for norm_field in NORMALIZED_FIELDS.values()})
+
+    for collection_name in collections or DATA_COLLECTIONS:
+        collection = db[collection_name]
+        updated[collection_name] = 0
+        operations = []
+
+        for doc in collection.find({}, projection, batch_size=batch_size):
+            changes = {
+                norm_field: value
+                for norm_field, value in normalized_fields(doc).items()
+                if doc.get(norm_field) != value
+            }
+            if changes:
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": changes}))
+
+            if len(operations) >= batch_size:
+                updated[collection_name] += collection.bulk_write(operations, ordered=False).modified_count
+                operations = []
+
+        if operations:
+            updated[collection_name] += collection.bulk_write(operations, ordered=False).modified_count
+
+        print(f"🔁 {collection_name}: normalized fields updated on {updated[collection_name]} documents")
+
+    return updated
+
+def backfill_rating_fields(db: Database, collection_name: str = "foods", only_stale: bool = False) -> int:
+    """
+    Store avgRating and compositeScore on every food document.
+
+    Runs as a single pipeline update computed by the server; safe to re-run.
+
+    Args:
+        db: Database
+        collection_name: Collection holding the ratings
+        only_stale: Only rewrite documents whose stored scores are missing or out of date
+
+    Returns:
+        Number of documents whose values changed
+    """
+    query_filter = stale_rating_filter() if only_stale else {}
+    result = db[collection_name].update_many(query_filter, [{"$set": rating_fields_expression()}])
+    print(f"⭐ {collection_name}: rating fields updated on {result.modified_count} documents")
+    return result.modified_count
+
+def backfill_locations(db: Database, collections: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Store a GeoJSON location point built from lat/lon for the 2dsphere index.
+
+    Documents without valid numeric coordinates are skipped. Safe to re-run.
+
+    Returns:
+        Mapping of collection name to number of documents updated
+    """
+    updated: Dict[str, int] = {}
+    for collection_name in collections or GEO_COLLECTIONS:
+        result = db[collection_name].update_many(
+            VALID_LAT_LON_FILTER,
+            [{"$set": {LOCATION_FIELD: location_expression()}}]
+        )
+        updated[collection_name] = result.modified_count
+        print(f"📍 {collection_name}: location updated on {result.modified_count} documents")
+    return updated
+
+def main():
+    parser = argparse.ArgumentParser(description="YesCity3 data migrations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    normalized = subparsers.add_parser("backfill-normalized", help="Store *_norm copies of cityName/category/foodPlace")
+    normalized.add_argument("collections", nargs="*", help="Collections to migrate (default: all)")
+    normalized.add_argument("--batch-size", type=int, default=500)
+
+    ratings = subparsers.add_parser("backfill-ratings", help="Store avgRating/compositeScore on foods")
+    ratings.add_argument("--only-stale", action="store_true", help="Skip documents whose scores are up to date")
+
+    locations = subparsers.add_parser("backfill-locations", help="Store GeoJSON location points from lat/lon")
+    locations.add_argument("collections", nargs="*", help="Collections to migrate (default: all with a 2dsphere index)")
+
+    args = parser.parse_args()
+
+    from .mongodb_client import mongodb_client
+
+    if args.command == "backfill-normalized":
+        backfill_normalized_fields(mongodb_client.db, args.collections or None, args.batch_size)
+    elif args.command == "backfill-ratings":
+        backfill_rating_fields(mongodb_client.db, only_stale=args.only_stale)
+    elif args.command == "backfill-locations":
+        backfill_locations(mongodb_client.db, args.collections or None)
+
+if __name__ == "__main__":
+    # python -m yescity_recommendation_ai.database.migrations backfill-normalized [collections...]
+    # python -m yescity_recommendation_ai.database.migrations backfill-ratings [--only-stale]
+    # python -m yescity_recommendation_ai.database.migrations backfill-locations [collections...]
+    main()
@@ -1,20 +1,101 @@
 import os
-from typing import Optional
-from pymongo import MongoClient
+import time
+import asyncio
+import threading
+import importlib.util
+from typing import Any, Dict, List, Optional
+from pymongo import AsyncMongoClient, MongoClient, ReadPreference
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.database import Database
 from dotenv import load_dotenv
 
+from .collection_registry import collection_registry
+from .pool_monitor import async_pool_metrics, sync_pool_metrics
+
 load_dotenv()
 
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+# Modules pymongo (>=4.16) loads for each wire compressor; zlib ships with Python
+COMPRESSOR_MODULES = {
+    "zstd": ("compression.zstd", "backports.zstd"),
+    "snappy": ("snappy",),
+    "zlib": ("zlib",),
+}
+
+def _module_available(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        # Parent package missing, e.g. "compression" before Python 3.14
+        return False
+
+def _available_compressors(names: str) -> List[str]:
+    """Keep only the requested compressors whose modules are installed."""
+    available = []
+    for name in (n.strip() for n in names.split(",")):
+        modules = COMPRESSOR_MODULES.get(name, ())
+        if any(_module_available(module) for module in modules):
+            available.append(name)
+    return available
+
+def get_client_options() -> Dict[str, Any]:
+    """
+    MongoClient options from the environment.
+
+    Timeouts are in milliseconds. Server selection fails after 5s instead of
+    pymongo's 30s default so an unreachable node does not hang requests.
+    """
+    options = {
+        "maxPoolSize": int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+        "minPoolSize": int(os.getenv("MONGODB_MIN_POOL_SIZE", "0")),
+        "maxIdleTimeMS": int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000")),
+        "waitQueueTimeoutMS": int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000")),
+        "serverSelectionTimeoutMS": int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+        "connectTimeoutMS": int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000")),
+        "socketTimeoutMS": int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "30000")),
+        "readPreference": os.getenv("MONGODB_READ_PREFERENCE", "primary"),
+        "appname": os.getenv("MONGODB_APP_NAME", "yescity-recommendation-ai"),
+    }
+    compressors = _available_compressors(os.getenv("MONGODB_COMPRESSORS", "zstd,snappy,zlib"))
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return options
+
+def get_data_read_preference():
+    """Read preference for the read-only data endpoints (MONGODB_DATA_READ_PREFERENCE)."""
+    name = os.getenv("MONGODB_DATA_READ_PREFERENCE", "secondaryPreferred")
+    if name not in READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference '{name}'. Use one of: {', '.join(READ_PREFERENCES)}")
+    return READ_PREFERENCES[name]
+
 class MongoDBClient:
+    """
+    Process-local MongoDB clients, created lazily.
+
+    Nothing connects at import. Clients are created on first use or by
+    startup() (called from the FastAPI lifespan), and are recreated when the
+    process id changes, so each forked uvicorn/gunicorn worker gets its own
+    connection pools instead of sharing sockets inherited from the parent.
+    """
     _instance: Optional['MongoDBClient'] = None
     _client: Optional[MongoClient] = None
     _db: Optional[Database] = None
+    _async_client: Optional[AsyncMongoClient] = None
+    _async_db: Optional[AsyncDatabase] = None
+    _pid: Optional[int] = None
+    _startup_ms: Optional[float] = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(MongoDBClient, cls).__new__(cls)
-            cls._instance._init_client()
+            cls._instance._lock = threading.Lock()
         return cls._instance
     
     def _init_client(self):
@@ -22,40 +103,134 @@ class MongoDBClient:
         if not mongodb_uri:
             raise ValueError("MONGODB_URI environment variable is not set.")
         database_name = os.getenv("MONGODB_DATABASE","YesCity3")
+        self._mongodb_uri = mongodb_uri
+        self._database_name = database_name
+
+        if self._pid is not None and self._pid != os.getpid():
+            # Forked after the parent connected: drop inherited clients without
+            # closing them, which would tear down the parent's sockets
+            self._async_client = None
+            self._async_db = None
+            sync_pool_metrics.reset()
+            async_pool_metrics.reset()
 
         try:
-            self._client = MongoClient(mongodb_uri)
+            self._client_options = get_client_options()
+            self._data_read_preference = get_data_read_preference()
+            # MongoClient connects in the background; no round trip here
+            self._client = MongoClient(
+                mongodb_uri,
+                event_listeners=[sync_pool_metrics],
+                **self._client_options
+            )
             self._db = self._client[database_name]
-            print(f"✅ Connected to MongoDB: {database_name}")
-            
-            # Test connection by listing collections
-            collections = self._db.list_collection_names()
-            print(f"📊 Available collections: {len(collections)}")
+            self._pid = os.getpid()
+            print(f"✅ MongoDB client created for {database_name} (pid {self._pid})")
 
         except Exception as e:
-            print(f"❌ Failed to connect to MongoDB: {e}")
+            print(f"❌ Failed to create MongoDB client: {e}")
             raise
 
+    def _ensure_client(self):
+        if self._db is None or self._pid != os.getpid():
+            with self._lock:
+                if self._db is None or self._pid != os.getpid():
+                    self._init_client()
+
     @property
     def db(self) -> Database:
-        if self._db is None:
-            self._init_client()
+        self._ensure_client()
         return self._db
     
+    @property
+    def async_db(self) -> AsyncDatabase:
+        """
+        Database handle backed by the asyncio client, for use inside the event loop.
+
+        The async client is created on first use so that it binds to the
+        running event loop rather than to whatever loop existed at import.
+        """
+        self._ensure_client()
+        if self._async_db is None:
+            self._async_client = AsyncMongoClient(
+                self._mongodb_uri,
+                event_listeners=[async_pool_metrics],
+                **self._client_options
+            )
+            self._async_db = self._async_client[self._database_name]
+        return self._async_db
+
+    async def startup(self):
+        """
+        Create this process's clients, verify the connection and load
+        collection metadata. Called once per worker from the app lifespan.
+        """
+        started = time.perf_counter()
+        await self.async_db.command("ping")
+        collections = await asyncio.to_thread(collection_registry.refresh, self.db)
+        self._startup_ms = round((time.perf_counter() - started) * 1000, 2)
+        print(f"✅ Connected to MongoDB: {self._database_name} in {self._startup_ms}ms (pid {self._pid})")
+        print(f"📊 Available collections: {len(collections)}")
+
+    async def shutdown(self):
+        """Close this process's clients."""
+        await self.aclose()
+        self.close()
+
     def get_collection(self,collection_name: str):
-        if collection_name not in self.db.list_collection_names():
+        """Get a data collection; reads use MONGODB_DATA_READ_PREFERENCE."""
+        # Served from the cached registry; no server round trip per call
+        if collection_registry.has_collection(collection_name) is False:
             print(f"⚠️ Collection '{collection_name}' not found")
-        return self.db[collection_name]
+        return self.db.get_collection(collection_name, read_preference=self._data_read_preference)
     
     def get_foods_collection(self):
         """Get foods collection specifically."""
         return self.get_collection("foods")
 
+    def get_async_collection(self, collection_name: str):
+        """Get a data collection from the async client; reads use MONGODB_DATA_READ_PREFERENCE."""
+        async_db = self.async_db
+        return async_db.get_collection(collection_name, read_preference=self._data_read_preference)
+
+    def get_async_foods_collection(self):
+        """Get foods collection from the async client."""
+        return self.get_async_collection("foods")
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Per-worker connection pool metrics for both clients plus the effective settings."""
+        if self._db is None:
+            return {"pid": os.getpid(), "connected": False}
+        sync_stats = sync_pool_metrics.stats()
+        async_stats = async_pool_metrics.stats()
+        return {
+            "pid": self._pid,
+            "connected": True,
+            "startup_ms": self._startup_ms,
+            "open_connections": sync_stats["open_connections"] + async_stats["open_connections"],
+            "settings": {
+                key: value for key, value in self._client_options.items() if key != "appname"
+            },
+            "data_read_preference": self._data_read_preference.mongos_mode,
+            "sync": sync_stats,
+            "async": async_stats,
+        }
+
+    async def aclose(self):
+        """Close the async MongoDB connection."""
+        if self._async_client:
+            await self._async_client.close()
+            self._async_client = None
+            self._async_db = None
+            print("🔌 Async MongoDB connection closed.")
+
     def close(self):
         """Close MongoDB connection."""
         if self._client:
             self._client.close()
+            self._client = None
+            self._db = None
             print("🔌 MongoDB connection closed.")
 
-# Global instance
-mongodb_client = MongoDBClient()
\ No newline at end of file
+# Global instance; connects lazily, see startup()
+mongodb_client = MongoDBClient()
@@ -0,0 +1,88 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+
+def _filters_fingerprint(filters: Dict[str, Any]) -> str:
+    source = json.dumps(filters, sort_keys=True, default=str)
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+
+def encode_cursor(last_id: Any, filters: Dict[str, Any]) -> str:
+    """
+    Opaque keyset cursor pointing after last_id.
+
+    The cursor carries a fingerprint of the filters it was issued for, so it
+    cannot be replayed against a different query.
+    """
+    payload = json.dumps({"after": str(last_id), "f": _filters_fingerprint(filters)})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, filters: Dict[str, Any]) -> ObjectId:
+    """
+    Return the _id a cursor points after.
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for other filters
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        after = ObjectId(payload["after"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if payload.get("f") != _filters_fingerprint(filters):
+        raise ValueError("Cursor does not match the current filters")
+    return after
+
+class CountCache:
+    """
+    Short-lived cache of count_documents() results keyed by filter.
+
+    Totals only need to be roughly current, so repeated pages of the same
+    listing reuse one count instead of re-counting on every request.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_size: int = 512):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            os.getenv("COUNT_CACHE_TTL", "60")
+        )
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(collection_name: str, filters: Dict[str, Any]) -> Tuple[str, str]:
+        return collection_name, _filters_fingerprint(filters)
+
+    def get(self, collection_name: str, filters: Dict[str, Any]) -> Optional[int]:
+        key = self._key(collection_name, filters)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def set(self, collection_name: str, filters: Dict[str, Any], count: int):
+        key = self._key(collection_name, filters)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), count)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Create singleton instance
+count_cache = CountCache()
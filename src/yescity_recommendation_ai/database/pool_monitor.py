@@ -0,0 +1,101 @@
+import threading
+from collections import deque
+from typing import Any, Dict
+
+from pymongo import monitoring
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Collects connection pool metrics from pymongo's CMAP events.
+
+    Tracks connections currently checked out, open connections, checkout
+    wait times and failed checkouts (e.g. waitQueueTimeoutMS exceeded)
+    so pool exhaustion shows up on the monitoring endpoint.
+    """
+
+    def __init__(self, label: str, wait_samples: int = 1000):
+        self.label = label
+        self._lock = threading.Lock()
+        self._wait_times = deque(maxlen=wait_samples)
+        self.reset()
+
+    def reset(self):
+        """Forget all counters, e.g. in a forked worker."""
+        self._wait_times.clear()
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.open_connections = 0
+        self.checkouts = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.pool_clears = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections = max(0, self.open_connections - 1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            reason = str(event.reason)
+            self.checkout_failures[reason] = self.checkout_failures.get(reason, 0) + 1
+            if event.duration is not None:
+                self._wait_times.append(event.duration)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            if event.duration is not None:
+                self._wait_times.append(event.duration)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current pool usage and checkout wait times in milliseconds."""
+        with self._lock:
+            waits = sorted(self._wait_times)
+            stats = {
+                "client": self.label,
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "open_connections": self.open_connections,
+                "checkouts": self.checkouts,
+                "checkout_failures": dict(self.checkout_failures),
+                "pool_clears": self.pool_clears,
+            }
+        if waits:
+            stats["checkout_wait_ms"] = {
+                "avg": round(sum(waits) / len(waits) * 1000, 3),
+                "p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 3),
+                "max": round(waits[-1] * 1000, 3),
+            }
+        return stats
+
+# Create singleton instances, one per client
+sync_pool_metrics = PoolMetricsListener("sync")
+async_pool_metrics = PoolMetricsListener("async")
@@ -0,0 +1,62 @@
+from typing import Any, Dict, List, Optional
+
+from pymongo.database import Database
+
+from .collection_registry import DATA_COLLECTIONS
+from .search_specs import SEARCH_SPECS, truncated
+
+# Field holding the display name of a document in each collection, as
+# declared by its CollectionSpec.name_field (see find_missing_name_fields)
+NAME_FIELDS: Dict[str, str] = {collection: spec.name_field for collection, spec in SEARCH_SPECS.items()}
+
+# Fields the UI renders for a recommendation ("full view"), from CollectionSpec.full_view
+FULL_VIEW_PROJECTIONS: Dict[str, Dict[str, int]] = {
+    collection: spec.full_view_projection()
+    for collection, spec in SEARCH_SPECS.items()
+    if spec.full_view
+}
+
+# Compact documents handed to the crew's tools ("LLM view"). Everything a
+# tool returns ends up in the prompt; the full view is fetched when the
+# chosen ids are hydrated.
+LLM_VIEW_PROJECTIONS: Dict[str, Dict[str, Any]] = {
+    collection: spec.llm_view_projection() for collection, spec in SEARCH_SPECS.items()
+}
+
+def get_name_field(collection_name: str) -> str:
+    """Return the display-name field of a collection."""
+    return NAME_FIELDS.get(collection_name, "name")
+
+def find_missing_name_fields(db: Database) -> List[str]:
+    """
+    Data collections with documents but none that has the expected name field.
+
+    Such collections would list every recommendation as "Unknown"; declare
+    their real field as name_field in database/search_specs.py.
+    """
+    missing = []
+    for collection_name in DATA_COLLECTIONS:
+        collection = db[collection_name]
+        if collection.find_one({}, {"_id": 1}) is None:
+            continue
+        name_field = get_name_field(collection_name)
+        if collection.find_one({name_field: {"$exists": True}}, {"_id": 1}) is None:
+            missing.append(collection_name)
+    return missing
+
+def get_full_view_projection(collection_name: str) -> Optional[Dict[str, int]]:
+    """Return the UI projection of a collection, or None to fetch whole documents."""
+    projection = FULL_VIEW_PROJECTIONS.get(collection_name)
+    return dict(projection) if projection else None
+
+def get_llm_view_projection(collection_name: str) -> Dict[str, Any]:
+    """Return the compact projection used for tool results given to the LLM."""
+    projection = LLM_VIEW_PROJECTIONS.get(collection_name)
+    if projection:
+        return dict(projection)
+    return {
+        "_id": 1,
+        get_name_field(collection_name): 1,
+        "category": 1,
+        "description": truncated("description"),
+    }
@@ -0,0 +1,106 @@
+import os
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from pymongo.collation import Collation
+
+from ..utils.helpers import normalize_query, tokenize
+
+# Case-insensitive equality; matches the *_ci indexes in database/indexes.py
+CASE_INSENSITIVE_COLLATION = Collation(locale="en", strength=2)
+
+# Source field -> stored normalized copy (see migrations.backfill_normalized_fields)
+NORMALIZED_FIELDS: Dict[str, str] = {
+    "cityName": "cityName_norm",
+    "category": "category_norm",
+    "foodPlace": "foodPlace_norm",
+}
+
+def escape_regex(value: str) -> str:
+    """Escape user input for safe use inside a MongoDB $regex."""
+    return re.escape(value)
+
+def normalize_value(value: str) -> str:
+    """Normalize a field value the same way on write (backfill) and on read."""
+    return normalize_query(value)
+
+def normalized_fields(doc: Dict[str, Any]) -> Dict[str, str]:
+    """Compute the *_norm fields of a document, e.g. before inserting or updating it."""
+    return {
+        norm_field: normalize_value(doc[field])
+        for field, norm_field in NORMALIZED_FIELDS.items()
+        if isinstance(doc.get(field), str)
+    }
+
+class QueryBuilder:
+    """
+    Builds index-friendly MongoDB filters for text fields.
+
+    Two match modes (QUERY_MATCH_MODE):
+      - "collation" (default): equality on the original field with a
+        case-insensitive collation, served by the *_ci indexes.
+      - "normalized": equality on the stored *_norm copy (casefolded,
+        punctuation-free, city aliases canonicalized); requires the
+        backfill in database/migrations.py.
+
+    User input is never interpolated into a regex unescaped.
+    """
+
+    def __init__(self, mode: Optional[str] = None):
+        self.mode = (mode or os.getenv("QUERY_MATCH_MODE", "collation")).lower()
+        self.filter: Dict[str, Any] = {}
+        self._case_insensitive = False
+
+    def _use_normalized(self, field: str) -> bool:
+        return self.mode == "normalized" and field in NORMALIZED_FIELDS
+
+    def equals(self, field: str, value: Any) -> "QueryBuilder":
+        """Match a field exactly, ignoring case for strings."""
+        if not isinstance(value, str):
+            self.filter[field] = value
+        elif self._use_normalized(field):
+            self.filter[NORMALIZED_FIELDS[field]] = normalize_value(value)
+        else:
+            self.filter[field] = value.strip()
+            self._case_insensitive = True
+        return self
+
+    def prefix(self, field: str, value: str) -> "QueryBuilder":
+        """Match values starting with the given text, ignoring case."""
+        if self._use_normalized(field):
+            # Anchored, case-sensitive regex on the normalized field can use its index
+            self.filter[NORMALIZED_FIELDS[field]] = {"$regex": f"^{escape_regex(normalize_value(value))}"}
+        else:
+            self.filter[field] = {"$regex": f"^{escape_regex(value.strip())}", "$options": "i"}
+        return self
+
+    def contains(self, field: str, value: str) -> "QueryBuilder":
+        """
+        Match values containing the given words in order, ignoring case
+        ("Sweets" matches "Sweets & Desserts", "dessert" matches "Desserts").
+
+        Unanchored, so it cannot use an index on the field: use it next to an
+        indexed condition such as the city, e.g. as the fallback for
+        free-text values extracted by the LLM.
+        """
+        if self._use_normalized(field):
+            words = normalize_value(value).split(" ")
+            self.filter[NORMALIZED_FIELDS[field]] = {"$regex": r"\b" + r"\s+".join(map(escape_regex, words))}
+        else:
+            words = tokenize(value)
+            self.filter[field] = {"$regex": r"\b" + r"\W+".join(map(escape_regex, words)), "$options": "i"}
+        return self
+
+    def where(self, field: str, condition: Any) -> "QueryBuilder":
+        """Add a raw condition (numbers, booleans, operators)."""
+        self.filter[field] = condition
+        return self
+
+    @property
+    def collation(self) -> Optional[Collation]:
+        """Collation to pass to find()/count_documents(), if the filter needs one."""
+        return CASE_INSENSITIVE_COLLATION if self._case_insensitive else None
+
+    def build(self) -> Tuple[Dict[str, Any], Optional[Collation]]:
+        """Return the filter and the collation to query it with."""
+        return dict(self.filter), self.collation
@@ -0,0 +1,118 @@
+import os
+from typing import Any, Dict, Optional
+
+from pymongo.collection import Collection
+from pymongo.results import UpdateResult
+
+# Per-aspect ratings (0-5) stored on food documents; 0 or missing means unrated
+RATING_FIELDS = ["valueForMoney", "service", "taste", "hygiene"]
+
+def _parse_weights(spec: str) -> Dict[str, float]:
+    weights = {}
+    for pair in spec.split(","):
+        if "=" in pair:
+            field, weight = pair.split("=", 1)
+            if field.strip() in RATING_FIELDS:
+                weights[field.strip()] = float(weight)
+    return weights
+
+# Weights of the composite score (FOOD_SCORE_WEIGHTS="taste=0.35,hygiene=0.25,...")
+COMPOSITE_WEIGHTS: Dict[str, float] = _parse_weights(
+    os.getenv("FOOD_SCORE_WEIGHTS", "taste=0.35,hygiene=0.25,service=0.2,valueForMoney=0.2")
+)
+
+def _is_rated(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+def compute_rating_fields(doc: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """
+    Compute avgRating and compositeScore for a food document.
+
+    avgRating is the plain mean of the rated aspects; compositeScore is the
+    weighted mean over the rated aspects, so a missing aspect does not drag
+    the score down. Both are None when nothing is rated.
+    """
+    rated = {field: doc[field] for field in RATING_FIELDS if _is_rated(doc.get(field))}
+    if not rated:
+        return {"avgRating": None, "compositeScore": None}
+
+    weight_total = sum(COMPOSITE_WEIGHTS.get(field, 0) for field in rated)
+    composite = (
+        sum(value * COMPOSITE_WEIGHTS.get(field, 0) for field, value in rated.items()) / weight_total
+        if weight_total else None
+    )
+    return {
+        "avgRating": round(sum(rated.values()) / len(rated), 2),
+        "compositeScore": round(composite, 3) if composite is not None else None,
+    }
+
+def _rated_condition(field: str) -> Dict[str, Any]:
+    return {"$and": [{"$isNumber": f"${field}"}, {"$gt": [f"${field}", 0]}]}
+
+def rating_fields_expression() -> Dict[str, Any]:
+    """
+    Aggregation expressions computing avgRating and compositeScore server-side.
+
+    Mirrors compute_rating_fields; used in pipeline updates so the stored
+    values are recomputed by MongoDB in the same write that changes a rating.
+    """
+    rated_values = {
+        "$filter": {
+            "input": [f"${field}" for field in RATING_FIELDS],
+            "cond": {"$and": [{"$isNumber": "$$this"}, {"$gt": ["$$this", 0]}]},
+        }
+    }
+    weighted_sum = {"$add": [
+        {"$cond": [_rated_condition(field), {"$multiply": [f"${field}", weight]}, 0]}
+        for field, weight in COMPOSITE_WEIGHTS.items()
+    ]}
+    weight_total = {"$add": [
+        {"$cond": [_rated_condition(field), weight, 0]}
+        for field, weight in COMPOSITE_WEIGHTS.items()
+    ]}
+    return {
+        "avgRating": {"$cond": [
+            {"$gt": [{"$size": rated_values}, 0]},
+            {"$round": [{"$avg": rated_values}, 2]},
+            None,
+        ]},
+        "compositeScore": {"$cond": [
+            {"$gt": [weight_total, 0]},
+            {"$round": [{"$divide": [weighted_sum, weight_total]}, 3]},
+            None,
+        ]},
+    }
+
+def stored_or_computed(field: str) -> Dict[str, Any]:
+    """Projection expression: the stored score, or the same score computed server-side if it is missing."""
+    return {"$ifNull": [f"${field}", rating_fields_expression()[field]]}
+
+def stale_rating_filter() -> Dict[str, Any]:
+    """
+    Filter matching food documents whose stored avgRating/compositeScore
+    differ from the values their aspect ratings give (missing ones included).
+    """
+    expression = rating_fields_expression()
+    return {"$expr": {"$or": [
+        {"$ne": [f"${field}", computed]} for field, computed in expression.items()
+    ]}}
+
+def update_ratings(collection: Collection, query_filter: Dict[str, Any], ratings: Dict[str, float]) -> UpdateResult:
+    """
+    Write new aspect ratings and refresh avgRating/compositeScore atomically.
+
+    Args:
+        collection: The foods collection
+        query_filter: Filter selecting the document, e.g. {"_id": ObjectId(...)}
+        ratings: New values for any of RATING_FIELDS
+
+    Returns:
+        The pymongo UpdateResult
+    """
+    unknown = set(ratings) - set(RATING_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown rating fields: {', '.join(sorted(unknown))}")
+    return collection.update_one(
+        query_filter,
+        [{"$set": ratings}, {"$set": rating_fields_expression()}]
+    )
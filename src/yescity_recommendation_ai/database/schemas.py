@@ -68,6 +68,9 @@ class FoodSchema(BaseModel):
     service: Optional[float] = None
     taste: Optional[float] = None
     hygiene: Optional[float] = None
+    # Derived from the aspect ratings, see database/ratings.py
+    avgRating: Optional[float] = None
+    compositeScore: Optional[float] = None
     menuSpecial: Optional[str] = None
     menulink: Optional[str] = None
     openDay: Optional[str] = None
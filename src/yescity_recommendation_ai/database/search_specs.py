@@ -0,0 +1,338 @@
+"""
+Declarative description of each data collection, in one place.
+
+A CollectionSpec declares what can be searched and how (parameters,
+ranking), the display-name field, the index key shapes, the full-view and
+LLM-view projections, the crew agent and the category aliases. The other
+modules derive from SEARCH_SPECS:
+
+- database/indexes.py builds INDEX_REGISTRY from the index key shapes
+  (plus the 2dsphere index of geo collections), per match mode;
+- database/projections.py builds NAME_FIELDS and the projections.
+
+Only foods has a known document shape (database/schemas.py); the other
+collections declare the default "name" field, which startup checks with
+projections.find_missing_name_fields.
+"""
+import os
+from dataclasses import dataclass, field as dataclass_field
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.collation import Collation
+
+from .query_builder import QueryBuilder
+from .ratings import stored_or_computed
+
+# How a search parameter is applied to the query
+EQUALS = "equals"   # case-insensitive equality (indexed)
+PREFIX = "prefix"   # anchored case-insensitive prefix
+MINIMUM = "min"     # numeric lower bound
+BOOLEAN = "bool"    # true/false equality
+FLAG = "flag"       # when true, require the field to equal flag_value (ignoring case)
+
+PARAM_TYPES = {EQUALS: str, PREFIX: str, MINIMUM: float, BOOLEAN: bool, FLAG: bool}
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("true", "1", "yes", "y")
+
+@dataclass(frozen=True)
+class SearchField:
+    """One searchable parameter of a collection."""
+    param: str
+    field: str
+    kind: str = EQUALS
+    description: str = ""
+    flag_value: Optional[str] = None
+
+    @property
+    def param_type(self) -> type:
+        return PARAM_TYPES[self.kind]
+
+    @property
+    def is_text(self) -> bool:
+        return self.kind in (EQUALS, PREFIX)
+
+    def apply(self, builder: QueryBuilder, value: Any, relaxed: bool = False):
+        """
+        Add this parameter's condition to a query.
+
+        Args:
+            builder: Query being built
+            value: Parameter value
+            relaxed: Match text parameters by contained words instead of
+                equality/prefix (the fallback for LLM-extracted values)
+
+        Raises:
+            ValueError: If the value does not fit the parameter's type
+        """
+        if relaxed and self.is_text:
+            builder.contains(self.field, str(value))
+        elif self.kind == EQUALS:
+            builder.equals(self.field, str(value))
+        elif self.kind == PREFIX:
+            builder.prefix(self.field, str(value))
+        elif self.kind == MINIMUM:
+            try:
+                builder.where(self.field, {"$gte": float(value)})
+            except (TypeError, ValueError):
+                raise ValueError(f"{self.param} must be a number, got '{value}'")
+        elif self.kind == BOOLEAN:
+            builder.where(self.field, _as_bool(value))
+        elif self.kind == FLAG:
+            if _as_bool(value):
+                builder.equals(self.field, self.flag_value)
+
+# Index key shapes: ((field, direction), ...) per index
+IndexKeys = Tuple[Tuple[str, int], ...]
+
+CITY_INDEXES: Tuple[IndexKeys, ...] = ((("cityName", ASCENDING),),)
+CITY_CATEGORY_INDEXES: Tuple[IndexKeys, ...] = CITY_INDEXES + (
+    (("category", ASCENDING),),
+    (("cityName", ASCENDING), ("category", ASCENDING)),
+)
+
+# Characters of free text kept in the LLM view (one line of description)
+LLM_VIEW_DESCRIPTION_CHARS = int(os.getenv("LLM_VIEW_DESCRIPTION_CHARS", "120"))
+
+def truncated(field: str, chars: int = LLM_VIEW_DESCRIPTION_CHARS) -> Dict[str, Any]:
+    """Projection expression cutting a text field down to its first chars characters."""
+    return {"$substrCP": [{"$ifNull": [f"${field}", ""]}, 0, chars]}
+
+@dataclass(frozen=True)
+class CollectionSpec:
+    """
+    Declarative search description of one collection.
+
+    Drives the generic crew search tool, the structured REST search and the
+    category crews, and is the source of the collection's indexes and
+    projections (see the module docstring).
+    """
+    collection: str
+    label: str
+    description: str
+    fields: Tuple[SearchField, ...] = ()
+    # Server-side sort before the limit; None keeps index order
+    ranking: Optional[Tuple[Tuple[str, int], ...]] = None
+    # Crew agent config (config/agents/<agent>.yaml)
+    agent: Optional[str] = None
+    # Other names accepted for the collection in structured requests
+    aliases: Tuple[str, ...] = ()
+    # Field holding a document's display name
+    name_field: str = "name"
+    # Indexed key shapes; text fields are indexed in the active match mode
+    indexes: Tuple[IndexKeys, ...] = CITY_INDEXES
+    # Has lat/lon, stored as a GeoJSON location point with a 2dsphere index
+    geo: bool = False
+    # Fields the UI renders ("full view"); None returns whole documents
+    full_view: Optional[Tuple[str, ...]] = None
+    # Compact projection for tool results handed to the LLM; None uses
+    # identity, category and a one-line description
+    llm_view: Optional[Dict[str, Any]] = dataclass_field(default=None, hash=False)
+
+    def full_view_projection(self) -> Optional[Dict[str, int]]:
+        return {name: 1 for name in self.full_view} if self.full_view else None
+
+    def llm_view_projection(self) -> Dict[str, Any]:
+        if self.llm_view:
+            return dict(self.llm_view)
+        return {
+            "_id": 1,
+            self.name_field: 1,
+            "category": 1,
+            "description": truncated("description"),
+        }
+
+    @property
+    def params(self) -> List[str]:
+        return [field.param for field in self.fields]
+
+    def sort(self) -> Optional[List[Tuple[str, int]]]:
+        return list(self.ranking) if self.ranking else None
+
+CATEGORY = SearchField("category", "category", EQUALS, "Exact category name, e.g. 'Sweets' or 'Hotel'")
+
+SEARCH_SPECS: Dict[str, CollectionSpec] = {spec.collection: spec for spec in [
+    CollectionSpec(
+        "foods", "food places",
+        "restaurants, sweet shops, cafes and street food",
+        fields=(
+            CATEGORY,
+            SearchField("vegOnly", "vegOrNonVeg", FLAG, "Only vegetarian places", flag_value="Veg"),
+            SearchField("flagship", "flagship", BOOLEAN, "Only flagship places"),
+            SearchField("minRating", "avgRating", MINIMUM, "Minimum average rating (0-5)"),
+        ),
+        ranking=(("compositeScore", DESCENDING),),
+        agent="food_critic",
+        aliases=("food",),
+        name_field="foodPlace",
+        indexes=CITY_CATEGORY_INDEXES + (
+            (("cityName", ASCENDING), ("flagship", DESCENDING)),
+            # Top-N ranking: city (and category) equality, then sorted by the materialized score
+            (("cityName", ASCENDING), ("compositeScore", DESCENDING)),
+            (("cityName", ASCENDING), ("category", ASCENDING), ("compositeScore", DESCENDING)),
+            # /foods keyset pagination: filter equality, then _id order
+            (("cityName", ASCENDING), ("_id", ASCENDING)),
+            (("category", ASCENDING), ("_id", ASCENDING)),
+            (("cityName", ASCENDING), ("category", ASCENDING), ("_id", ASCENDING)),
+            (("foodPlace", ASCENDING),),
+        ),
+        geo=True,
+        # Internal fields such as engagement counters and raw reviews stay out of API responses
+        full_view=(
+            "_id", "foodPlace", "cityName", "category", "address", "lat", "lon", "locationLink",
+            "description", "valueForMoney", "service", "taste", "hygiene", "avgRating",
+            "compositeScore", "flagship", "vegOrNonVeg", "menuSpecial", "menulink", "openDay",
+            "openTime", "phone", "website", "images",
+        ),
+        # Identity, category, scores and a one-line description; reviews,
+        # images and contact details wait for hydration of the chosen ids
+        llm_view={
+            "_id": 1,
+            "foodPlace": 1,
+            "category": 1,
+            "vegOrNonVeg": 1,
+            "flagship": 1,
+            "avgRating": stored_or_computed("avgRating"),
+            "compositeScore": stored_or_computed("compositeScore"),
+            "menuSpecial": truncated("menuSpecial", 60),
+            "description": truncated("description"),
+        },
+    ),
+    CollectionSpec(
+        "accommodations", "places to stay",
+        "hotels, hostels, guesthouses, homestays and resorts",
+        fields=(CATEGORY,),
+        agent="accomodation_specialist",
+        aliases=("accommodation", "stay", "hotels"),
+        indexes=CITY_CATEGORY_INDEXES,
+        geo=True,
+    ),
+    CollectionSpec(
+        "activities", "activities",
+        "adventure sports, tours, treks and other experiences",
+        fields=(CATEGORY,),
+        agent="activity_planner",
+        aliases=("activity",),
+        indexes=CITY_CATEGORY_INDEXES,
+        geo=True,
+    ),
+    CollectionSpec(
+        "placestovisits", "places to visit",
+        "monuments, landmarks, temples and other attractions",
+        fields=(CATEGORY,),
+        agent="places_expert",
+        aliases=("place", "places", "attractions"),
+        indexes=CITY_CATEGORY_INDEXES,
+        geo=True,
+    ),
+    CollectionSpec(
+        "hiddengems", "hidden gems",
+        "offbeat, lesser-known spots",
+        fields=(CATEGORY,),
+        agent="gems_explorer",
+        aliases=("hidden gem", "gems"),
+        indexes=CITY_CATEGORY_INDEXES,
+        geo=True,
+    ),
+    CollectionSpec(
+        "shopping", "shopping spots",
+        "markets, bazaars, malls and souvenir shops",
+        fields=(CATEGORY,),
+        agent="shopping_guide",
+        aliases=("shops", "markets"),
+        indexes=CITY_CATEGORY_INDEXES,
+        geo=True,
+    ),
+    CollectionSpec(
+        "localtransports", "local transport options",
+        "buses, autos, taxis, metro and bike rentals within the city",
+        agent="transport_expert",
+        aliases=("local transport", "transport"),
+    ),
+    CollectionSpec(
+        "connectivities", "connectivity information",
+        "SIM cards, mobile data, Wi-Fi and how to reach the city",
+        agent="connectivity_expert",
+        aliases=("connectivity",),
+    ),
+    CollectionSpec(
+        "cityinfos", "city information",
+        "overview, history, culture and the best time to visit",
+        agent="city_guide",
+        aliases=("city info", "cityinfo"),
+    ),
+]}
+
+def get_search_spec(collection_name: str) -> CollectionSpec:
+    """
+    Return the search spec of a collection.
+
+    Raises:
+        ValueError: For a collection without a spec
+    """
+    spec = SEARCH_SPECS.get(collection_name)
+    if spec is None:
+        raise ValueError(f"Unknown category '{collection_name}'. Use one of: {', '.join(SEARCH_SPECS)}")
+    return spec
+
+CATEGORY_ALIASES: Dict[str, str] = {
+    alias.casefold(): spec.collection
+    for spec in SEARCH_SPECS.values()
+    for alias in (spec.collection, spec.label) + spec.aliases
+}
+
+def resolve_category(category: str) -> str:
+    """
+    Collection name for a structured request's category.
+
+    Accepts the collection name, its label or one of its aliases, ignoring
+    case (e.g. "Food", "food places" and "foods" all give "foods").
+
+    Raises:
+        ValueError: For a category no collection answers to
+    """
+    collection_name = CATEGORY_ALIASES.get(" ".join(category.split()).casefold())
+    if collection_name is None:
+        raise ValueError(f"Unknown category '{category}'. Use one of: {', '.join(SEARCH_SPECS)}")
+    return collection_name
+
+def has_text_params(spec: CollectionSpec, params: Optional[Dict[str, Any]]) -> bool:
+    """True if any text parameter of the spec is set, i.e. a relaxed query would differ."""
+    return any(field.is_text and (params or {}).get(field.param) not in (None, "") for field in spec.fields)
+
+def build_search_query(
+        spec: CollectionSpec,
+        city: str,
+        params: Optional[Dict[str, Any]] = None,
+        relaxed: bool = False
+) -> Tuple[Dict[str, Any], Optional[Collation], Optional[List[Tuple[str, int]]]]:
+    """
+    Map a city plus search parameters onto an indexed MongoDB query.
+
+    Text parameters match exactly (ignoring case) so they can use the
+    indexes; relaxed=True matches them by contained words instead, still
+    within the indexed city.
+
+    Returns:
+        (filter, collation, sort)
+
+    Raises:
+        ValueError: For an unsupported parameter or an invalid value
+    """
+    builder = QueryBuilder().equals("cityName", city)
+    fields = {field.param: field for field in spec.fields}
+    for name, value in (params or {}).items():
+        if value is None or value == "":
+            continue
+        if name not in fields:
+            raise ValueError(
+                f"Unsupported filter '{name}' for {spec.collection}. "
+                f"Supported: {', '.join(fields) or 'none'}"
+            )
+        fields[name].apply(builder, value, relaxed)
+
+    query_filter, collation = builder.build()
+    return query_filter, collation, spec.sort()
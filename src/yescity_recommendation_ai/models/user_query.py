@@ -0,0 +1,41 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from pydantic import BaseModel, Field, ConfigDict
+
+class QueryCategory(BaseModel):
+    """ Represents the classified query category. """
+    category: str # e.g. "foods", "atcomodations", "activities", etc.
+    cityName: Optional[str] = None
+    parameters: Dict[str, str] = {}
+    confidence: float = 0.0
+    tier: str = "llm" # which classifier tier answered: "fast_path", "cache", "llm", "fallback" or "structured" (UI request, not classified)
+
+class QueryContext(BaseModel):
+    """
+    Per-request context shared by the service, crew manager and crew builders.
+
+    The query is classified exactly once and the resulting QueryCategory is
+    carried through every stage together with per-stage timings.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    user_query: str
+    classification: Optional[QueryCategory] = None
+    timings: Dict[str, float] = Field(default_factory=dict)
+
+    @contextmanager
+    def timed(self, stage: str):
+        """Record the wall-clock duration of a stage (e.g. classify, crew, hydrate)."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self.timings[stage] = round(self.timings.get(stage, 0.0) + elapsed, 3)
+
+    def stage_timings(self) -> Dict[str, float]:
+        """Return per-stage timings plus their total."""
+        timings = dict(self.timings)
+        timings["total"] = round(sum(self.timings.values()), 3)
+        return timings
@@ -0,0 +1,82 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo.collation import Collation
+
+from ..database.mongodb_client import mongodb_client
+from ..database.projections import get_full_view_projection, get_name_field
+from ..database.search_specs import build_search_query, get_search_spec
+
+class CategorySearchService:
+    """
+    Structured search behind the UI category buttons.
+
+    Category + city + filters become one indexed MongoDB query, ranked and
+    limited server-side, so a button click is a single round trip with no
+    LLM involved. Filters and ranking come from database/search_specs.py.
+    """
+
+    @staticmethod
+    def supported_filters(collection_name: str) -> List[str]:
+        return get_search_spec(collection_name).params
+
+    def build_query(
+            self,
+            collection_name: str,
+            city: str,
+            filters: Optional[Dict[str, str]] = None
+    ) -> Tuple[Dict[str, Any], Optional[Collation], Optional[List[Tuple[str, int]]]]:
+        """
+        Map a structured request onto a MongoDB filter.
+
+        Returns:
+            (filter, collation, sort)
+
+        Raises:
+            ValueError: For an unknown collection or an unsupported filter
+        """
+        return build_search_query(get_search_spec(collection_name), city, filters)
+
+    async def search(
+            self,
+            collection_name: str,
+            city: str,
+            filters: Optional[Dict[str, str]] = None,
+            limit: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Run a structured category search.
+
+        Returns:
+            Dictionary shaped like a recommendation result: recommendations
+            ({_id, name}), full_data (UI view documents) and stage timings
+        """
+        started = time.perf_counter()
+        query_filter, collation, sort = self.build_query(collection_name, city, filters)
+
+        collection = mongodb_client.get_async_collection(collection_name)
+        docs = await collection.find(
+            query_filter,
+            get_full_view_projection(collection_name),
+            collation=collation,
+            sort=sort,
+            limit=limit
+        ).to_list()
+        query_seconds = round(time.perf_counter() - started, 3)
+
+        name_field = get_name_field(collection_name)
+        return {
+            "success": True,
+            "category": collection_name,
+            "city": city,
+            "parameters": dict(filters or {}),
+            "recommendations": [
+                {"_id": str(doc["_id"]), "name": doc.get(name_field) or "Unknown"}
+                for doc in docs
+            ],
+            "full_data": docs,
+            "stage_timings": {"query": query_seconds, "total": query_seconds},
+        }
+
+# Create singleton instance
+category_search_service = CategorySearchService()
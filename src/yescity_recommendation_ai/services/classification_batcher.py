@@ -0,0 +1,104 @@
+import asyncio
+import os
+from typing import List, Optional, Set, Tuple
+
+from ..models.user_query import QueryCategory
+from .query_classifier import OllamaQueryClassifier, query_classifier
+
+class ClassificationBatcher:
+    """
+    Async micro-batcher in front of OllamaQueryClassifier.aclassify_many.
+
+    Concurrent callers that need the LLM are collected for a short window (or
+    until the batch is full) and classified together; each caller awaits its
+    own QueryCategory. Queries answered by the fast path or the cache return
+    immediately without waiting for the window.
+    """
+
+    def __init__(
+            self,
+            classifier: OllamaQueryClassifier,
+            window_ms: Optional[float] = None,
+            max_batch_size: Optional[int] = None
+    ):
+        self.classifier = classifier
+        self.window_seconds = (
+            window_ms if window_ms is not None else float(os.getenv("CLASSIFIER_BATCH_WINDOW_MS", "10"))
+        ) / 1000
+        self.max_batch_size = max_batch_size or int(os.getenv("CLASSIFIER_BATCH_MAX", "16"))
+
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Running batches; referenced so they are not garbage-collected mid-flight
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.batched_queries = 0
+
+    async def classify(self, user_query: str) -> QueryCategory:
+        """Classify one query, sharing an LLM batch with concurrent callers."""
+        classification = self.classifier.classify_without_llm(user_query)
+        if classification is not None:
+            return classification
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((user_query, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+
+        return await future
+
+    async def classify_many(self, queries: List[str]) -> List[QueryCategory]:
+        """Classify several queries, merged into the current batching window."""
+        return list(await asyncio.gather(*(self.classify(user_query) for user_query in queries)))
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        self.batches += 1
+        self.batched_queries += len(batch)
+        queries = [user_query for user_query, _ in batch]
+
+        try:
+            # classify() already tried the fast path and the cache for these
+            results = await self.classifier.aclassify_many(queries, skip_lookup=True)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), classification in zip(batch, results):
+            if not future.done():
+                future.set_result(classification)
+
+    async def shutdown(self):
+        """Send any queued queries and wait for the running batches."""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """Return batching counters."""
+        return {
+            "batches": self.batches,
+            "batched_queries": self.batched_queries,
+            "avg_batch_size": round(self.batched_queries / self.batches, 2) if self.batches else 0.0,
+            "window_ms": self.window_seconds * 1000,
+            "max_batch_size": self.max_batch_size,
+        }
+
+# Create singleton instance
+classification_batcher = ClassificationBatcher(query_classifier)
@@ -0,0 +1,162 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..models.user_query import QueryCategory
+from ..utils.helpers import normalize_query
+
+class ClassificationCache:
+    """
+    Bounded LRU + TTL cache of query classifications.
+
+    Entries are keyed on the normalized query (casefolded, punctuation and
+    whitespace collapsed, city aliases canonicalized). When an embedding
+    function is configured, a miss on the exact key falls back to the most
+    similar cached query above a cosine-similarity threshold.
+
+    The cache is scoped to a namespace (a fingerprint of the prompt template
+    and category list); switching namespaces drops every entry.
+    """
+
+    def __init__(
+            self,
+            max_size: int = 1024,
+            ttl_seconds: float = 3600,
+            embed_fn: Optional[Callable[[str], List[float]]] = None,
+            similarity_threshold: float = 0.95
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self.namespace: Optional[str] = None
+
+        self._entries: "OrderedDict[str, Tuple[float, QueryCategory, Optional[List[float]]]]" = OrderedDict()
+        # Embeddings computed for misses, reused when the result is stored
+        self._pending_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ensure_namespace(self, namespace: str):
+        """Clear the cache if it was filled under a different namespace."""
+        if namespace != self.namespace:
+            with self._lock:
+                if namespace != self.namespace:
+                    self._entries.clear()
+                    self._pending_embeddings.clear()
+                    self.namespace = namespace
+
+    def invalidate(self):
+        """Drop every cached classification."""
+        with self._lock:
+            self._entries.clear()
+            self._pending_embeddings.clear()
+
+    def get(self, user_query: str) -> Optional[QueryCategory]:
+        """
+        Look up a cached classification.
+
+        Returns:
+            A copy of the cached QueryCategory with tier "cache", or None on a miss
+        """
+        key = normalize_query(user_query)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, classification, _ = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return classification.model_copy(deep=True, update={"tier": "cache"})
+                del self._entries[key]
+
+        if self.embed_fn is not None:
+            match = self._find_similar(key, now)
+            if match is not None:
+                return match.model_copy(deep=True, update={"tier": "cache"})
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, user_query: str, classification: QueryCategory):
+        """Store a classification for a query."""
+        key = normalize_query(user_query)
+        embedding = None
+        if self.embed_fn is not None:
+            with self._lock:
+                embedding = self._pending_embeddings.pop(key, None)
+            if embedding is None:
+                embedding = self._embed(key)
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, classification.model_copy(deep=True), embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _embed(self, key: str) -> Optional[List[float]]:
+        try:
+            return self.embed_fn(key)
+        except Exception as e:
+            print(f"⚠️ Could not embed query for classification cache: {e}")
+            return None
+
+    def _find_similar(self, key: str, now: float) -> Optional[QueryCategory]:
+        """Return the most similar unexpired classification above the threshold."""
+        query_embedding = self._embed(key)
+        if not query_embedding:
+            return None
+
+        with self._lock:
+            self._pending_embeddings[key] = query_embedding
+            while len(self._pending_embeddings) > 64:
+                self._pending_embeddings.popitem(last=False)
+            candidates = [
+                (cached_key, classification, embedding)
+                for cached_key, (expires_at, classification, embedding) in self._entries.items()
+                if embedding and expires_at > now
+            ]
+
+        best_key, best_classification, best_score = None, None, self.similarity_threshold
+        for cached_key, classification, embedding in candidates:
+            score = _cosine_similarity(query_embedding, embedding)
+            if score >= best_score:
+                best_key, best_classification, best_score = cached_key, classification, score
+
+        if best_classification is None:
+            return None
+
+        with self._lock:
+            if best_key in self._entries:
+                self._entries.move_to_end(best_key)
+            self.hits += 1
+            self.semantic_hits += 1
+        return best_classification
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
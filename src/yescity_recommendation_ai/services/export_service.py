@@ -0,0 +1,142 @@
+import csv
+import io
+import os
+import zlib
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from ..database.mongodb_client import mongodb_client
+from ..database.query_builder import QueryBuilder
+from ..database.projections import get_full_view_projection
+from ..utils.serialization import dumps
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode("utf-8")
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return dumps(value).decode("utf-8").strip('"')
+
+class ExportService:
+    """
+    Streams whole collections (or filtered slices) as NDJSON or CSV.
+
+    Documents are read from a Mongo cursor in batches and serialized one at a
+    time into small output chunks, so memory stays flat regardless of how
+    many documents are exported.
+    """
+
+    def __init__(self):
+        self.default_batch_size = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+        # Output is flushed once this many bytes are buffered
+        self.chunk_size = int(os.getenv("EXPORT_CHUNK_BYTES", "65536"))
+
+    def build_projection(self, collection_name: str, fields: Optional[List[str]]) -> Optional[Dict[str, int]]:
+        """Requested fields, else the collection's full-view fields, else everything."""
+        if fields:
+            return {field: 1 for field in fields}
+        return get_full_view_projection(collection_name)
+
+    async def iter_documents(
+            self,
+            collection_name: str,
+            city: Optional[str] = None,
+            category: Optional[str] = None,
+            projection: Optional[Dict[str, int]] = None,
+            batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield matching documents straight from the cursor, one batch in memory at a time."""
+        builder = QueryBuilder()
+        if city:
+            builder.equals("cityName", city)
+        if category:
+            builder.equals("category", category)
+        query, collation = builder.build()
+
+        collection = mongodb_client.get_async_collection(collection_name)
+        cursor = collection.find(
+            query,
+            projection,
+            collation=collation,
+            batch_size=batch_size or self.default_batch_size
+        ).sort("_id", 1)
+        try:
+            async for doc in cursor:
+                yield doc
+        finally:
+            await cursor.close()
+
+    async def ndjson_chunks(self, documents: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+        """Serialize documents as newline-delimited JSON."""
+        buffer = []
+        size = 0
+        async for doc in documents:
+            line = dumps(doc) + b"\n"
+            buffer.append(line)
+            size += len(line)
+            if size >= self.chunk_size:
+                yield b"".join(buffer)
+                buffer, size = [], 0
+        if buffer:
+            yield b"".join(buffer)
+
+    async def csv_chunks(
+            self,
+            documents: AsyncIterator[Dict[str, Any]],
+            fields: List[str]
+    ) -> AsyncIterator[bytes]:
+        """
+        Serialize documents as CSV with one column per field.
+
+        The header is fixed up front rather than taken from the first
+        document, so documents with differing fields all keep their values;
+        missing fields are left empty and nested values are written as JSON.
+        """
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        async for doc in documents:
+            writer.writerow({key: _csv_value(value) for key, value in doc.items()})
+            if output.tell() >= self.chunk_size:
+                yield output.getvalue().encode("utf-8")
+                output.seek(0)
+                output.truncate()
+        if output.tell():
+            yield output.getvalue().encode("utf-8")
+
+    @staticmethod
+    def accepts_gzip(accept_encoding: str) -> bool:
+        """
+        Whether an Accept-Encoding header allows gzip.
+
+        Honours q-values: "gzip;q=0" refuses gzip, and "*" stands in for gzip
+        when gzip itself is not listed.
+        """
+        weights = {}
+        for entry in accept_encoding.split(","):
+            coding, _, params = entry.strip().partition(";")
+            coding = coding.strip().lower()
+            if not coding:
+                continue
+            weight = 1.0
+            for param in params.split(";"):
+                key, _, value = param.strip().partition("=")
+                if key.strip().lower() == "q":
+                    try:
+                        weight = float(value)
+                    except ValueError:
+                        weight = 0.0
+            weights[coding] = weight
+        return weights.get("gzip", weights.get("*", 0.0)) > 0
+
+    @staticmethod
+    async def gzip_chunks(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+        """Compress a byte stream on the fly into a single gzip member."""
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        async for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+# Create singleton instance
+export_service = ExportService()
@@ -0,0 +1,257 @@
+import asyncio
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.user_query import QueryCategory
+from ..utils.helpers import CITY_ALIASES, canonicalize_cities, normalize_text, tokenize
+
+# Keyword phrases per category. Multi-word phrases are matched as a unit and
+# take precedence over their single-word parts ("places to visit" vs "visit").
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    "foods": [
+        "food", "foods", "street food", "restaurant", "restaurants", "eat", "eating",
+        "dinner", "lunch", "breakfast", "cafe", "cafes", "sweet", "sweets",
+        "sweet shop", "petha", "dhaba", "dhabas", "thali", "biryani", "snacks",
+        "dessert", "desserts", "cuisine", "dishes", "delicacies",
+    ],
+    "accommodations": [
+        "hotel", "hotels", "stay", "stays", "where to stay", "hostel", "hostels",
+        "guesthouse", "guesthouses", "guest house", "homestay", "homestays",
+        "resort", "resorts", "lodge", "accommodation", "accommodations", "rooms",
+    ],
+    "activities": [
+        "activity", "activities", "things to do", "adventure", "trek", "trekking",
+        "rafting", "experiences", "tours",
+    ],
+    "cityinfos": [
+        "tell me about", "about", "information", "info", "history", "weather",
+        "overview", "culture", "best time to visit",
+    ],
+    "localtransports": [
+        "transport", "local transport", "public transport", "bus", "buses",
+        "auto", "rickshaw", "taxi", "taxis", "cab", "cabs", "metro", "train",
+        "trains", "bike rental", "bike rentals",
+    ],
+    "hiddengems": [
+        "hidden", "hidden gem", "hidden gems", "gem", "gems", "offbeat",
+        "off the beaten path", "lesser known", "unexplored",
+    ],
+    "connectivities": [
+        "internet", "connectivity", "sim", "sim card", "sim cards", "wifi",
+        "wi fi", "mobile data", "network",
+    ],
+    "placestovisits": [
+        "places to visit", "visit", "see", "attraction", "attractions",
+        "landmark", "landmarks", "monument", "monuments", "sightseeing",
+        "must see", "tourist places", "tourist spots",
+    ],
+    "shopping": [
+        "shopping", "shop", "shops", "buy", "market", "markets", "bazaar",
+        "bazaars", "mall", "malls", "souvenir", "souvenirs",
+    ],
+}
+
+# Seed gazetteer used until (or if) city names cannot be loaded from MongoDB.
+DEFAULT_CITIES = [
+    "Agra", "Delhi", "New Delhi", "Mumbai", "Bangalore", "Jaipur", "Goa",
+    "Chennai", "Kolkata", "Varanasi", "Hyderabad", "Pune", "Udaipur",
+    "Rishikesh", "Amritsar", "Lucknow",
+]
+
+# Collections whose cityName values feed the gazetteer.
+GAZETTEER_COLLECTIONS = [
+    "foods", "accommodations", "activities", "cityinfos", "localtransports",
+    "hiddengems", "connectivities", "placestovisits", "shopping",
+]
+
+STOPWORDS = {
+    "a", "an", "the", "in", "at", "of", "for", "to", "on", "near", "around",
+    "me", "my", "i", "we", "is", "are", "and", "or", "some", "any", "with",
+    "find", "show", "suggest", "recommend", "best", "good", "top", "great",
+    "what", "where", "which", "how", "please", "can", "you", "get", "give",
+}
+
+class PhraseTrie:
+    """
+    Token-level trie for longest-match phrase lookup.
+
+    Phrases are stored as token sequences, so matches always fall on word
+    boundaries ("do" never matches inside "doughnut") and a query is scanned
+    in a single left-to-right pass.
+    """
+
+    _PAYLOAD = "__payload__"
+
+    def __init__(self):
+        self._root: Dict[str, dict] = {}
+
+    def add(self, phrase: str, payload: str):
+        """Add a phrase with the value returned when it matches."""
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[self._PAYLOAD] = payload
+
+    def find_all(self, tokens: List[str]) -> List[Tuple[int, int, str]]:
+        """
+        Find non-overlapping longest matches in a token list.
+
+        Returns:
+            List of (start, end, payload) tuples, end exclusive
+        """
+        matches = []
+        position = 0
+        while position < len(tokens):
+            node = self._root
+            best = None
+            index = position
+            while index < len(tokens) and tokens[index] in node:
+                node = node[tokens[index]]
+                index += 1
+                if self._PAYLOAD in node:
+                    best = (position, index, node[self._PAYLOAD])
+            if best:
+                matches.append(best)
+                position = best[1]
+            else:
+                position += 1
+        return matches
+
+class FastPathClassifier:
+    """
+    Deterministic keyword/gazetteer classifier that runs before the LLM.
+
+    Confidence reflects how unambiguous the match is: a single category plus a
+    known city scores high enough to skip Ollama, anything else is escalated.
+    """
+
+    def __init__(self, category_keywords: Dict[str, List[str]] = None, cities: Iterable[str] = None):
+        self.category_keywords = category_keywords or CATEGORY_KEYWORDS
+        self._lock = threading.Lock()
+        self._cities_loaded = cities is not None
+        self._category_trie = PhraseTrie()
+        for category, phrases in self.category_keywords.items():
+            for phrase in phrases:
+                self._category_trie.add(phrase, category)
+        self._city_trie = PhraseTrie()
+        self.refresh_cities(cities if cities is not None else DEFAULT_CITIES)
+
+    def refresh_cities(self, cities: Iterable[str]):
+        """
+        Rebuild the city gazetteer, e.g. after new cities were added to the database.
+
+        City names are keyed with aliases canonicalized, the same way query
+        tokens are, and map back to the spelling given here. When two names
+        share a key ("Bangalore", "Bengaluru") the later one wins.
+        """
+        city_trie = PhraseTrie()
+        for city in cities:
+            if city:
+                city_trie.add(canonicalize_cities(normalize_text(city)), city.strip())
+        self._city_trie = city_trie
+
+    def load_cities_from_database(self):
+        """
+        Load every cityName from the YesCity3 collections into the gazetteer.
+
+        Runs blocking queries: call it from a worker thread (the API lifespan
+        does, see api/dependencies.py), never on the event loop.
+        """
+        try:
+            from ..database.mongodb_client import mongodb_client
+        except Exception as e:
+            print(f"⚠️ Fast-path gazetteer using default cities, MongoDB unavailable: {e}")
+            return
+
+        stored = set()
+        for collection_name in GAZETTEER_COLLECTIONS:
+            try:
+                values = mongodb_client.db[collection_name].distinct("cityName")
+                stored.update(value for value in values if isinstance(value, str))
+            except Exception as e:
+                # Usually MongoDB is unreachable; do not wait out a timeout per collection
+                print(f"⚠️ Could not load cities from '{collection_name}': {e}")
+                break
+        # Stored spellings come last so they win over the defaults, so the
+        # cityName sent to MongoDB is one the database actually holds
+        self.refresh_cities(DEFAULT_CITIES + sorted(stored))
+        self._cities_loaded = True
+        print(f"🗺️ Fast-path gazetteer loaded with {len(stored)} cities from MongoDB")
+
+    def _ensure_cities_loaded(self):
+        if self._cities_loaded:
+            return
+        with self._lock:
+            if self._cities_loaded:
+                return
+            self._cities_loaded = True
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                self.load_cities_from_database()
+            else:
+                # Never run the distinct queries on the event loop; the
+                # default cities serve until the background load finishes
+                threading.Thread(
+                    target=self.load_cities_from_database, name="gazetteer-load", daemon=True
+                ).start()
+
+    @staticmethod
+    def _tokenize(user_query: str) -> List[str]:
+        """Tokenize a query, mapping city aliases (Bombay, Banaras, ...) to canonical names."""
+        return [CITY_ALIASES.get(token, token) for token in tokenize(user_query)]
+
+    def find_city(self, user_query: str) -> Optional[str]:
+        """Return the single city named in a query, or None if zero or several match."""
+        self._ensure_cities_loaded()
+        city_names = {city for _, _, city in self._city_trie.find_all(self._tokenize(user_query))}
+        return city_names.pop() if len(city_names) == 1 else None
+
+    def classify(self, user_query: str) -> Optional[QueryCategory]:
+        """
+        Classify a query using keyword and city matches only.
+
+        Returns:
+            QueryCategory with tier "fast_path", or None if no category keyword matched
+        """
+        self._ensure_cities_loaded()
+        tokens = self._tokenize(user_query)
+        if not tokens:
+            return None
+
+        city_matches = self._city_trie.find_all(tokens)
+        city_positions = {i for start, end, _ in city_matches for i in range(start, end)}
+
+        # Score categories on the tokens that are not part of a city name,
+        # weighting multi-word phrases higher than single words
+        remaining = [token if i not in city_positions else "" for i, token in enumerate(tokens)]
+        scores: Dict[str, float] = {}
+        for start, end, category in self._category_trie.find_all(remaining):
+            scores[category] = scores.get(category, 0.0) + (end - start)
+
+        if not scores:
+            return None
+
+        category = max(scores, key=scores.get)
+        share = scores[category] / sum(scores.values())
+        city_names = {city for _, _, city in city_matches}
+        city = city_matches[0][2] if len(city_names) == 1 else None
+
+        confidence = share * (0.95 if city else 0.75)
+
+        keywords = [
+            token for i, token in enumerate(tokens)
+            if i not in city_positions and token not in STOPWORDS
+        ]
+        parameters = {"keywords": " ".join(keywords)} if keywords else {}
+
+        return QueryCategory(
+            category=category,
+            cityName=city,
+            parameters=parameters,
+            confidence=round(confidence, 2),
+            tier="fast_path"
+        )
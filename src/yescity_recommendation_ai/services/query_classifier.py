@@ -1,33 +1,49 @@
 import os
 import json
-from typing import Dict, Optional
-from pydantic import BaseModel
-from langchain_community.llms import Ollama
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from langchain_core.prompts import PromptTemplate
 from dotenv import load_dotenv
+from ..models.user_query import QueryCategory
+from .fast_classifier import FastPathClassifier
+from .classification_cache import ClassificationCache
+from ..utils.helpers import normalize_query
 
 load_dotenv()
 
-class QueryCategory(BaseModel):
-    """ Represents the classified query category. """
-    category: str # e.g. "foods", "atcomodations", "activities", etc.
-    cityName: Optional[str] = None
-    parameters: Dict[str, str] = {}
-    confidence: float = 0.0
-
 class OllamaQueryClassifier:
     """ Classifies user queries using Ollama Local LLM. """
 
-    def __init__(self):
+    def __init__(self, fast_path_threshold: Optional[float] = None, cache: Optional[ClassificationCache] = None):
         Ollama_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         # ollama_model=os.getenv("OLLAMA_MODEL", "llama3.2:3b")
         ollama_model="llama3.2:3b"
 
-        self.llm = Ollama(
-            base_url=Ollama_url,
-            model=ollama_model,
-            temperature=0.1,
+        # The Ollama client (and langchain_community) is loaded on first use, see llm
+        self.ollama_url = Ollama_url
+        self.ollama_model = ollama_model
+        self._llm = None
+        self._llm_lock = threading.Lock()
+
+        # Deterministic tier answering confidently matched queries without the LLM
+        self.fast_path_enabled = os.getenv("CLASSIFIER_FAST_PATH_ENABLED", "true").lower() == "true"
+        self.fast_path_threshold = (
+            fast_path_threshold
+            if fast_path_threshold is not None
+            else float(os.getenv("CLASSIFIER_FAST_PATH_THRESHOLD", "0.85"))
         )
+        self.fast_classifier = FastPathClassifier()
+
+        # Cache of LLM classifications keyed on the normalized query
+        self.cache = cache if cache is not None else self._build_cache()
+
+        # Batch classification: "concurrent" requests or one multi-query "prompt"
+        self.batch_mode = os.getenv("CLASSIFIER_BATCH_MODE", "concurrent").lower()
+        self.max_parallel = int(os.getenv("CLASSIFIER_MAX_PARALLEL", "4"))
+        self.batch_size = int(os.getenv("CLASSIFIER_BATCH_SIZE", "8"))
 
         # Define available categories based on your collections
 
@@ -98,101 +114,384 @@ class OllamaQueryClassifier:
             """
         )
 
-    def classify_query(self, user_query: str) -> QueryCategory:
+        # Prompt classifying several queries in one LLM call
+        self.batch_prompt_template = PromptTemplate(
 
-            try:
-                prompt=self.prompt_template.format(
-                    query=user_query,
-                    categories=", ".join(self.categories)
-                )
+            input_variables=["queries", "categories"],
+            template="""
+                You are a travel query classifier for YesCity travel assistant.
 
-                response=self.llm.invoke(prompt)
+                Classify EACH numbered user query into ONE category from: {categories}
+                (foods, accommodations, activities, cityinfos, localtransports,
+                connectivities, hiddengems, placestovisits, shopping).
 
-                print(f"Ollama response: {response}")
+                For each query also extract the city name (or null) and key parameters.
 
-                # Try to parse JSON from response
-                # Find JSON object in response
-                start_idx = response.find('{')
-                end_idx = response.rfind('}') + 1
+                User Queries:
+                {queries}
 
-                if start_idx != -1 or end_idx != -1:
-                    json_str=response[start_idx:end_idx]
-                    data=json.loads(json_str)
+                Respond ONLY with a valid JSON array, one object per query, in this exact format:
+                [
+                    {{
+                        "index":1,
+                        "category":"category_name",
+                        "cityName":"city_name_or_null",
+                        "parameters": {{"param1":"value1"}},
+                        "confidence":confidence_score_between_0_and_1
+                    }}
+                ]
+            """
+        )
 
-                    # Validate category
-                    category=data.get("category","cityinfos")
-                    if category not in self.categories:
-                        category="cityinfos"
+    @property
+    def llm(self):
+        """Ollama LLM, created on first use so importing this module stays cheap."""
+        if self._llm is None:
+            with self._llm_lock:
+                if self._llm is None:
+                    from langchain_community.llms import Ollama
 
-                    return QueryCategory(
-                        category=category,
-                        cityName=data.get("cityName"),
-                        parameters=data.get("parameters",{}),
-                        confidence=data.get("confidence",0.5)
+                    self._llm = Ollama(
+                        base_url=self.ollama_url,
+                        model=self.ollama_model,
+                        temperature=0.1,
                     )
-                else:
-                    return self._fallback_classification(user_query)
-            
-            except Exception as e:
-                print(f"❌ Error classifying query with Ollama: {e}")
-                return self._fallback_classification(user_query)
-            
-    def _fallback_classification(self, user_query: str) -> QueryCategory:
-        """Fallback classification using keyword matching."""
-        query_lower = user_query.lower()
-        
-        # Keyword mapping
-        keyword_mapping = {
-            "food": "foods",
-            "restaurant": "foods",
-            "eat": "foods",
-            "dinner": "foods",
-            "lunch": "foods",
-            "breakfast": "foods",
-            "cafe": "foods",
-            "sweet": "foods",
-            "petha": "foods",
-            "hotel": "accommodations",
-            "stay": "accommodations",
-            "accommodation": "accommodations",
-            "activity": "activities",
-            "do": "activities",
-            "see": "places_to_visit",
-            "visit": "places_to_visit",
-            "attraction": "places_to_visit",
-            "shop": "shopping",
-            "buy": "shopping",
-            "market": "shopping",
-            "transport": "localtransports",
-            "bus": "localtransports",
-            "train": "localtransports",
-            "hidden": "hiddengems",
-            "gem": "hiddengems",
-            "local": "hiddengems"
+        return self._llm
+
+    @llm.setter
+    def llm(self, llm):
+        self._llm = llm
+
+    def _build_cache(self) -> Optional[ClassificationCache]:
+        """Create the classification cache from environment settings."""
+        if os.getenv("CLASSIFIER_CACHE_ENABLED", "true").lower() != "true":
+            return None
+
+        embed_fn = None
+        if os.getenv("CLASSIFIER_CACHE_EMBEDDINGS", "false").lower() == "true":
+            from langchain_community.embeddings import OllamaEmbeddings
+
+            embeddings = OllamaEmbeddings(
+                base_url=self.ollama_url,
+                model=os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text"),
+            )
+            embed_fn = embeddings.embed_query
+
+        return ClassificationCache(
+            max_size=int(os.getenv("CLASSIFIER_CACHE_SIZE", "1024")),
+            ttl_seconds=float(os.getenv("CLASSIFIER_CACHE_TTL", "3600")),
+            embed_fn=embed_fn,
+            similarity_threshold=float(os.getenv("CLASSIFIER_CACHE_SIMILARITY", "0.95")),
+        )
+
+    def cache_fingerprint(self) -> str:
+        """Fingerprint of everything that shapes an LLM classification."""
+        source = "|".join([
+            self.ollama_model,
+            ",".join(self.categories),
+            self.prompt_template.template,
+            self.batch_prompt_template.template,
+        ])
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    def invalidate_cache(self):
+        """Drop cached classifications, e.g. after editing categories or the prompt."""
+        if self.cache is not None:
+            self.cache.invalidate()
+
+    async def aping(self, timeout: float = 2.0) -> Dict[str, Any]:
+        """
+        Check that Ollama is up and has the classifier model, without running it.
+
+        Lists the local models (GET /api/tags) instead of generating text, so
+        health checks cost one cheap HTTP call and never load the model.
+
+        Raises:
+            httpx.HTTPError: If Ollama cannot be reached
+        """
+        import httpx
+
+        async with httpx.AsyncClient(base_url=self.ollama_url, timeout=timeout) as client:
+            response = await client.get("/api/tags")
+            response.raise_for_status()
+        models = [model.get("name") for model in response.json().get("models", [])]
+        return {
+            "model": self.ollama_model,
+            "model_available": self.ollama_model in models,
         }
-        
-        # Find city name (simplified)
-        cities = ["Agra", "Delhi", "Mumbai", "Bangalore", "Jaipur", "Goa", "Chennai", "Kolkata"]
-        found_city = None
-        for city in cities:
-            if city.lower() in query_lower:
-                found_city = city
-                break
-        
-        # Determine category
-        category = "cityinfos"  # default
-        for keyword, cat in keyword_mapping.items():
-            if keyword in query_lower:
-                category = cat
-                break
-        
+
+    def classify_query(self, user_query: str) -> QueryCategory:
+        """
+        Classify a query, answering from the cache or the fast path when possible.
+
+        Args:
+            user_query: The natural language query from user
+
+        Returns:
+            QueryCategory whose tier tells which classifier answered
+        """
+        classification = self.classify_without_llm(user_query)
+        if classification is not None:
+            return classification
+
+        classification = self._classify_with_llm(user_query)
+        self._remember(user_query, classification)
+        return classification
+
+    async def aclassify_query(self, user_query: str) -> QueryCategory:
+        """Async variant of classify_query that does not block the event loop."""
+        classification = self.classify_without_llm(user_query)
+        if classification is not None:
+            return classification
+
+        classification = await self._aclassify_with_llm(user_query)
+        self._remember(user_query, classification)
+        return classification
+
+    def classify_many(self, queries: List[str], skip_lookup: bool = False) -> List[QueryCategory]:
+        """
+        Classify several queries, sending only the unresolved ones to Ollama.
+
+        Queries answered by the fast path or the cache never reach the LLM.
+        Duplicates (after normalization) are classified once. The rest are
+        either packed into multi-query prompts (CLASSIFIER_BATCH_MODE=prompt)
+        or sent as concurrent requests capped at CLASSIFIER_MAX_PARALLEL.
+
+        Args:
+            queries: Natural language queries
+            skip_lookup: The caller already ran classify_without_llm on every
+                query (e.g. the batcher); go straight to the LLM so cache
+                lookups and misses are not counted twice
+
+        Returns:
+            One QueryCategory per query, in input order
+        """
+        results, pending = self._resolve_without_llm(queries, skip_lookup)
+
+        if pending:
+            unique_queries = [queries[indexes[0]] for indexes in pending.values()]
+            if self.batch_mode == "prompt":
+                classified = self._classify_batch_with_llm(unique_queries)
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_parallel, len(unique_queries))) as executor:
+                    classified = list(executor.map(self._classify_with_llm, unique_queries))
+            self._merge_llm_results(results, pending, unique_queries, classified)
+
+        return results
+
+    async def aclassify_many(self, queries: List[str], skip_lookup: bool = False) -> List[QueryCategory]:
+        """Async variant of classify_many using the LLM's async client."""
+        results, pending = self._resolve_without_llm(queries, skip_lookup)
+
+        if pending:
+            unique_queries = [queries[indexes[0]] for indexes in pending.values()]
+            if self.batch_mode == "prompt":
+                classified = await self._aclassify_batch_with_llm(unique_queries)
+            else:
+                semaphore = asyncio.Semaphore(self.max_parallel)
+
+                async def classify_bounded(user_query: str) -> QueryCategory:
+                    async with semaphore:
+                        return await self._aclassify_with_llm(user_query)
+
+                classified = await asyncio.gather(*(classify_bounded(q) for q in unique_queries))
+            self._merge_llm_results(results, pending, unique_queries, classified)
+
+        return results
+
+    def _resolve_without_llm(
+            self,
+            queries: List[str],
+            skip_lookup: bool = False
+    ) -> Tuple[List[Optional[QueryCategory]], Dict[str, List[int]]]:
+        """Resolve what the fast path and cache can; group the rest by normalized query."""
+        results: List[Optional[QueryCategory]] = [None] * len(queries)
+        pending: Dict[str, List[int]] = {}
+
+        for index, user_query in enumerate(queries):
+            classification = None if skip_lookup else self.classify_without_llm(user_query)
+            if classification is not None:
+                results[index] = classification
+            else:
+                pending.setdefault(normalize_query(user_query), []).append(index)
+
+        return results, pending
+
+    def _merge_llm_results(
+            self,
+            results: List[Optional[QueryCategory]],
+            pending: Dict[str, List[int]],
+            unique_queries: List[str],
+            classified: List[QueryCategory]
+    ):
+        """Cache LLM answers and fan them out to every duplicate of the query."""
+        for user_query, classification, indexes in zip(unique_queries, classified, pending.values()):
+            self._remember(user_query, classification)
+            for index in indexes:
+                results[index] = classification.model_copy(deep=True)
+
+    def classify_without_llm(self, user_query: str) -> Optional[QueryCategory]:
+        """Answer from the fast path or the cache, or return None if the LLM is needed."""
+        if self.fast_path_enabled:
+            fast_result = self.fast_classifier.classify(user_query)
+            if fast_result and fast_result.confidence >= self.fast_path_threshold:
+                print(f"⚡ Fast-path classification: {fast_result.category} in {fast_result.cityName}")
+                return fast_result
+
+        if self.cache is not None:
+            self.cache.ensure_namespace(self.cache_fingerprint())
+            return self.cache.get(user_query)
+
+        return None
+
+    def _remember(self, user_query: str, classification: QueryCategory):
+        # Only cache real LLM answers; fallbacks reflect a transient failure
+        if self.cache is not None and classification.tier == "llm":
+            self.cache.set(user_query, classification)
+
+    def _parse_classification(self, data: Dict[str, Any]) -> QueryCategory:
+        """Build a QueryCategory from the JSON object returned by the LLM."""
+        # Validate category
+        category=data.get("category","cityinfos")
+        if category not in self.categories:
+            category="cityinfos"
+
         return QueryCategory(
             category=category,
-            cityName=found_city,
-            parameters={},
-            confidence=0.5
+            cityName=data.get("cityName"),
+            parameters=data.get("parameters") or {},
+            confidence=data.get("confidence",0.5),
+            tier="llm"
         )
 
+    def _build_prompt(self, user_query: str) -> str:
+        return self.prompt_template.format(
+            query=user_query,
+            categories=", ".join(self.categories)
+        )
+
+    def _parse_response(self, user_query: str, response: str) -> QueryCategory:
+        """Parse a single-query LLM response, falling back to keyword matching."""
+        print(f"Ollama response: {response}")
+
+        # Try to parse JSON from response
+        # Find JSON object in response
+        start_idx = response.find('{')
+        end_idx = response.rfind('}') + 1
+
+        if start_idx != -1 or end_idx != -1:
+            json_str=response[start_idx:end_idx]
+            return self._parse_classification(json.loads(json_str))
+        else:
+            return self._fallback_classification(user_query)
+
+    def _classify_with_llm(self, user_query: str) -> QueryCategory:
+        """Classify a query with Ollama, falling back to keyword matching on failure."""
+        try:
+            response=self.llm.invoke(self._build_prompt(user_query))
+            return self._parse_response(user_query, response)
+        
+        except Exception as e:
+            print(f"❌ Error classifying query with Ollama: {e}")
+            return self._fallback_classification(user_query)
+
+    async def _aclassify_with_llm(self, user_query: str) -> QueryCategory:
+        """Async variant of _classify_with_llm using ainvoke."""
+        try:
+            response=await self.llm.ainvoke(self._build_prompt(user_query))
+            return self._parse_response(user_query, response)
+        
+        except Exception as e:
+            print(f"❌ Error classifying query with Ollama: {e}")
+            return self._fallback_classification(user_query)
+
+    def _build_batch_prompts(self, queries: List[str]) -> List[Tuple[int, List[str], str]]:
+        """Split queries into chunks of CLASSIFIER_BATCH_SIZE with one prompt each."""
+        prompts = []
+        for chunk_start in range(0, len(queries), self.batch_size):
+            chunk = queries[chunk_start:chunk_start + self.batch_size]
+            numbered = "\n".join(f"{i + 1}. \"{q}\"" for i, q in enumerate(chunk))
+            prompt=self.batch_prompt_template.format(
+                queries=numbered,
+                categories=", ".join(self.categories)
+            )
+            prompts.append((chunk_start, chunk, prompt))
+        return prompts
+
+    def _parse_batch_response(
+            self,
+            results: List[Optional[QueryCategory]],
+            chunk_start: int,
+            chunk: List[str],
+            response: str
+    ):
+        """Fill results from a multi-query response, skipping invalid items."""
+        print(f"Ollama batch response: {response}")
+
+        start_idx = response.find('[')
+        end_idx = response.rfind(']') + 1
+        items = json.loads(response[start_idx:end_idx]) if start_idx != -1 else []
+
+        for item in items:
+            try:
+                position = int(item.get("index", 0)) - 1
+                if 0 <= position < len(chunk) and results[chunk_start + position] is None:
+                    results[chunk_start + position] = self._parse_classification(item)
+            except Exception as e:
+                print(f"⚠️ Skipping invalid batch item {item}: {e}")
+
+    def _classify_batch_with_llm(self, queries: List[str]) -> List[QueryCategory]:
+        """
+        Classify queries with one multi-query prompt per chunk of CLASSIFIER_BATCH_SIZE.
+
+        Any query the model skips or answers with invalid JSON is retried on its own.
+        """
+        results: List[Optional[QueryCategory]] = [None] * len(queries)
+
+        for chunk_start, chunk, prompt in self._build_batch_prompts(queries):
+            try:
+                response=self.llm.invoke(prompt)
+                self._parse_batch_response(results, chunk_start, chunk, response)
+            except Exception as e:
+                print(f"❌ Error classifying batch with Ollama: {e}")
+
+        return [
+            classification if classification is not None else self._classify_with_llm(user_query)
+            for user_query, classification in zip(queries, results)
+        ]
+
+    async def _aclassify_batch_with_llm(self, queries: List[str]) -> List[QueryCategory]:
+        """Async variant of _classify_batch_with_llm; chunks are sent concurrently."""
+        results: List[Optional[QueryCategory]] = [None] * len(queries)
+        semaphore = asyncio.Semaphore(self.max_parallel)
+
+        async def classify_chunk(chunk_start: int, chunk: List[str], prompt: str):
+            async with semaphore:
+                try:
+                    response=await self.llm.ainvoke(prompt)
+                    self._parse_batch_response(results, chunk_start, chunk, response)
+                except Exception as e:
+                    print(f"❌ Error classifying batch with Ollama: {e}")
+
+        await asyncio.gather(*(classify_chunk(*item) for item in self._build_batch_prompts(queries)))
+
+        return [
+            classification if classification is not None else await self._aclassify_with_llm(user_query)
+            for user_query, classification in zip(queries, results)
+        ]
+            
+    def _fallback_classification(self, user_query: str) -> QueryCategory:
+        """Fallback classification using the fast-path keyword matcher at any confidence."""
+        result = self.fast_classifier.classify(user_query)
+        if result is None:
+            # No category keyword matched; still report a city if one was found
+            result = QueryCategory(
+                category="cityinfos",
+                cityName=self.fast_classifier.find_city(user_query),
+                confidence=0.5
+            )
+        result.tier = "fallback"
+        return result
+
 # Create singleton instance
 query_classifier = OllamaQueryClassifier()
-        
\ No newline at end of file
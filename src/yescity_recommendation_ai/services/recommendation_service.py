@@ -1,148 +1,307 @@
+import asyncio
 import time
 from typing import Dict, List, Any, Optional
-from unicodedata import category
 from ..database.mongodb_client import mongodb_client
+from ..database.projections import get_full_view_projection, get_name_field
 from .query_classifier import query_classifier
+from .response_cache import ResponseCache, recommendation_key, response_cache
+from .single_flight import SingleFlight, recommendation_flights
+from ..models.user_query import QueryCategory, QueryContext
 # from .crew.crew_manager  import crew_manager
 # from yescity_recommendation_ai.crew import crew_manager
+from ..database.query_builder import CASE_INSENSITIVE_COLLATION
 from bson import ObjectId
 
-def convert_objectid_to_str(data: Any) -> Any:
-    """
-    Recursively convert all ObjectId instances to strings in nested structures.
-    
-    Args:
-        data: Any data structure (dict, list, ObjectId, or primitive)
-        
-    Returns:
-        The same structure with all ObjectId instances converted to strings
-    """
-    if isinstance(data, ObjectId):
-        return str(data)
-    elif isinstance(data, dict):
-        return {key: convert_objectid_to_str(value) for key, value in data.items()}
-    elif isinstance(data, list):
-        return [convert_objectid_to_str(item) for item in data]
-    else:
-        return data
+# Recomputed for every response, never cached
+PER_REQUEST_FIELDS=("stage_timings","processing_time","classification","cache")
 
 class RecommendationService:
     """ Main service to handle recommendation requests """
 
-    def __init__(self):
+    def __init__(self,cache:Optional[ResponseCache]=None,flights:Optional[SingleFlight]=None):
+        # Full responses keyed on the classified intent; None disables caching
+        self.response_cache=cache if cache is not None else response_cache
+        # Concurrent requests for the same intent share one crew run
+        self.flights=flights if flights is not None else recommendation_flights
+        # Background revalidations of stale entries (kept referenced until done)
+        self._background_tasks=set()
+
+    @property
+    def crew_manager(self):
+        # Imported on first use: crewai/litellm take seconds to import
         from ..crew.crew_manager import crew_manager
-        self.crew_manager = crew_manager
+        return crew_manager
 
-    def get_recommendations(self,user_query:str)->Dict[str,Any]:
-        """ Get recommendations based on user query """
-        start_time = time.time()
+    async def aget_recommendations(self,user_query:str,context:Optional[QueryContext]=None)->Dict[str,Any]:
+        """
+        Get recommendations based on user query.
+
+        Classification uses the async LLM client, the crew runs on the crew
+        scheduler's bounded pool and hydration uses the async MongoDB client,
+        so the event loop stays free for other requests.
 
-        # Step 1: Classify the query
-        classification = query_classifier.classify_query(user_query)
+        Args:
+            user_query: The natural language query from user
+            context: Optional request context; if it already carries a
+                classification (e.g. from the classification batcher) it is reused
+
+        Returns:
+            Dictionary with recommendations, full data and stage timings
+        """
+        context=context or QueryContext(user_query=user_query)
+
+        # Step 1: Classify the query once; the crew manager reuses it
+        if context.classification is None:
+            with context.timed("classify"):
+                context.classification = await query_classifier.aclassify_query(user_query)
+        classification=context.classification
         print(f"📊 Classification: {classification.category} in {classification.cityName}")
 
+        # Step 2: Serve the same intent from the response cache
+        cached=await self._cache_lookup(context)
+        if cached is not None:
+            if cached.stale and self.response_cache.begin_revalidation(cached.key):
+                task=asyncio.create_task(self._arevalidate(user_query,classification,cached.key))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+            return self._from_cache(context,cached)
+
+        # Step 3: Run the crew and hydrate from MongoDB (once per concurrent intent)
+        crew_result=await self._acompute_shared(user_query,context)
+        return self._finalize(context,crew_result)
 
-        # Step 2: Process through crew manager
-        crew_result=self.crew_manager.process_query(user_query)
+    def _flight_key(self,classification:QueryCategory)->str:
+        return ":".join(recommendation_key(classification))
 
-        processing_time = time.time() - start_time
+    async def _acompute_shared(self,user_query:str,context:QueryContext,key:Optional[str]=None)->Dict[str,Any]:
+        """
+        Compute and cache a response, joining an identical in-flight computation if there is one.
+
+        Followers get the leader's result (or exception); the time they spent
+        waiting is recorded as the "coalesced" stage.
+        """
+        async def compute():
+            crew_result=await self._acompute(user_query,context)
+            await self._cache_store(context,crew_result,key=key)
+            return crew_result
+
+        started=time.perf_counter()
+        crew_result,shared=await self.flights.ado(self._flight_key(context.classification),compute)
+        if shared:
+            context.timings["coalesced"]=round(time.perf_counter()-started,3)
+            print(f"🔗 Joined in-flight {context.classification.category} request")
+        # Every caller finalizes its own copy
+        return dict(crew_result)
+
+    async def _acompute(self,user_query:str,context:QueryContext)->Dict[str,Any]:
+        """Run the crew on the crew scheduler and hydrate its recommendations (no caching)."""
+        crew_result=await self.crew_manager.aprocess_query(user_query,context=context)
         
         if not crew_result.get("success",False):
-            crew_result["processing_time"]=round(processing_time,3)
             return crew_result
         
-        # Step 3: Fetch additional data from MongoDB if needed
         recommendations = crew_result.get("recommendations", [])
         category = crew_result.get("category")
 
         if recommendations and category:
-            full_data=self._get_full_data(category,recommendations)
+            with context.timed("hydrate"):
+                full_data=await self._aget_full_data(category,recommendations)
             crew_result["full_data"]=full_data
-        
-        crew_result["processing_time"]=round(processing_time,3)
-        crew_result["classification"] = classification.dict()
+        return crew_result
+
+    async def _cache_lookup(self,context:QueryContext):
+        if self.response_cache is None:
+            return None
+        with context.timed("cache"):
+            return await self.response_cache.aget(context.classification)
+
+    async def _cache_store(self,context:QueryContext,crew_result:Dict[str,Any],key:Optional[str]=None):
+        """Cache successful responses; fallback classifications reflect a transient LLM failure."""
+        if self.response_cache is None or not crew_result.get("success",False):
+            return
+        if context.classification.tier=="fallback":
+            return
+        value={k:v for k,v in crew_result.items() if k not in PER_REQUEST_FIELDS}
+        await self.response_cache.aset(context.classification,value,key=key)
+
+    def _from_cache(self,context:QueryContext,cached)->Dict[str,Any]:
+        result=cached.value
+        result["cache"]={"status":"stale" if cached.stale else "hit","age_seconds":cached.age_seconds}
+        print(f"⚡ Served {context.classification.category} from response cache ({result['cache']['status']})")
+        return self._finalize(context,result)
 
+    async def _arevalidate(self,user_query:str,classification:QueryCategory,key:str):
+        """Recompute a stale entry in the background."""
+        context=QueryContext(user_query=user_query,classification=classification)
+        try:
+            await self._acompute_shared(user_query,context,key=key)
+        except Exception as e:
+            print(f"⚠️ Revalidating cached response failed: {e}")
+        finally:
+            self.response_cache.end_revalidation(key)
+
+    @staticmethod
+    def _finalize(context:QueryContext,crew_result:Dict[str,Any])->Dict[str,Any]:
+        """Attach stage timings (and the classification on success) to a crew result."""
+        crew_result["stage_timings"]=context.stage_timings()
+        crew_result["processing_time"]=crew_result["stage_timings"]["total"]
+        if crew_result.get("success",False):
+            crew_result["classification"] = context.classification.dict()
         return crew_result
     
-    def get_recommendation_by_category(self,category:str,city:str,**filters) -> Dict[str,Any]:
+    async def aget_recommendation_by_category(self,category:str,city:str,/,**filters) -> Dict[str,Any]:
         """
-        Direct recommendation by category (for UI buttons).
+        Crew recommendation for a structured category request (UI buttons).
+
+        The request is already structured, so it becomes the classification
+        directly instead of being turned into a sentence and re-classified.
+        The plain, LLM-free path is CategorySearchService.
         
         Args:
             category: Collection name
             city: City name
-            **filters: Additional filters
+            **filters: Additional filters (may include a "category" filter,
+                hence the positional-only arguments)
             
         Returns:
             Dictionary with recommendations
         """
+        user_query,context=self._structured_context(category,city,filters)
+        return await self.aget_recommendations(user_query,context=context)
 
-        query_parts=[f"{category} in {city}"]
-        for key,value in filters.items():
-            if value:
-                query_parts.append(f"{key}: {value}")
-
+    @staticmethod
+    def _structured_context(category:str,city:str,filters:Dict[str,Any]):
+        parameters={key:str(value) for key,value in filters.items() if value not in (None,"")}
+        # Readable query for the crew prompt and logs
+        query_parts=[f"{category} in {city}"]+[f"{key}: {value}" for key,value in parameters.items()]
         user_query=" ".join(query_parts)
-
-        # Process through the normal pipeline
-
-        return self.get_recommendations(user_query)
+        classification=QueryCategory(
+            category=category,
+            cityName=city,
+            parameters=parameters,
+            confidence=1.0,
+            tier="structured"
+        )
+        return user_query,QueryContext(user_query=user_query,classification=classification)
     
-    def _get_full_data(self,category:str,recommendations:List[Dict[str,Any]])->List[Dict[str,Any]]:
+    async def _aget_full_data(
+            self,
+            category:str,
+            recommendations:List[Dict[str,Any]],
+            projection:Optional[Dict[str,int]]=None
+    )->List[Dict[str,Any]]:
         """
         Fetch complete data for recommendations from MongoDB.
+
+        Uses one $in query on _id and one case-insensitive $in query on the
+        name field for recommendations whose _id did not match, instead of
+        up to three find_one calls per recommendation.
         
         Args:
             category: Collection name
             recommendations: List of {_id, name} or {_id, foodPlace}
+            projection: Fields to return; defaults to the collection's UI view
             
         Returns:
-            List of complete document data
+            List of document data in the crew's ranking order
         """
-        full_data=[]
-        collection=mongodb_client.get_collection(category)
+        collection=mongodb_client.get_async_collection(category)
+        projection=self._hydration_projection(category,projection)
+        ids=self._hydration_ids(recommendations)
+
+        try:
+            by_id={}
+            if ids:
+                docs=await collection.find({"_id":{"$in":ids}},projection).to_list()
+                by_id={doc["_id"]:doc for doc in docs}
+
+            names=self._missing_names(recommendations,by_id)
+            by_name={}
+            if names:
+                docs=await collection.find(
+                    {get_name_field(category):{"$in":names}},
+                    projection,
+                    collation=CASE_INSENSITIVE_COLLATION
+                ).to_list()
+                by_name=self._index_by_name(category,docs)
+        except Exception as e:
+            print(f"Error fetching data:{e}")
+            return self._hydration_errors(recommendations,e)
+
+        return self._order_hydrated(recommendations,by_id,by_name)
+
+    @staticmethod
+    def _hydration_projection(category:str,projection:Optional[Dict[str,int]])->Optional[Dict[str,int]]:
+        """Resolve the projection, making sure the name field is always returned."""
+        projection=projection if projection is not None else get_full_view_projection(category)
+        if projection and any(projection.values()):
+            projection={**projection,get_name_field(category):1}
+        return projection or None
 
+    def _hydration_ids(self,recommendations:List[Dict[str,Any]])->List[ObjectId]:
+        """Collect the distinct valid ObjectIds of the crew's recommendations."""
+        ids=[]
         for rec in recommendations:
-            try:
-                doc=None
-
-                # Try to find by _id first
-                if "_id" in rec:
-                    try:
-                        doc=collection.find_one({"_id":ObjectId(rec["_id"])})
-                    except:
-                        pass
-
-                # If not found by _id, try by name or foodPlace
-                if not doc:
-                    name_field="foodPlace" if category=="food" else "name"
-
-                    search_name=rec.get("name") or rec.get("foodPlace")
-
-                    if search_name:
-                        # try exact match first
-                        doc=collection.find_one({name_field:search_name})
-
-                        if not doc:
-                            # try case-insensitive match
-                            doc=collection.find_one({name_field:{"$regex":f"^{search_name}$","$options":"i"}})
-
-                    if doc:
-                        # Convert all ObjectId fields to strings recursively
-                        doc = convert_objectid_to_str(doc)
-                        full_data.append(doc)
-                    else:
-                        # Add partial data if not found
-                        rec["error"]="Document not found in database"
-                        full_data.append(rec)
-
-            except Exception as e:
-                print(f"Error fetching data:{e}")
-                rec["error"] = f"Error fetching data: {str(e)}"
-                full_data.append(rec)
+            _id=self._rec_object_id(rec)
+            if _id is not None and _id not in ids:
+                ids.append(_id)
+        return ids
+
+    @staticmethod
+    def _rec_object_id(rec:Dict[str,Any])->Optional[ObjectId]:
+        _id=str(rec.get("_id",""))
+        return ObjectId(_id) if ObjectId.is_valid(_id) else None
+
+    def _missing_names(self,recommendations:List[Dict[str,Any]],by_id:Dict[ObjectId,Dict[str,Any]])->List[str]:
+        """Names of recommendations whose _id was not found."""
+        names=[]
+        for rec in recommendations:
+            if self._rec_object_id(rec) not in by_id:
+                name=rec.get("name") or rec.get("foodPlace")
+                if name and name not in names:
+                    names.append(name)
+        return names
+
+    @staticmethod
+    def _index_by_name(category:str,docs)->Dict[str,Dict[str,Any]]:
+        """Map casefolded names to the first matching document."""
+        name_field=get_name_field(category)
+        by_name={}
+        for doc in docs:
+            name=doc.get(name_field)
+            if isinstance(name,str):
+                by_name.setdefault(name.casefold(),doc)
+        return by_name
 
+    def _order_hydrated(
+            self,
+            recommendations:List[Dict[str,Any]],
+            by_id:Dict[ObjectId,Dict[str,Any]],
+            by_name:Dict[str,Dict[str,Any]]
+    )->List[Dict[str,Any]]:
+        """Return documents in the crew's ranking order, flagging recommendations not found."""
+        full_data=[]
+        for rec in recommendations:
+            doc=by_id.get(self._rec_object_id(rec))
+            if doc is None:
+                name=rec.get("name") or rec.get("foodPlace")
+                doc=by_name.get(name.casefold()) if isinstance(name,str) else None
+
+            if doc:
+                # Raw BSON; encoded once by utils.serialization at the response
+                full_data.append(doc)
+            else:
+                # Add partial data if not found
+                rec["error"]="Document not found in database"
+                full_data.append(rec)
         return full_data
 
+    @staticmethod
+    def _hydration_errors(recommendations:List[Dict[str,Any]],error:Exception)->List[Dict[str,Any]]:
+        for rec in recommendations:
+            rec["error"] = f"Error fetching data: {str(error)}"
+        return list(recommendations)
+
 # Create singleton instance
 recommendation_service = RecommendationService()
 
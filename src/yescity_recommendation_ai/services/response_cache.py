@@ -0,0 +1,295 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..models.user_query import QueryCategory
+from ..utils.helpers import canonicalize_cities, normalize_text
+from ..utils.serialization import dumps, loads
+
+def recommendation_key(classification: QueryCategory) -> Tuple[str, str]:
+    """
+    Canonical cache key for a classified query.
+
+    Two queries share a key when they classify to the same category, the same
+    city (aliases such as Banaras/Varanasi canonicalized) and the same
+    parameters, regardless of wording, ordering or case.
+
+    Returns:
+        (category, digest) - the category scopes invalidation
+    """
+    category = classification.category.strip().lower()
+    city = canonicalize_cities(normalize_text(classification.cityName or ""))
+    parameters = sorted(
+        (normalize_text(str(key)), normalize_text(str(value)))
+        for key, value in (classification.parameters or {}).items()
+        if value not in (None, "")
+    )
+    source = json.dumps([category, city, parameters], ensure_ascii=False)
+    return category, hashlib.sha1(source.encode("utf-8")).hexdigest()[:20]
+
+class CacheLookup:
+    """A cached response plus whether it is past its TTL (but still servable)."""
+
+    def __init__(self, key: str, value: Dict[str, Any], stored_at: float, stale: bool):
+        self.key = key
+        self.value = value
+        self.stored_at = stored_at
+        self.stale = stale
+
+    @property
+    def age_seconds(self) -> float:
+        return round(time.time() - self.stored_at, 1)
+
+class InMemoryResponseBackend:
+    """
+    Per-process LRU store; entries are dropped once they are too old to serve.
+
+    Values are kept serialized, like in Redis, so every read returns a fresh
+    copy and callers that mutate a response (nested full_data included)
+    cannot change the cached entry.
+    """
+
+    name = "memory"
+    # Lookups never wait on the network; safe to call on the event loop
+    blocking = False
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, float, bytes]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return stored_at, loads(value)
+
+    def set(self, key: str, value: Dict[str, Any], stored_at: float, expire_seconds: float):
+        payload = dumps(value)
+        with self._lock:
+            self._entries[key] = (stored_at, stored_at + expire_seconds, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def generation(self, category: str) -> int:
+        return self._generations.get(category, 0)
+
+    def bump_generation(self, category: str):
+        with self._lock:
+            self._generations[category] = self._generations.get(category, 0) + 1
+            # Old generations can never be read again
+            prefix = f"{category}:"
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+class RedisResponseBackend:
+    """
+    Redis (or any Redis-compatible store) shared by all workers.
+
+    Entries are stored as JSON with a Redis TTL; per-category generation
+    counters live in Redis too, so one worker's invalidation applies to all.
+    """
+
+    name = "redis"
+    # Every call is a network round trip; ResponseCache.aget/aset run it off the event loop
+    blocking = True
+
+    def __init__(self, url: str, prefix: str = "yescity:rec"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.evictions = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        raw = self.client.get(self._key(key))
+        if raw is None:
+            return None
+        entry = loads(raw)
+        return entry["stored_at"], entry["value"]
+
+    def set(self, key: str, value: Dict[str, Any], stored_at: float, expire_seconds: float):
+        payload = dumps({"stored_at": stored_at, "value": value})
+        self.client.set(self._key(key), payload, ex=max(1, int(expire_seconds)))
+
+    def generation(self, category: str) -> int:
+        return int(self.client.get(self._key(f"gen:{category}")) or 0)
+
+    def bump_generation(self, category: str):
+        self.client.incr(self._key(f"gen:{category}"))
+
+    def clear(self):
+        for key in self.client.scan_iter(match=f"{self.prefix}:*"):
+            self.client.delete(key)
+
+    def size(self) -> Optional[int]:
+        return None
+
+class ResponseCache:
+    """
+    Cache of full recommendation responses keyed on the classified intent.
+
+    Entries are fresh for ttl_seconds and may then be served stale for another
+    stale_seconds while one caller recomputes them in the background
+    (stale-while-revalidate). Each category's entries are invalidated
+    together when its collection changes.
+    """
+
+    def __init__(self, backend=None, ttl_seconds: float = 900, stale_seconds: float = 3600):
+        self.backend = backend if backend is not None else InMemoryResponseBackend()
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._revalidating = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations = 0
+
+    def key_for(self, classification: QueryCategory) -> str:
+        category, digest = recommendation_key(classification)
+        return f"{category}:{self.backend.generation(category)}:{digest}"
+
+    def get(self, classification: QueryCategory) -> Optional[CacheLookup]:
+        """
+        Look up a response; backend failures count as misses.
+
+        Returns:
+            CacheLookup (possibly stale) or None on a miss
+        """
+        try:
+            key = self.key_for(classification)
+            entry = self.backend.get(key)
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ Response cache lookup failed: {e}")
+            return None
+
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, value = entry
+        stale = time.time() - stored_at > self.ttl_seconds
+        if stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return CacheLookup(key, value, stored_at, stale)
+
+    def set(self, classification: QueryCategory, result: Dict[str, Any], key: Optional[str] = None):
+        """Store a successful response."""
+        try:
+            self.backend.set(
+                key or self.key_for(classification),
+                result,
+                time.time(),
+                self.ttl_seconds + self.stale_seconds
+            )
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ Response cache store failed: {e}")
+
+    async def aget(self, classification: QueryCategory) -> Optional[CacheLookup]:
+        """get() for async callers; a blocking backend runs in a worker thread."""
+        if getattr(self.backend, "blocking", True):
+            return await asyncio.to_thread(self.get, classification)
+        return self.get(classification)
+
+    async def aset(self, classification: QueryCategory, result: Dict[str, Any], key: Optional[str] = None):
+        """set() for async callers; a blocking backend runs in a worker thread."""
+        if getattr(self.backend, "blocking", True):
+            await asyncio.to_thread(self.set, classification, result, key)
+        else:
+            self.set(classification, result, key)
+
+    def begin_revalidation(self, key: str) -> bool:
+        """Claim the background refresh of a stale entry; False if one is already running."""
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            return True
+
+    def end_revalidation(self, key: str):
+        with self._lock:
+            self._revalidating.discard(key)
+
+    def invalidate(self, category: Optional[str] = None):
+        """Drop one category's responses (e.g. when its collection changes), or all of them."""
+        try:
+            if category is None:
+                self.backend.clear()
+            else:
+                self.backend.bump_generation(category)
+            self.invalidations += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ Response cache invalidation failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and settings."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "size": self.backend.size(),
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "invalidations": self.invalidations,
+            "evictions": self.backend.evictions,
+            "revalidating": len(self._revalidating),
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+def build_response_cache() -> Optional[ResponseCache]:
+    """Create the response cache from environment settings (None when disabled)."""
+    backend_name = os.getenv("RESPONSE_CACHE_BACKEND", "memory").lower()
+    if backend_name in ("none", "off", "false"):
+        return None
+
+    backend = None
+    if backend_name == "redis":
+        try:
+            backend = RedisResponseBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        except ImportError:
+            print("⚠️ RESPONSE_CACHE_BACKEND=redis needs the redis package; using the in-process cache")
+    if backend is None:
+        backend = InMemoryResponseBackend(max_size=int(os.getenv("RESPONSE_CACHE_SIZE", "512")))
+
+    return ResponseCache(
+        backend=backend,
+        ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL", "900")),
+        stale_seconds=float(os.getenv("RESPONSE_CACHE_STALE_SECONDS", "3600")),
+    )
+
+# Create singleton instance
+response_cache = build_response_cache()
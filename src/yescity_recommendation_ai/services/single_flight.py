@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+class _Flight:
+    """An in-flight async computation and the number of callers awaiting it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical computations (single-flight).
+
+    The first caller for a key (the leader) starts the computation; callers
+    arriving with the same key while it is running (followers) wait for it
+    and receive the leader's result or exception instead of starting their
+    own. Nothing is kept once the computation finishes - caching is the
+    response cache's job.
+
+    Coalescing is per event loop, i.e. per worker process.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Await fn() once per key across concurrent callers.
+
+        fn() runs in its own task, so a cancelled caller - leader or follower -
+        only stops waiting; the computation is cancelled once nobody awaits it.
+
+        Returns:
+            (result, shared) where shared is True for followers
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if shared:
+            self.coalesced += 1
+        else:
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(fn()))
+            flight.task.add_done_callback(lambda task: self._land(key, flight))
+            self.leaders += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # The last caller was cancelled; later callers start afresh
+                self._forget(key, flight)
+                flight.task.cancel()
+
+    def _forget(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def _land(self, key: str, flight: _Flight):
+        self._forget(key, flight)
+        if not flight.task.cancelled() and flight.task.exception() is not None:
+            # exception() also marks it retrieved when nobody else reads it
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return leader/follower counters."""
+        requests = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "coalesce_rate": round(self.coalesced / requests, 3) if requests else 0.0,
+        }
+
+# Create singleton instance
+recommendation_flights = SingleFlight()
@@ -1,8 +1,14 @@
-from typing import Dict,List,Any,Optional
+from typing import Dict,List,Any,Optional,Tuple
 from pydantic import BaseModel,Field
 from crewai.tools import BaseTool
 from ..database.mongodb_client import mongodb_client
+from ..database.query_builder import QueryBuilder
+from ..database.projections import get_llm_view_projection
 from bson import ObjectId
+from pymongo.collation import Collation
+
+# Text fields matched case-insensitively when given as plain strings
+TEXT_FIELDS = ['cityName','foodPlace','category']
 
 class MongoDBQueryTool(BaseTool):
 
@@ -10,13 +16,28 @@ class MongoDBQueryTool(BaseTool):
     description: str = "Base tool to query MongoDB collections with proper schema handling"
     collection_name: str=Field(..., description="Name of the MongoDB collection to query")
 
-    def _run(self,query_filter: Dict[str,Any]=None,limit:int=10,**kwargs)->List[Dict]:
+    def _run(
+            self,
+            query_filter: Dict[str,Any]=None,
+            limit:int=10,
+            collation:Optional[Collation]=None,
+            sort:Optional[List[Tuple[str,int]]]=None,
+            projection:Optional[Dict[str,Any]]=None,
+            **kwargs
+    )->List[Dict]:
         """
         Run a query on the specified collection.
         
+        Plain string values for cityName/foodPlace/category are matched as
+        case-insensitive equality through QueryBuilder, so they can use an index.
+        
         Args:
             query_filter: MongoDB query filter
             limit: Maximum number of results to return
+            collation: Collation the filter was built for (from QueryBuilder)
+            sort: Server-side sort applied before the limit, e.g. [("compositeScore", -1)]
+            projection: Fields MongoDB returns; defaults to the collection's compact
+                LLM view (see database/projections.py) since results go into the prompt
             **kwargs: Additional query parameters
             
         Returns:
@@ -27,17 +48,28 @@ class MongoDBQueryTool(BaseTool):
             collection=mongodb_client.get_collection(self.collection_name)
 
             #Build query filter
-            filter_dict=query_filter or {}
+            filter_dict=dict(query_filter or {})
             if kwargs:
                 filter_dict.update(kwargs)
 
+            builder=QueryBuilder()
             for key,value in filter_dict.items():
-                if isinstance(value,str) and key in ['cityName','foodPlace','category']:
-                    filter_dict[key]={'$regex':value,'$options':'i'}
+                if isinstance(value,str) and key in TEXT_FIELDS:
+                    builder.equals(key,value)
+                else:
+                    builder.where(key,value)
+            filter_dict,builder_collation=builder.build()
+            collation=collation or builder_collation
 
             print(f"🔍 Querying {self.collection_name}: {filter_dict}")
 
-            cursor=collection.find(filter_dict).limit(limit)
+            if projection is None:
+                projection=get_llm_view_projection(self.collection_name)
+
+            cursor=collection.find(filter_dict,projection,collation=collation)
+            if sort:
+                cursor=cursor.sort(sort)
+            cursor=cursor.limit(limit)
             results=list(cursor)
 
             processed_results=[]
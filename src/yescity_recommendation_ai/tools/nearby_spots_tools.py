@@ -0,0 +1,77 @@
+from typing import Optional,Dict,Any,List
+from pydantic import Field,BaseModel,ConfigDict
+from crewai.tools import BaseTool
+from ..database.mongodb_client import mongodb_client
+from ..database.query_builder import QueryBuilder
+from ..database.projections import get_llm_view_projection
+from ..database.geo import GEO_COLLECTIONS, DISTANCE_FIELD, build_geo_near_pipeline
+from bson import ObjectId
+
+class NearbySpotsInput(BaseModel):
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True,
+        populate_by_name=True,
+    )
+    lat:float=Field(...,ge=-90,le=90,description="Latitude of the user's location")
+    lon:float=Field(...,ge=-180,le=180,description="Longitude of the user's location")
+    radiusMeters:float=Field(2000,gt=0,le=50000,description="Search radius in meters")
+    collection:str=Field("foods",description=f"What to look for, one of: {', '.join(GEO_COLLECTIONS)}")
+    category:Optional[str]=Field(None,description="Category to filter by, e.g. 'Sweets'")
+    maxResults:int=Field(10,ge=1,le=50,description="Maximum number of results to return")
+
+class NearbySpotsTool(BaseTool):
+    name:str="search_nearby_spots"
+    description:str="""
+    Find places near a latitude/longitude using the YesCity3 database,
+    nearest first, with the distance in meters. Works for foods,
+    accommodations, activities, places to visit, hidden gems and shopping.
+    """
+
+    args_schema:type=NearbySpotsInput
+
+    def _run(
+            self,
+            lat:float,
+            lon:float,
+            radiusMeters:float=2000,
+            collection:str="foods",
+            category:Optional[str]=None,
+            maxResults:int=10
+    )-> List[Dict[str,Any]]:
+        if collection not in GEO_COLLECTIONS:
+            return [{"error": f"Nearby search is not available for '{collection}'. Use one of: {', '.join(GEO_COLLECTIONS)}"}]
+
+        builder=QueryBuilder()
+        if category:
+            builder.equals("category",category)
+        query_filter,collation=builder.build()
+
+        pipeline=build_geo_near_pipeline(
+            lat,lon,radiusMeters,
+            query_filter=query_filter,
+            limit=maxResults,
+            projection=get_llm_view_projection(collection)
+        )
+        print(f"📍 Searching {collection} within {radiusMeters}m of ({lat}, {lon})")
+
+        try:
+            results=list(mongodb_client.get_collection(collection).aggregate(pipeline,collation=collation))
+        except Exception as e:
+            error_msg=f"Failed nearby search on {collection}: {str(e)}"
+            print(f"❌ {error_msg}")
+            return [{"error": error_msg}]
+
+        formatted_results=[]
+        for result in results:
+            formatted={
+                key:(str(value) if isinstance(value,ObjectId) else value)
+                for key,value in result.items()
+            }
+            formatted[DISTANCE_FIELD]=round(result.get(DISTANCE_FIELD,0))
+            formatted_results.append(formatted)
+
+        print(f"✅ Found {len(formatted_results)} nearby {collection}")
+        return formatted_results
+
+# Create an instance for easy import
+nearby_spots_tool = NearbySpotsTool()
@@ -0,0 +1,62 @@
+from typing import Optional,Dict,Any,List
+from pydantic import Field,create_model
+from .base_tool import MongoDBQueryTool
+from ..database.search_specs import CollectionSpec,build_search_query,has_text_params
+
+def build_args_schema(spec:CollectionSpec)->type:
+    """Tool input model: cityName, the spec's search parameters and maxResults."""
+    fields:Dict[str,Any]={
+        "cityName":(str,Field(...,description=f"City to search {spec.label} in")),
+    }
+    for search_field in spec.fields:
+        fields[search_field.param]=(
+            Optional[search_field.param_type],
+            Field(None,description=search_field.description)
+        )
+    fields["maxResults"]=(int,Field(10,ge=1,le=20,description="Maximum number of results to return"))
+    model_name="".join(part.capitalize() for part in spec.collection.split("_"))+"SearchInput"
+    return create_model(model_name,**fields)
+
+class CollectionSearchTool(MongoDBQueryTool):
+    """
+    Search tool generated from a CollectionSpec.
+
+    Parameters map onto one indexed query (see database/search_specs.py)
+    that is ranked and limited server-side; documents are returned as
+    MongoDB produced them, without per-row reshaping.
+
+    Text parameters come from the LLM and rarely equal the stored value
+    ("Sweets" vs "Sweets & Desserts"), so when the exact query finds
+    nothing it is retried once matching them by contained words.
+    """
+
+    spec:CollectionSpec=Field(...,description="Search spec of the collection",exclude=True)
+
+    def _run(self,cityName:str,maxResults:int=10,**params)->List[Dict[str,Any]]:
+        try:
+            query_filter,collation,sort=build_search_query(self.spec,cityName,params)
+        except ValueError as e:
+            return [{"error":str(e)}]
+
+        print(f"🔎 Searching {self.spec.collection} in {cityName} with filter: {query_filter}")
+        results=super()._run(query_filter=query_filter,limit=maxResults,collation=collation,sort=sort)
+        if not results and has_text_params(self.spec,params):
+            query_filter,collation,sort=build_search_query(self.spec,cityName,params,relaxed=True)
+            print(f"🔎 No exact match, retrying {self.spec.collection} with filter: {query_filter}")
+            results=super()._run(query_filter=query_filter,limit=maxResults,collation=collation,sort=sort)
+        print(f"✅ Found {len(results)} {self.spec.label}")
+        return results
+
+def build_search_tool(spec:CollectionSpec)->CollectionSearchTool:
+    """Create the crew search tool of a collection from its spec."""
+    ranking=" Results are ranked best first." if spec.ranking else ""
+    return CollectionSearchTool(
+        name=f"search_{spec.collection}",
+        description=(
+            f"Search {spec.label} ({spec.description}) in a specific city using the "
+            f"YesCity3 '{spec.collection}' collection.{ranking}"
+        ),
+        args_schema=build_args_schema(spec),
+        collection_name=spec.collection,
+        spec=spec
+    )
@@ -0,0 +1,5 @@
+from .search_tool_factory import build_search_tool
+from ..database.search_specs import SEARCH_SPECS
+
+# Create an instance for easy import
+transport_search_tool = build_search_tool(SEARCH_SPECS["localtransports"])
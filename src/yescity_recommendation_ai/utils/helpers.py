@@ -0,0 +1,49 @@
+import re
+import unicodedata
+from typing import List
+
+_NON_WORD_PATTERN = re.compile(r"[^\w\s]+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize free text for matching and cache keys.
+
+    Casefolds, strips accents, replaces punctuation with spaces and collapses
+    whitespace, so "Street food in Varanasi!" becomes "street food in varanasi".
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.casefold().replace("_", " ")
+    text = _NON_WORD_PATTERN.sub(" ", text)
+    return _WHITESPACE_PATTERN.sub(" ", text).strip()
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized word tokens."""
+    normalized = normalize_text(text)
+    return normalized.split(" ") if normalized else []
+
+# Historical / alternate city names mapped to one canonical spelling.
+CITY_ALIASES = {
+    "bombay": "mumbai",
+    "bengaluru": "bangalore",
+    "calcutta": "kolkata",
+    "madras": "chennai",
+    "banaras": "varanasi",
+    "benares": "varanasi",
+    "kashi": "varanasi",
+    "poona": "pune",
+    "gurugram": "gurgaon",
+    "mysuru": "mysore",
+    "prayagraj": "allahabad",
+}
+
+def canonicalize_cities(normalized_text: str) -> str:
+    """Replace city aliases in already-normalized text with their canonical names."""
+    return " ".join(CITY_ALIASES.get(token, token) for token in normalized_text.split(" "))
+
+def normalize_query(text: str) -> str:
+    """Normalize a user query into a stable key: normalized text with canonical city names."""
+    return canonicalize_cities(normalize_text(text))
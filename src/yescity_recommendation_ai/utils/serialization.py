@@ -0,0 +1,62 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from bson import Decimal128, ObjectId
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback, same output
+    orjson = None
+
+def bson_default(value: Any) -> Any:
+    """
+    Encode BSON and other non-JSON types; used as the JSON encoder's default.
+
+    Called only for values the encoder cannot handle itself, so documents
+    are never copied or walked in Python.
+    """
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return float(value.to_decimal())
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(data: Any) -> bytes:
+    """Serialize data (including raw MongoDB documents) to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, default=bson_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=bson_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def loads(data: bytes) -> Any:
+    """Parse JSON bytes produced by dumps."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def to_jsonable(data: Any) -> Any:
+    """Return a copy of data containing only JSON types (ObjectId -> str, ...)."""
+    return loads(dumps(data))
+
+class BSONJSONResponse(JSONResponse):
+    """
+    JSON response that encodes MongoDB documents directly.
+
+    Like FastAPI's ORJSONResponse, but ObjectId, Decimal128 and datetime
+    values are handled by the encoder, so routes can return documents as
+    read from the driver without converting them first.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,58 @@
+# Benchmark: crew construction cost per request, before and after template caching.
+# Run with: python tests/bench_crew_construction.py [iterations]
+import sys
+import time
+
+from crewai import Agent, Task, Crew, Process
+
+from yescity_recommendation_ai.crew.crew_manager import crew_manager
+from yescity_recommendation_ai.crew.yaml_loader import YAMLLoader
+from yescity_recommendation_ai.models.user_query import QueryCategory, QueryContext
+from yescity_recommendation_ai.tools.food_tools import food_search_tool
+
+def build_uncached(context: QueryContext) -> Crew:
+    """Per-request construction as it was done before templates: read YAML, build everything."""
+    YAMLLoader.clear_cache()
+    agent_config = YAMLLoader.load_agent_config("food_critic")
+    agent = Agent(
+        role=agent_config["role"],
+        goal=agent_config["goal"],
+        backstory=agent_config["backstory"],
+        verbose=agent_config.get("verbose", True),
+        allow_delegation=agent_config.get("allow_delegation", False),
+        tools=[food_search_tool],
+        llm=crew_manager.llm
+    )
+    task_config = YAMLLoader.load_task_config("food_recommendation")
+    task = Task(
+        description=task_config["description"].format(
+            cityName=context.classification.cityName,
+            user_query_details=crew_manager._build_query_details(context)
+        ),
+        expected_output=task_config["expected_output"],
+        agent=agent,
+        async_execution=task_config.get("async_execution", False),
+        output_file=task_config.get("output_file")
+    )
+    return Crew(agents=[agent], tasks=[task], process=Process.sequential, verbose=True, manager_llm=crew_manager.llm)
+
+def bench(label, fn, context, iterations):
+    fn(context)  # warm up
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        fn(context)
+    per_call_ms = (time.perf_counter() - start_time) / iterations * 1000
+    print(f"{label:<28} {per_call_ms:8.2f} ms/crew")
+    return per_call_ms
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    context = QueryContext(
+        user_query="street food in Varanasi",
+        classification=QueryCategory(category="foods", cityName="Varanasi", parameters={"keywords": "street food"})
+    )
+
+    before = bench("uncached (YAML + Agent)", build_uncached, context, iterations)
+    crew_manager.warm_templates()
+    after = bench("template (copy + Task)", crew_manager.create_food_crew, context, iterations)
+    print(f"speedup: {before / after:.2f}x")
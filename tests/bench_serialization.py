@@ -0,0 +1,63 @@
+# Benchmark: response serialization, recursive ObjectId conversion + json vs utils.serialization.
+# Run with: python tests/bench_serialization.py [documents] [iterations]
+import json
+import sys
+import time
+from datetime import datetime
+
+from bson import ObjectId
+
+from yescity_recommendation_ai.utils.serialization import dumps
+
+def convert_objectid_to_str(data):
+    """The per-route conversion used before the shared serializer."""
+    if isinstance(data, ObjectId):
+        return str(data)
+    elif isinstance(data, dict):
+        return {key: convert_objectid_to_str(value) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [convert_objectid_to_str(item) for item in data]
+    return data
+
+def food_doc(i):
+    return {
+        "_id": ObjectId(),
+        "cityName": "Varanasi",
+        "foodPlace": f"Kashi Chat Bhandar {i}",
+        "category": "Street Food",
+        "address": "D 37/49, Godowlia, Varanasi",
+        "lat": 25.3109, "lon": 83.0107,
+        "menuSpecial": "Tamatar chaat, palak patta chaat, gol gappe",
+        "images": [f"https://cdn.example.com/foods/{i}/{n}.jpg" for n in range(6)],
+        "reviews": [
+            {"_id": ObjectId(), "userId": ObjectId(), "rating": 4, "comment": "Crisp and tangy", "createdAt": "2024-01-02"}
+            for _ in range(8)
+        ],
+        "taste": 4.5, "hygiene": 3.8, "service": 4.0, "valueForMoney": 4.6,
+        "avgRating": 4.2, "compositeScore": 4.24,
+    }
+
+def old_path(docs):
+    return json.dumps({"success": True, "data": convert_objectid_to_str(docs)}).encode("utf-8")
+
+def new_path(docs):
+    return dumps({"success": True, "data": docs})
+
+def bench(label, fn, docs, iterations):
+    fn(docs)  # warm up
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        fn(docs)
+    per_call_ms = (time.perf_counter() - start_time) / iterations * 1000
+    print(f"{label:<30} {per_call_ms:8.3f} ms/response")
+    return per_call_ms
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    docs = [food_doc(i) for i in range(count)]
+    print(f"{count} food documents, {len(new_path(docs)) / 1024:.1f} KiB per response")
+
+    before = bench("convert + json.dumps", old_path, docs, iterations)
+    after = bench("utils.serialization.dumps", new_path, docs, iterations)
+    print(f"speedup: {before / after:.2f}x")
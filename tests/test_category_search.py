@@ -0,0 +1,129 @@
+import asyncio
+
+import httpx
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from pymongo import DESCENDING
+
+from yescity_recommendation_ai.api.dependencies import get_recommendation_service
+from yescity_recommendation_ai.api.routes import router
+from yescity_recommendation_ai.database.search_specs import resolve_category
+from yescity_recommendation_ai.services import category_search_service as category_search_module
+from yescity_recommendation_ai.services.category_search_service import CategorySearchService
+from yescity_recommendation_ai.services.recommendation_service import RecommendationService
+from yescity_recommendation_ai.services.response_cache import ResponseCache
+from yescity_recommendation_ai.services.single_flight import SingleFlight
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self):
+        return self.docs
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.finds = []
+
+    def find(self, query_filter, projection=None, **kwargs):
+        self.finds.append((query_filter, projection, kwargs))
+        return FakeCursor(self.docs[:kwargs.get("limit") or None])
+
+def test_foods_filters_map_onto_an_indexed_ranked_query():
+    query_filter, collation, sort = CategorySearchService().build_query(
+        "foods", "Agra", {"category": "Sweets", "minRating": "4", "vegOnly": "true"}
+    )
+    assert query_filter["cityName"] == "Agra"
+    assert query_filter["category"] == "Sweets"
+    assert query_filter["avgRating"] == {"$gte": 4.0}
+    assert query_filter["vegOrNonVeg"] == "Veg"
+    assert collation is not None
+    assert sort == [("compositeScore", DESCENDING)]
+
+def test_unknown_collection_and_filters_are_rejected():
+    service = CategorySearchService()
+    with pytest.raises(ValueError):
+        service.build_query("restaurants", "Agra")
+    with pytest.raises(ValueError, match="Supported: category"):
+        service.build_query("shopping", "Agra", {"minRating": "4"})
+    with pytest.raises(ValueError, match="Supported: none"):
+        service.build_query("cityinfos", "Agra", {"category": "x"})
+    with pytest.raises(ValueError, match="must be a number"):
+        service.build_query("foods", "Agra", {"minRating": "high"})
+
+def test_search_is_one_limited_query(monkeypatch):
+    docs = [{"_id": ObjectId(), "foodPlace": f"Place {i}", "compositeScore": 5 - i} for i in range(5)]
+    collection = FakeCollection(docs)
+    monkeypatch.setattr(category_search_module.mongodb_client, "get_async_collection", lambda name: collection)
+
+    result = asyncio.run(CategorySearchService().search("foods", "Agra", {"category": "Sweets"}, limit=3))
+
+    assert len(collection.finds) == 1
+    assert collection.finds[0][2]["limit"] == 3
+    assert [rec["name"] for rec in result["recommendations"]] == ["Place 0", "Place 1", "Place 2"]
+    assert result["full_data"][0]["_id"] == docs[0]["_id"]
+    assert "query" in result["stage_timings"]
+
+class RecordingCrewManager:
+    def __init__(self):
+        self.contexts = []
+
+    async def aprocess_query(self, user_query, context):
+        self.contexts.append(context)
+        return {"success": True, "category": context.classification.category, "recommendations": []}
+
+class RerankService(RecommendationService):
+    def __init__(self):
+        super().__init__(cache=ResponseCache(), flights=SingleFlight())
+        self.fake_crew = RecordingCrewManager()
+
+    @property
+    def crew_manager(self):
+        return self.fake_crew
+
+def test_rerank_path_skips_the_classifier():
+    service = RerankService()
+    result = asyncio.run(service.aget_recommendation_by_category("foods", "Agra", category="Sweets", budget=""))
+
+    classification = service.fake_crew.contexts[0].classification
+    assert classification.tier == "structured"
+    assert classification.parameters == {"category": "Sweets"}
+    assert "classify" not in result["stage_timings"]
+
+def test_category_aliases_resolve_to_collections():
+    assert resolve_category("foods") == "foods"
+    assert resolve_category(" Food ") == "foods"
+    assert resolve_category("accommodation") == "accommodations"
+    assert resolve_category("Places  to visit") == "placestovisits"
+    with pytest.raises(ValueError, match="Unknown category"):
+        resolve_category("nightlife")
+
+def post_category_search(service, payload):
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.dependency_overrides[get_recommendation_service] = lambda: service
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/api/v1/category-search", json=payload)
+
+    return asyncio.run(scenario())
+
+def test_rerank_rejects_unknown_categories_before_the_crew():
+    service = RerankService()
+    response = post_category_search(service, {"category": "nightlife", "city": "Agra", "rerank": True})
+
+    assert response.status_code == 400
+    assert "Unknown category" in response.json()["detail"]
+    assert service.fake_crew.contexts == []
+
+def test_rerank_accepts_category_aliases():
+    service = RerankService()
+    response = post_category_search(service, {"category": "food", "city": "Agra", "rerank": True})
+
+    assert response.status_code == 200
+    assert response.json()["category"] == "foods"
+    assert service.fake_crew.contexts[0].classification.category == "foods"
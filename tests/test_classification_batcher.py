@@ -0,0 +1,72 @@
+import asyncio
+
+from yescity_recommendation_ai.models.user_query import QueryCategory
+from yescity_recommendation_ai.services.classification_batcher import ClassificationBatcher
+
+class RecordingClassifier:
+    """Stands in for OllamaQueryClassifier and records each classify_many batch."""
+
+    def __init__(self):
+        self.batches = []
+
+    def classify_without_llm(self, user_query):
+        if "varanasi" in user_query:
+            return QueryCategory(category="foods", cityName="Varanasi", tier="fast_path")
+        return None
+
+    async def aclassify_many(self, queries, skip_lookup=False):
+        assert skip_lookup
+        self.batches.append(list(queries))
+        return [QueryCategory(category="cityinfos", cityName=query, tier="llm") for query in queries]
+
+def test_concurrent_calls_share_one_batch():
+    classifier = RecordingClassifier()
+    batcher = ClassificationBatcher(classifier, window_ms=20, max_batch_size=10)
+
+    async def run():
+        return await asyncio.gather(*(batcher.classify(f"city {i}") for i in range(5)))
+
+    results = asyncio.run(run())
+    assert [r.cityName for r in results] == [f"city {i}" for i in range(5)]
+    assert len(classifier.batches) == 1
+
+def test_full_batch_flushes_early_and_fast_path_skips_queue():
+    classifier = RecordingClassifier()
+    batcher = ClassificationBatcher(classifier, window_ms=1000, max_batch_size=2)
+
+    async def run():
+        return await batcher.classify_many(["a", "street food in varanasi", "b", "c", "d"])
+
+    results = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert results[1].tier == "fast_path"
+    assert classifier.batches == [["a", "b"], ["c", "d"]]
+
+def test_shutdown_waits_for_queued_and_running_batches():
+    classifier = RecordingClassifier()
+    batcher = ClassificationBatcher(classifier, window_ms=1000, max_batch_size=10)
+
+    async def run():
+        pending = asyncio.ensure_future(batcher.classify("a"))
+        await asyncio.sleep(0)
+        await batcher.shutdown()
+        assert not batcher._tasks
+        return pending.result()
+
+    assert asyncio.run(asyncio.wait_for(run(), timeout=5)).cityName == "a"
+    assert classifier.batches == [["a"]]
+
+def test_llm_bound_query_is_looked_up_in_the_cache_once():
+    from yescity_recommendation_ai.services.classification_cache import ClassificationCache
+    from yescity_recommendation_ai.services.query_classifier import OllamaQueryClassifier
+
+    classifier = OllamaQueryClassifier(cache=ClassificationCache())
+    classifier.fast_path_enabled = False
+
+    async def fake_llm(user_query):
+        return QueryCategory(category="cityinfos", tier="llm")
+
+    classifier._aclassify_with_llm = fake_llm
+    batcher = ClassificationBatcher(classifier, window_ms=1)
+
+    asyncio.run(batcher.classify("tell me something"))
+    assert classifier.cache.stats()["misses"] == 1
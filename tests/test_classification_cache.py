@@ -0,0 +1,37 @@
+from yescity_recommendation_ai.models.user_query import QueryCategory
+from yescity_recommendation_ai.services.classification_cache import ClassificationCache
+
+street_food = QueryCategory(category="foods", cityName="Varanasi", parameters={"category": "street food"}, confidence=0.9)
+
+def test_trivial_variations_share_an_entry():
+    cache = ClassificationCache()
+    cache.set("Street food in varanasi", street_food)
+    hit = cache.get("  street FOOD in Banaras!! ")
+    assert hit.category == "foods"
+    assert hit.tier == "cache"
+    assert cache.stats()["hits"] == 1
+
+def test_lru_eviction_and_ttl():
+    cache = ClassificationCache(max_size=1, ttl_seconds=0)
+    cache.set("hotels in goa", street_food)
+    assert cache.get("hotels in goa") is None
+    cache = ClassificationCache(max_size=1)
+    cache.set("hotels in goa", street_food)
+    cache.set("hotels in agra", street_food)
+    assert cache.get("hotels in goa") is None
+    assert cache.stats()["evictions"] == 1
+
+def test_namespace_change_invalidates():
+    cache = ClassificationCache()
+    cache.ensure_namespace("v1")
+    cache.set("street food in varanasi", street_food)
+    cache.ensure_namespace("v2")
+    assert cache.get("street food in varanasi") is None
+
+def test_semantic_lookup():
+    vectors = {"street food in varanasi": [1.0, 0.0], "street eats in varanasi": [0.99, 0.05]}
+    cache = ClassificationCache(embed_fn=lambda text: vectors.get(text, [0.0, 1.0]))
+    cache.set("street food in varanasi", street_food)
+    assert cache.get("street eats in Varanasi").cityName == "Varanasi"
+    assert cache.get("hotels in goa") is None
+    assert cache.stats()["semantic_hits"] == 1
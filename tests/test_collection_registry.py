@@ -0,0 +1,57 @@
+import time
+
+from yescity_recommendation_ai.database.collection_registry import CollectionRegistry
+
+class FakeCollection:
+    def __init__(self, count):
+        self.count = count
+
+    def aggregate(self, pipeline):
+        return iter([{"storageStats": {"count": self.count, "size": self.count * 100, "nindexes": 2}}])
+
+    def estimated_document_count(self):
+        return self.count
+
+class FakeDatabase:
+    def __init__(self, collections):
+        self.collections = collections
+        self.list_calls = 0
+
+    def list_collections(self):
+        self.list_calls += 1
+        return [{"name": name, "type": "collection"} for name in self.collections]
+
+    def __getitem__(self, name):
+        return FakeCollection(self.collections[name])
+
+def test_unloaded_registry_does_not_know():
+    registry = CollectionRegistry(refresh_interval=0)
+    assert registry.has_collection("foods") is None
+
+def test_lookups_are_served_from_memory():
+    db = FakeDatabase({"foods": 3})
+    registry = CollectionRegistry(refresh_interval=0)
+    registry.refresh(db)
+
+    for _ in range(10):
+        assert registry.has_collection("foods") is True
+        assert registry.has_collection("missing") is False
+    assert db.list_calls == 1
+    assert registry.snapshot()["collections"]["foods"]["count"] == 3
+
+def test_background_refresh_picks_up_new_collections():
+    db = FakeDatabase({"foods": 3})
+    registry = CollectionRegistry(refresh_interval=0.01)
+    registry.refresh(db)
+    db.collections["shopping"] = 1
+
+    registry.start(db)
+    try:
+        deadline = time.time() + 2
+        while not registry.has_collection("shopping") and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        registry.stop()
+
+    assert registry.has_collection("shopping") is True
+    assert registry.refreshes >= 2
@@ -0,0 +1,155 @@
+# Concurrent requests must not queue behind a slow /recommend.
+# The in-process tests use a fake LLM and crew; the load test at the bottom
+# needs a running API (BASE_URL, default http://localhost:8000) with MongoDB and Ollama.
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from yescity_recommendation_ai.api.dependencies import get_classification_batcher, get_recommendation_service
+from yescity_recommendation_ai.api.routes import router
+from yescity_recommendation_ai.crew.crew_scheduler import CrewScheduler
+from yescity_recommendation_ai.services.classification_batcher import ClassificationBatcher
+from yescity_recommendation_ai.services.classification_cache import ClassificationCache
+from yescity_recommendation_ai.services.query_classifier import OllamaQueryClassifier
+from yescity_recommendation_ai.services.recommendation_service import RecommendationService
+from yescity_recommendation_ai.services.response_cache import ResponseCache
+from yescity_recommendation_ai.services.single_flight import SingleFlight
+
+LLM_SECONDS = 0.3
+CREW_SECONDS = 0.3
+
+class FakeLLM:
+    """Stands in for the Ollama client; only the async call may be used on the event loop."""
+    model = "fake"
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(LLM_SECONDS)
+        return '{"category": "foods", "cityName": "Varanasi", "parameters": {}, "confidence": 0.9}'
+
+    def invoke(self, prompt):
+        raise AssertionError("blocking LLM call")
+
+class FakeCrewManager:
+    """Runs a blocking fake crew on a real crew scheduler."""
+
+    def __init__(self):
+        self.scheduler = CrewScheduler(max_workers=2, max_queue=4)
+        self.runs = 0
+
+    def process_query(self, user_query, context):
+        self.runs += 1
+        time.sleep(CREW_SECONDS)
+        return {"success": True, "category": "foods", "city": "Varanasi", "recommendations": []}
+
+    async def aprocess_query(self, user_query, context):
+        return await self.scheduler.submit(
+            context.classification.category, self.process_query, user_query, context
+        )
+
+class FakeCrewService(RecommendationService):
+    def __init__(self):
+        super().__init__(cache=ResponseCache(), flights=SingleFlight())
+        self.fake_crew = FakeCrewManager()
+
+    @property
+    def crew_manager(self):
+        return self.fake_crew
+
+def build_app():
+    classifier = OllamaQueryClassifier(cache=ClassificationCache())
+    classifier.fast_path_enabled = False
+    classifier._llm = FakeLLM()
+    service = FakeCrewService()
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.dependency_overrides[get_classification_batcher] = lambda: ClassificationBatcher(classifier, window_ms=1)
+    app.dependency_overrides[get_recommendation_service] = lambda: service
+    return app, service
+
+def test_requests_are_served_while_recommend_waits_on_the_llm_and_crew():
+    app, service = build_app()
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            start_time = time.perf_counter()
+            recommend = asyncio.create_task(
+                client.post("/api/v1/recommend", json={"query": "Find street food in Varanasi"})
+            )
+            await asyncio.sleep(0.05)
+            metrics = await asyncio.gather(*(client.get("/api/v1/metrics/crews") for _ in range(20)))
+            metrics_done = time.perf_counter() - start_time
+            response = await recommend
+            return response, metrics, metrics_done, time.perf_counter() - start_time
+
+    response, metrics, metrics_done, recommend_done = asyncio.run(scenario())
+
+    assert response.status_code == 200
+    assert response.json()["success"] is True
+    assert service.fake_crew.runs == 1
+    assert all(result.status_code == 200 for result in metrics)
+    assert recommend_done >= LLM_SECONDS + CREW_SECONDS
+    # Every other request finished while classification and the crew were still running
+    assert metrics_done < LLM_SECONDS
+
+BASE_URL = os.getenv("BASE_URL", "http://localhost:8000")
+FOODS_REQUESTS = int(os.getenv("LOAD_TEST_FOODS_REQUESTS", "50"))
+
+async def _timed_get(client, path, **params):
+    start_time = time.perf_counter()
+    response = await client.get(path, params=params)
+    return response.status_code, time.perf_counter() - start_time
+
+async def run_load_test():
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=300) as client:
+        # Start a slow crew run, give it a moment to reach the crew stage
+        start_time = time.perf_counter()
+        recommend = asyncio.create_task(
+            client.post("/api/v1/recommend", json={"query": "Find street food in Varanasi"})
+        )
+        await asyncio.sleep(0.5)
+
+        foods = await asyncio.gather(*(
+            _timed_get(client, "/api/v1/foods", city="Varanasi", limit=10)
+            for _ in range(FOODS_REQUESTS)
+        ))
+        foods_done = time.perf_counter() - start_time
+
+        recommend_response = await recommend
+        recommend_done = time.perf_counter() - start_time
+
+    latencies = sorted(latency for _, latency in foods)
+    return {
+        "recommend_status": recommend_response.status_code,
+        "recommend_seconds": round(recommend_done, 3),
+        "foods_ok": sum(1 for status, _ in foods if status == 200),
+        "foods_all_done_seconds": round(foods_done, 3),
+        "foods_p50": round(statistics.median(latencies), 3),
+        "foods_p95": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+    }
+
+def _server_available() -> bool:
+    try:
+        return httpx.get(f"{BASE_URL}/health", timeout=2).status_code == 200
+    except httpx.HTTPError:
+        return False
+
+def test_foods_not_serialized_behind_recommend():
+    if not _server_available():
+        pytest.skip(f"API not running at {BASE_URL}")
+
+    report = asyncio.run(run_load_test())
+    print(report)
+
+    assert report["foods_ok"] == FOODS_REQUESTS
+    # Every /foods call finished while the crew was still running
+    assert report["foods_all_done_seconds"] < report["recommend_seconds"]
+
+if __name__ == "__main__":
+    print(asyncio.run(run_load_test()))
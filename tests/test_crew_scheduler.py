@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+import pytest
+
+from yescity_recommendation_ai.crew.crew_scheduler import CrewScheduler, CrewQueueFullError
+
+def slow_crew(seconds):
+    time.sleep(seconds)
+    return seconds
+
+def test_rejects_when_workers_and_queue_are_full():
+    scheduler = CrewScheduler(max_workers=1, max_queue=1, category_limits={})
+
+    async def run():
+        return await asyncio.gather(
+            *(scheduler.submit("foods", slow_crew, 0.1) for _ in range(3)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    rejected = [r for r in results if isinstance(r, CrewQueueFullError)]
+    assert len(rejected) == 1
+    assert rejected[0].retry_after >= 1
+    stats = scheduler.stats()
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+    assert stats["queue_wait"]["max"] >= 0.05
+
+def test_category_limit_serializes_one_category():
+    scheduler = CrewScheduler(max_workers=4, max_queue=4, category_limits={"foods": 1})
+
+    async def run():
+        start_time = time.perf_counter()
+        await asyncio.gather(*(scheduler.submit("foods", slow_crew, 0.1) for _ in range(2)))
+        return time.perf_counter() - start_time
+
+    assert asyncio.run(run()) >= 0.2
+
+def test_errors_propagate_to_caller():
+    scheduler = CrewScheduler(max_workers=1, max_queue=0, category_limits={})
+
+    with pytest.raises(ZeroDivisionError):
+        asyncio.run(scheduler.submit("foods", lambda: 1 / 0))
+    assert scheduler.stats()["failed"] == 1
@@ -0,0 +1,145 @@
+import time
+from types import SimpleNamespace
+
+from yescity_recommendation_ai.database.derived_fields import DERIVED_FIELDS, DerivedFieldsMaintainer
+from yescity_recommendation_ai.database.geo import GEO_COLLECTIONS, location_fields_expression, stale_location_filter
+from yescity_recommendation_ai.database.ratings import (
+    compute_rating_fields, rating_fields_expression, stale_rating_filter
+)
+
+RATINGS, LOCATION = DERIVED_FIELDS
+RESCORE = [{"$set": rating_fields_expression()}]
+
+class FakeFoods:
+    """Applies the rating pipeline update with its Python mirror, compute_rating_fields."""
+
+    def __init__(self, docs):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.update_manys = []
+        self.stale = 0
+
+    def update_one(self, query_filter, pipeline):
+        assert pipeline == RESCORE
+        doc = self.docs[query_filter["_id"]]
+        doc.update(compute_rating_fields(doc))
+
+    def update_many(self, query_filter, pipeline):
+        self.update_manys.append((query_filter, pipeline))
+        return SimpleNamespace(modified_count=self.stale)
+
+    def count_documents(self, query_filter):
+        assert query_filter == stale_rating_filter()
+        return self.stale
+
+class FakeStream:
+    def __init__(self, changes):
+        self.changes = list(changes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def try_next(self):
+        return self.changes.pop(0) if self.changes else None
+
+class RecordingCollection:
+    def __init__(self):
+        self.updates = []
+
+    def update_one(self, query_filter, pipeline):
+        self.updates.append((query_filter, pipeline))
+
+    def update_many(self, query_filter, pipeline):
+        self.updates.append((query_filter, pipeline))
+        return SimpleNamespace(modified_count=0)
+
+class FakeDatabase(dict):
+    def __init__(self, foods, changes=()):
+        super().__init__(foods=foods)
+        self.changes = changes
+
+    def __missing__(self, name):
+        collection = self[name] = RecordingCollection()
+        return collection
+
+    def watch(self, pipeline, **kwargs):
+        return FakeStream(self.changes)
+
+def update_event(document_id, **updated_fields):
+    return {
+        "operationType": "update",
+        "ns": {"db": "YesCity3", "coll": "foods"},
+        "documentKey": {"_id": document_id},
+        "updateDescription": {"updatedFields": updated_fields, "removedFields": []},
+    }
+
+def test_ensure_rewrites_stale_scores():
+    foods = FakeFoods([])
+    foods.stale = 3
+    result = DerivedFieldsMaintainer([RATINGS], backfill=True).ensure(FakeDatabase(foods))
+
+    assert result == {"avgRating/compositeScore": {"foods": 3}}
+    assert foods.update_manys == [(stale_rating_filter(), RESCORE)]
+
+def test_ensure_only_reports_when_backfill_is_disabled(capsys):
+    foods = FakeFoods([])
+    foods.stale = 2
+    result = DerivedFieldsMaintainer([RATINGS], backfill=False).ensure(FakeDatabase(foods))
+
+    assert result == {"avgRating/compositeScore": {"foods": 2}}
+    assert foods.update_manys == []
+    assert "backfill-ratings" in capsys.readouterr().out
+
+def test_only_writes_to_source_fields_make_derived_fields_stale():
+    maintainer = DerivedFieldsMaintainer()
+    assert maintainer.affected(update_event(1, taste=2)) == [RATINGS]
+    assert maintainer.affected(update_event(1, **{"hygiene.score": 3})) == [RATINGS]
+    assert maintainer.affected(update_event(1, lat=27.1)) == [LOCATION]
+    insert = {"operationType": "insert", "ns": {"coll": "foods"}, "documentKey": {"_id": 1}}
+    assert maintainer.affected(insert) == [RATINGS, LOCATION]
+    # The maintainer's own rewrites and unrelated edits are ignored
+    assert not maintainer.affected(update_event(1, avgRating=3.0, compositeScore=3.0))
+    assert not maintainer.affected(update_event(1, location={"type": "Point"}))
+    assert not maintainer.affected(update_event(1, phone="123"))
+    assert not maintainer.affected({**update_event(1, taste=2), "ns": {"coll": "shopping"}})
+
+def test_new_places_get_a_location_point():
+    db = FakeDatabase(FakeFoods([]))
+    shopping_insert = {"operationType": "insert", "ns": {"coll": "shopping"}, "documentKey": {"_id": 7}}
+    DerivedFieldsMaintainer().apply(db, shopping_insert)
+
+    assert db["shopping"].updates == [({"_id": 7}, [{"$set": location_fields_expression()}])]
+
+def test_ensure_backfills_locations_in_every_geo_collection():
+    db = FakeDatabase(FakeFoods([]))
+    del db["foods"]
+    DerivedFieldsMaintainer([LOCATION], backfill=True).ensure(db)
+
+    assert sorted(db) == sorted(GEO_COLLECTIONS)
+    assert all(
+        collection.updates == [(stale_location_filter(), [{"$set": location_fields_expression()}])]
+        for collection in db.values()
+    )
+
+def test_editing_a_sub_rating_rewrites_the_stored_score():
+    place = {"_id": 1, "foodPlace": "Pinch of Spice", "taste": 5, "hygiene": 5}
+    place.update(compute_rating_fields(place))
+    foods = FakeFoods([place])
+
+    # An admin lowers the taste rating directly in MongoDB
+    place["taste"] = 1
+    db = FakeDatabase(foods, changes=[update_event(1, taste=1)])
+    maintainer = DerivedFieldsMaintainer([RATINGS], use_change_streams=True, backfill=True)
+    maintainer.start(db)
+    try:
+        deadline = time.time() + 2
+        while maintainer.rewrites < 1 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        maintainer.stop()
+
+    assert maintainer.mode == "change_stream"
+    assert place["avgRating"] == 3.0
+    assert place["compositeScore"] == compute_rating_fields({"taste": 1, "hygiene": 5})["compositeScore"]
@@ -0,0 +1,73 @@
+import asyncio
+import gzip
+import json
+
+import httpx
+from bson import ObjectId
+from fastapi import FastAPI
+
+from yescity_recommendation_ai.api.routes import router
+from yescity_recommendation_ai.services.export_service import ExportService
+
+async def documents(count):
+    for i in range(count):
+        yield {"_id": ObjectId(), "foodPlace": f"Place {i}", "images": ["a.jpg"]}
+
+async def collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+def test_ndjson_converts_object_ids_per_document():
+    service = ExportService()
+    service.chunk_size = 64
+    output = asyncio.run(collect(service.ndjson_chunks(documents(5))))
+
+    rows = [json.loads(line) for line in output.decode("utf-8").splitlines()]
+    assert len(rows) == 5
+    assert all(isinstance(row["_id"], str) for row in rows)
+
+def test_csv_uses_requested_fields_and_json_encodes_nested_values():
+    service = ExportService()
+    output = asyncio.run(collect(service.csv_chunks(documents(2), ["foodPlace", "images"])))
+
+    lines = output.decode("utf-8").splitlines()
+    assert lines[0] == "foodPlace,images"
+    assert lines[1] == 'Place 0,"[""a.jpg""]"'
+
+def test_gzip_stream_decompresses_to_the_original():
+    service = ExportService()
+    plain = asyncio.run(collect(service.ndjson_chunks(documents(100))))
+
+    service.chunk_size = 128
+    compressed = asyncio.run(collect(service.gzip_chunks(service.ndjson_chunks(documents(100)))))
+    assert len(gzip.decompress(compressed).splitlines()) == len(plain.splitlines())
+
+def test_accepts_gzip_honours_q_values():
+    assert ExportService.accepts_gzip("gzip, deflate, br")
+    assert ExportService.accepts_gzip("br;q=1.0, GZIP;q=0.5")
+    assert ExportService.accepts_gzip("*")
+    assert not ExportService.accepts_gzip("gzip;q=0")
+    assert not ExportService.accepts_gzip("gzip;q=0.0, *;q=1")
+    assert not ExportService.accepts_gzip("identity")
+    assert not ExportService.accepts_gzip("")
+
+def test_csv_keeps_fields_missing_from_the_first_document():
+    async def mixed():
+        yield {"foodPlace": "Pinch of Spice"}
+        yield {"foodPlace": "Deviram", "phone": "0562"}
+
+    output = asyncio.run(collect(ExportService().csv_chunks(mixed(), ["foodPlace", "phone"])))
+    assert output.decode("utf-8").splitlines() == ["foodPlace,phone", "Pinch of Spice,", "Deviram,0562"]
+
+def test_csv_export_without_declared_fields_is_rejected():
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+
+    async def export(path):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+
+    # shopping declares no full view, so there is no column list to use
+    response = asyncio.run(export("/api/v1/export/shopping?format=csv"))
+    assert response.status_code == 400
+    assert "fields=" in response.json()["detail"]["error"]
@@ -0,0 +1,153 @@
+import time
+
+from pymongo.errors import OperationFailure
+
+from yescity_recommendation_ai.database.collection_registry import DATA_COLLECTIONS
+from yescity_recommendation_ai.database.facets import FacetsCache, build_facets
+
+DOCS = {
+    "foods": [
+        {"cityName": "Varanasi", "category": "Street Food"},
+        {"cityName": "Varanasi", "category": "Sweets"},
+        {"cityName": "Agra", "category": "Sweets"},
+    ],
+    "shopping": [
+        {"cityName": "Varanasi", "category": "Silk"},
+        {"cityName": "Jaipur", "category": "Handicrafts"},
+    ],
+    "cityinfos": [{"cityName": "Agra"}, {"cityName": ""}],
+}
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.aggregations = 0
+
+    def aggregate(self, pipeline):
+        self.aggregations += 1
+        groups = {}
+        for doc in self.docs:
+            key = (doc.get("cityName"), doc.get("category"))
+            groups[key] = groups.get(key, 0) + 1
+        return iter([{"_id": {"city": city, "category": category}, "count": count}
+                     for (city, category), count in groups.items()])
+
+class FakeDatabase:
+    def __init__(self, docs):
+        self.collections = {name: FakeCollection(docs.get(name, [])) for name in DATA_COLLECTIONS}
+
+    def __getitem__(self, name):
+        return self.collections[name]
+
+def test_listings_cover_all_collections_with_counts():
+    cache = FacetsCache(refresh_interval=0)
+    cache.refresh(FakeDatabase(DOCS))
+
+    assert cache.cities()["names"] == ["Agra", "Jaipur", "Varanasi"]
+    assert cache.cities()["counts"] == {"Agra": 2, "Jaipur": 1, "Varanasi": 3}
+    assert cache.cities("foods")["names"] == ["Agra", "Varanasi"]
+    assert cache.categories("foods")["counts"] == {"Street Food": 1, "Sweets": 2}
+    assert cache.categories(city="varanasi")["names"] == ["Silk", "Street Food", "Sweets"]
+    assert cache.categories("shopping", "Jaipur")["names"] == ["Handicrafts"]
+    assert cache.city_collections("Varanasi") == {"foods": 2, "shopping": 1}
+
+def test_listings_are_not_capped():
+    rows = [{"collection": "foods", "city": f"City {i:03d}", "category": None, "count": 1} for i in range(120)]
+    assert len(build_facets(rows)["cities"][None]["names"]) == 120
+
+def test_lookups_do_not_query_the_database():
+    db = FakeDatabase(DOCS)
+    cache = FacetsCache(refresh_interval=0)
+    cache.refresh(db)
+
+    for _ in range(10):
+        cache.cities()
+        cache.categories("foods", "Agra")
+    assert db.collections["foods"].aggregations == 1
+    assert cache.cities("hiddengems") == {"names": [], "counts": {}}
+
+def test_interval_refresh_picks_up_new_cities():
+    db = FakeDatabase(DOCS)
+    cache = FacetsCache(refresh_interval=0.01, use_change_streams=False)
+    cache.refresh(db)
+    db.collections["foods"].docs.append({"cityName": "Delhi", "category": "Chaat"})
+
+    cache.start(db)
+    try:
+        deadline = time.time() + 2
+        while "Delhi" not in cache.cities()["counts"] and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        cache.stop()
+
+    assert "Delhi" in cache.cities()["counts"]
+    assert cache.snapshot()["mode"] == "interval"
+
+def test_change_stream_falls_back_to_interval_without_a_replica_set():
+    class StandaloneDatabase(FakeDatabase):
+        def watch(self, *args, **kwargs):
+            raise OperationFailure("The $changeStream stage is only supported on replica sets")
+
+    db = StandaloneDatabase(DOCS)
+    cache = FacetsCache(refresh_interval=0.01, use_change_streams=True)
+    cache.start(db)
+    try:
+        deadline = time.time() + 2
+        while not cache.loaded and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        cache.stop()
+
+    assert cache.loaded
+    assert cache.mode == "interval"
+    assert "replica sets" in cache.last_error
+
+def test_listeners_hear_about_changed_collections_only():
+    db = FakeDatabase(DOCS)
+    cache = FacetsCache(refresh_interval=0)
+    changed = []
+    cache.add_change_listener(changed.append)
+
+    cache.refresh(db)
+    cache.refresh(db)
+    assert changed == []
+
+    db.collections["shopping"].docs.append({"cityName": "Goa", "category": "Spices"})
+    cache.refresh(db)
+    assert changed == ["shopping"]
+
+def test_change_stream_notifies_each_collection_once():
+    class FakeStream:
+        def __init__(self, changes):
+            self.changes = list(changes)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def try_next(self):
+            return self.changes.pop(0) if self.changes else None
+
+    class ReplicaSetDatabase(FakeDatabase):
+        def watch(self, *args, **kwargs):
+            # A shopping insert (counts move) and a foods update (counts stay the same)
+            self.collections["shopping"].docs.append({"cityName": "Goa", "category": "Spices"})
+            return FakeStream([{"ns": {"coll": "shopping"}}, {"ns": {"coll": "foods"}}])
+
+    db = ReplicaSetDatabase(DOCS)
+    cache = FacetsCache(refresh_interval=0, use_change_streams=True, debounce_seconds=0)
+    cache.refresh(db)
+    changed = []
+    cache.add_change_listener(changed.append)
+
+    cache.start(db)
+    try:
+        deadline = time.time() + 2
+        while cache.refreshes < 3 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        cache.stop()
+
+    assert sorted(changed) == ["foods", "shopping"]
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+from yescity_recommendation_ai.services.fast_classifier import FastPathClassifier
+
+classifier = FastPathClassifier(cities=["Agra", "Delhi", "New Delhi", "Varanasi", "Goa"])
+
+def test_confident_match_with_city():
+    result = classifier.classify("Street food in Varanasi!")
+    assert result.category == "foods"
+    assert result.cityName == "Varanasi"
+    assert result.tier == "fast_path"
+    assert result.confidence >= 0.85
+
+def test_longest_phrase_wins():
+    result = classifier.classify("places to visit in New Delhi")
+    assert result.category == "placestovisits"
+    assert result.cityName == "New Delhi"
+
+def test_keywords_match_whole_words_only():
+    assert classifier.classify("doughnuts in Agra") is None
+
+def test_ambiguous_query_is_below_threshold():
+    result = classifier.classify("street food market in Goa")
+    assert result.confidence < 0.85
+
+def test_missing_city_is_below_threshold():
+    result = classifier.classify("best hotels")
+    assert result.category == "accommodations"
+    assert result.cityName is None
+    assert result.confidence < 0.85
+
+def test_first_use_on_the_event_loop_does_not_query_mongodb(monkeypatch):
+    lazy = FastPathClassifier()
+    loaded = threading.Event()
+    loader_threads = []
+
+    def load():
+        loader_threads.append(threading.current_thread())
+        loaded.set()
+
+    monkeypatch.setattr(lazy, "load_cities_from_database", load)
+
+    async def classify():
+        return lazy.classify("hotels in Agra")
+
+    result = asyncio.run(classify())
+    assert result.cityName == "Agra"
+    assert loaded.wait(5)
+    assert loader_threads[0] is not threading.main_thread()
+
+def test_aliases_resolve_to_the_stored_city_spelling():
+    stored = FastPathClassifier(cities=["Agra", "Bangalore", "Bengaluru", "Prayagraj"])
+    assert stored.find_city("cafes in Bengaluru") == "Bengaluru"
+    assert stored.find_city("cafes in Bangalore") == "Bengaluru"
+    assert stored.find_city("ghats of Allahabad") == "Prayagraj"
+    result = stored.classify("hotels in prayagraj")
+    assert result.cityName == "Prayagraj"
+    assert result.confidence >= 0.85
+
+def test_stored_cities_override_default_spellings(monkeypatch):
+    from yescity_recommendation_ai.database import mongodb_client as client_module
+
+    class FakeCollection:
+        def distinct(self, field):
+            return ["Bengaluru", "Agra"]
+
+    class FakeDb:
+        def __getitem__(self, name):
+            return FakeCollection()
+
+    monkeypatch.setattr(type(client_module.mongodb_client), "db", property(lambda self: FakeDb()))
+    gazetteer = FastPathClassifier()
+    gazetteer.load_cities_from_database()
+    assert gazetteer.find_city("street food in Bangalore") == "Bengaluru"
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+# Tests run offline; keep litellm from fetching its model cost map in the background
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from yescity_recommendation_ai.database.geo import (
+    DISTANCE_FIELD, GEO_COLLECTIONS, build_geo_near_pipeline, geo_point
+)
+from yescity_recommendation_ai.tools import nearby_spots_tools
+
+def test_geo_point_is_lon_lat():
+    assert geo_point(27.17, 78.04) == {"type": "Point", "coordinates": [78.04, 27.17]}
+
+def test_geo_point_rejects_out_of_range():
+    with pytest.raises(ValueError):
+        geo_point(91, 0)
+
+def test_pipeline_starts_with_geo_near_and_paginates():
+    pipeline = build_geo_near_pipeline(27.17, 78.04, 1500, {"category": "Sweets"}, skip=20, limit=10, projection={"foodPlace": 1})
+
+    geo_near = pipeline[0]["$geoNear"]
+    assert geo_near["maxDistance"] == 1500
+    assert geo_near["query"] == {"category": "Sweets"}
+    assert pipeline[1:] == [{"$skip": 20}, {"$limit": 10}, {"$project": {"foodPlace": 1, DISTANCE_FIELD: 1}}]
+
+def test_geo_collections_have_coordinates():
+    assert "foods" in GEO_COLLECTIONS
+    assert "cityinfos" not in GEO_COLLECTIONS
+
+def test_nearby_category_filter_uses_the_collation(monkeypatch):
+    class FakeCollection:
+        def aggregate(self, pipeline, collation=None):
+            self.pipeline, self.collation = pipeline, collation
+            return iter([])
+
+    collection = FakeCollection()
+    monkeypatch.setattr(nearby_spots_tools.mongodb_client, "get_collection", lambda name: collection)
+    nearby_spots_tools.nearby_spots_tool._run(27.17, 78.04, category=" Sweets ")
+
+    # Plain equality with the case-insensitive collation, like the other category filters
+    assert collection.pipeline[0]["$geoNear"]["query"] == {"category": "Sweets"}
+    assert collection.collation is not None
@@ -0,0 +1,74 @@
+from yescity_recommendation_ai.database.indexes import (
+    INDEX_REGISTRY, build_index_registry, ensure_indexes, is_prefix_of, uses_index
+)
+
+def test_every_index_builds_a_model():
+    for specs in INDEX_REGISTRY.values():
+        names = [spec.name for spec in specs]
+        assert len(names) == len(set(names))
+        for spec in specs:
+            assert spec.to_index_model().document["name"] == spec.name
+
+def test_ixscan_plan_uses_index():
+    explain_output = {"queryPlanner": {"winningPlan": {
+        "stage": "FETCH",
+        "inputStage": {"stage": "IXSCAN", "indexName": "cityName_ci"},
+    }}}
+    assert uses_index(explain_output)
+
+def test_collscan_plan_does_not_use_index():
+    explain_output = {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}
+    assert not uses_index(explain_output)
+
+def test_or_plan_with_one_collscan_branch_does_not_use_index():
+    explain_output = {"queryPlanner": {"winningPlan": {
+        "stage": "SUBPLAN",
+        "inputStage": {"stage": "OR", "inputStages": [{"stage": "IXSCAN"}, {"stage": "COLLSCAN"}]},
+    }}}
+    assert not uses_index(explain_output)
+
+def test_only_the_active_match_mode_is_indexed():
+    collation = build_index_registry("collation")
+    normalized = build_index_registry("normalized")
+    assert all(spec.collation for spec in collation["cityinfos"])
+    assert not any("_norm" in key for specs in collation.values() for spec in specs for key, _ in spec.keys)
+    assert not any(spec.name.endswith("_ci") for specs in normalized.values() for spec in specs)
+    assert [key for key, _ in normalized["foods"][0].keys] == ["cityName_norm", "flagship"]
+
+def test_no_index_is_a_prefix_of_another():
+    for mode in ("collation", "normalized"):
+        for specs in build_index_registry(mode).values():
+            assert not any(is_prefix_of(spec, other) for spec in specs for other in specs)
+    names = [spec.name for spec in build_index_registry("collation")["foods"]]
+    assert "cityName_ci" not in names and "cityName_category_ci" not in names
+
+class FakeCollection:
+    def __init__(self, names):
+        self.names = set(names)
+        self.dropped = []
+
+    def index_information(self):
+        return {name: {} for name in self.names}
+
+    def drop_index(self, name):
+        self.names.discard(name)
+        self.dropped.append(name)
+
+    def create_indexes(self, models):
+        self.names.update(model.document["name"] for model in models)
+
+class FakeDb(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection(["_id_"])
+        return self[name]
+
+def test_unregistered_indexes_are_reported_unless_dropping_is_enabled():
+    registry = {"cityinfos": build_index_registry("collation")["cityinfos"]}
+    db = FakeDb(cityinfos=FakeCollection(["_id_", "cityName_norm"]))
+
+    ensure_indexes(db, registry, drop_unregistered=False)
+    assert db["cityinfos"].dropped == []
+
+    ensure_indexes(db, registry, drop_unregistered=True)
+    assert db["cityinfos"].dropped == ["cityName_norm"]
+    assert db["cityinfos"].names == {"_id_", "cityName_ci"}
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from yescity_recommendation_ai.database import mongodb_client as mongodb_module
+
+@pytest.fixture
+def client(monkeypatch):
+    # Unreachable address: MongoClient connects in the background, so no test touches the network
+    monkeypatch.setenv("MONGODB_URI", "mongodb://127.0.0.1:1/?serverSelectionTimeoutMS=100")
+    client = mongodb_module.mongodb_client
+    yield client
+    client.close()
+
+def test_import_does_not_connect():
+    assert mongodb_module.mongodb_client._client is None
+
+def test_client_is_created_once_per_process(client):
+    first = client.db.client
+    assert client.db.client is first
+    assert client.pool_stats()["pid"] == os.getpid()
+
+def test_forked_process_gets_its_own_client(client, monkeypatch):
+    parent = client.db.client
+    monkeypatch.setattr(mongodb_module.os, "getpid", lambda: -1)
+
+    child = client.db.client
+    assert child is not parent
+    assert client.pool_stats()["pid"] == -1
+    parent.close()
+
+def test_missing_uri_fails_on_first_use(monkeypatch):
+    monkeypatch.delenv("MONGODB_URI", raising=False)
+    with pytest.raises(ValueError):
+        mongodb_module.mongodb_client.db
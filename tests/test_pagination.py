@@ -0,0 +1,29 @@
+import pytest
+from bson import ObjectId
+
+from yescity_recommendation_ai.database.pagination import CountCache, decode_cursor, encode_cursor
+
+FILTERS = {"city": "Agra", "category": None}
+
+def test_cursor_round_trip():
+    last_id = ObjectId()
+    assert decode_cursor(encode_cursor(last_id, FILTERS), FILTERS) == last_id
+
+def test_cursor_is_bound_to_its_filters():
+    cursor = encode_cursor(ObjectId(), FILTERS)
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, {"city": "Delhi", "category": None})
+
+def test_garbage_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", FILTERS)
+
+def test_count_cache_expires():
+    cache = CountCache(ttl_seconds=-1)
+    cache.set("foods", FILTERS, 42)
+    assert cache.get("foods", FILTERS) is None
+
+    cache = CountCache(ttl_seconds=60)
+    cache.set("foods", FILTERS, 42)
+    assert cache.get("foods", FILTERS) == 42
+    assert cache.get("foods", {"city": "Delhi", "category": None}) is None
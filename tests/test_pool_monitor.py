@@ -0,0 +1,26 @@
+from pymongo import monitoring
+
+from yescity_recommendation_ai.database.pool_monitor import PoolMetricsListener
+
+ADDRESS = ("localhost", 27017)
+
+def test_tracks_checked_out_connections():
+    listener = PoolMetricsListener("test")
+    for connection_id in (1, 2):
+        listener.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, connection_id))
+        listener.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, connection_id, 0.001))
+    listener.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+
+    stats = listener.stats()
+    assert stats["checked_out"] == 1
+    assert stats["max_checked_out"] == 2
+    assert stats["open_connections"] == 2
+    assert stats["checkout_wait_ms"]["max"] == 1.0
+
+def test_records_checkout_failures():
+    listener = PoolMetricsListener("test")
+    listener.connection_check_out_failed(monitoring.ConnectionCheckOutFailedEvent(ADDRESS, "timeout", 5.0))
+
+    stats = listener.stats()
+    assert stats["checkout_failures"] == {"timeout": 1}
+    assert stats["checkout_wait_ms"]["max"] == 5000.0
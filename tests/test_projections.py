@@ -0,0 +1,50 @@
+from yescity_recommendation_ai.database.projections import (
+    find_missing_name_fields, get_full_view_projection, get_llm_view_projection
+)
+from yescity_recommendation_ai.database.search_specs import LLM_VIEW_DESCRIPTION_CHARS
+
+HEAVY_FIELDS = ["reviews", "images", "address", "phone", "openTime", "locationLink"]
+
+def test_llm_view_leaves_out_heavy_fields():
+    for collection in ["foods", "accommodations", "cityinfos"]:
+        projection = get_llm_view_projection(collection)
+        assert projection["_id"] == 1
+        assert not set(HEAVY_FIELDS) & set(projection)
+
+def test_llm_view_truncates_description_server_side():
+    projection = get_llm_view_projection("shopping")
+    assert projection["name"] == 1
+    assert projection["description"]["$substrCP"][2] == LLM_VIEW_DESCRIPTION_CHARS
+
+def test_food_llm_view_fills_in_missing_scores():
+    projection = get_llm_view_projection("foods")
+    assert projection["foodPlace"] == 1
+    assert projection["avgRating"]["$ifNull"][0] == "$avgRating"
+    assert projection["compositeScore"]["$ifNull"][0] == "$compositeScore"
+
+def test_full_view_is_unchanged_for_hydration():
+    assert "images" in get_full_view_projection("foods")
+    assert get_llm_view_projection("foods") is not get_llm_view_projection("foods")
+
+class FakeNamedCollection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find_one(self, query_filter, projection=None):
+        for doc in self.docs:
+            if all(field in doc for field in query_filter):
+                return doc
+        return None
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        return FakeNamedCollection([])
+
+def test_collections_without_their_name_field_are_reported():
+    db = FakeDatabase({
+        "foods": FakeNamedCollection([{"foodPlace": "Pinch of Spice"}]),
+        "shopping": FakeNamedCollection([{"shopName": "Johari Bazaar"}]),
+        "activities": FakeNamedCollection([{"name": "River Rafting"}]),
+    })
+    # Empty collections are skipped
+    assert find_missing_name_fields(db) == ["shopping"]
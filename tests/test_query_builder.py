@@ -0,0 +1,39 @@
+from yescity_recommendation_ai.database.query_builder import (
+    CASE_INSENSITIVE_COLLATION, QueryBuilder, normalized_fields
+)
+
+def test_collation_mode_uses_equality_with_collation():
+    query_filter, collation = QueryBuilder("collation").equals("cityName", " Agra ").build()
+    assert query_filter == {"cityName": "Agra"}
+    assert collation is CASE_INSENSITIVE_COLLATION
+
+def test_normalized_mode_matches_stored_copy():
+    query_filter, collation = QueryBuilder("normalized").equals("cityName", "Bombay").build()
+    assert query_filter == {"cityName_norm": "mumbai"}
+    assert collation is None
+
+def test_prefix_escapes_user_input():
+    query_filter, _ = QueryBuilder("collation").prefix("category", "C++ (veg)").build()
+    assert query_filter["category"]["$regex"] == r"^C\+\+\ \(veg\)"
+
+def test_non_string_values_pass_through():
+    query_filter, collation = QueryBuilder().equals("flagship", True).build()
+    assert query_filter == {"flagship": True}
+    assert collation is None
+
+def test_normalized_fields_only_covers_strings():
+    doc = {"cityName": "Bengaluru", "category": "Street Food", "foodPlace": None}
+    assert normalized_fields(doc) == {"cityName_norm": "bangalore", "category_norm": "street food"}
+
+def test_contains_matches_words_inside_stored_values():
+    import re
+
+    query_filter, collation = QueryBuilder("collation").contains("category", "sweets").build()
+    pattern = re.compile(query_filter["category"]["$regex"], re.IGNORECASE)
+    assert pattern.search("Sweets & Desserts")
+    assert pattern.search("Indian Sweets")
+    assert not pattern.search("Sweetcorn Stall Food")
+    assert collation is None
+
+    query_filter, _ = QueryBuilder("normalized").contains("category", "Street-Food").build()
+    assert query_filter == {"category_norm": {"$regex": r"\bstreet\s+food"}}
@@ -0,0 +1,35 @@
+import pytest
+
+from yescity_recommendation_ai.database.ratings import (
+    COMPOSITE_WEIGHTS, compute_rating_fields, rating_fields_expression, update_ratings
+)
+
+def test_average_ignores_unrated_aspects():
+    scores = compute_rating_fields({"taste": 5, "hygiene": 3, "service": 0, "valueForMoney": None})
+    assert scores["avgRating"] == 4.0
+
+def test_composite_is_weighted_over_rated_aspects():
+    scores = compute_rating_fields({"taste": 5, "hygiene": 3})
+    expected = (5 * COMPOSITE_WEIGHTS["taste"] + 3 * COMPOSITE_WEIGHTS["hygiene"]) / (
+        COMPOSITE_WEIGHTS["taste"] + COMPOSITE_WEIGHTS["hygiene"]
+    )
+    assert scores["compositeScore"] == round(expected, 3)
+
+def test_unrated_place_has_no_scores():
+    assert compute_rating_fields({"foodPlace": "New Cafe"}) == {"avgRating": None, "compositeScore": None}
+
+class RecordingCollection:
+    def update_one(self, query_filter, update):
+        self.calls = (query_filter, update)
+
+def test_update_ratings_recomputes_scores_in_the_same_write():
+    collection = RecordingCollection()
+    update_ratings(collection, {"_id": 1}, {"taste": 4})
+
+    query_filter, pipeline = collection.calls
+    assert query_filter == {"_id": 1}
+    assert pipeline == [{"$set": {"taste": 4}}, {"$set": rating_fields_expression()}]
+
+def test_update_ratings_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        update_ratings(RecordingCollection(), {"_id": 1}, {"ambience": 5})
@@ -0,0 +1,150 @@
+import asyncio
+import time
+
+from yescity_recommendation_ai.models.user_query import QueryCategory, QueryContext
+from yescity_recommendation_ai.services.recommendation_service import RecommendationService
+from yescity_recommendation_ai.services.response_cache import (
+    InMemoryResponseBackend, ResponseCache, recommendation_key
+)
+
+def sweets_in_agra(**overrides):
+    fields = {"category": "foods", "cityName": "Agra", "parameters": {"category": "Sweets"}, "tier": "llm"}
+    fields.update(overrides)
+    return QueryCategory(**fields)
+
+class FakeCrewManager:
+    def __init__(self):
+        self.calls = 0
+
+    async def aprocess_query(self, user_query, context):
+        self.calls += 1
+        return {"success": True, "category": "foods", "city": "Agra", "recommendations": [], "run": self.calls}
+
+class CachedService(RecommendationService):
+    def __init__(self, cache):
+        super().__init__(cache=cache)
+        self.fake_crew = FakeCrewManager()
+
+    @property
+    def crew_manager(self):
+        return self.fake_crew
+
+def test_key_ignores_wording_case_and_city_aliases():
+    a = recommendation_key(sweets_in_agra(parameters={"category": "Sweets", "budget": "low"}))
+    b = recommendation_key(sweets_in_agra(cityName=" agra ", parameters={"budget": "LOW", "category": "sweets"}, confidence=0.2))
+    assert a == b
+    assert recommendation_key(QueryCategory(category="foods", cityName="Banaras")) == \
+        recommendation_key(QueryCategory(category="foods", cityName="Varanasi"))
+    assert recommendation_key(sweets_in_agra(cityName="Delhi")) != a
+
+def test_fresh_then_stale_then_expired():
+    cache = ResponseCache(ttl_seconds=0.05, stale_seconds=0.1)
+    cache.set(sweets_in_agra(), {"success": True})
+    assert cache.get(sweets_in_agra()).stale is False
+    time.sleep(0.07)
+    assert cache.get(sweets_in_agra()).stale is True
+    time.sleep(0.1)
+    assert cache.get(sweets_in_agra()) is None
+    assert cache.stats()["stale_hits"] == 1
+
+def test_lru_bound_and_category_invalidation():
+    cache = ResponseCache(backend=InMemoryResponseBackend(max_size=2))
+    for city in ("Agra", "Delhi", "Goa"):
+        cache.set(sweets_in_agra(cityName=city), {"city": city})
+    assert cache.get(sweets_in_agra(cityName="Agra")) is None
+    assert cache.stats()["evictions"] == 1
+
+    cache.set(QueryCategory(category="shopping", cityName="Goa"), {"city": "Goa"})
+    cache.invalidate("foods")
+    assert cache.get(sweets_in_agra(cityName="Goa")) is None
+    assert cache.get(QueryCategory(category="shopping", cityName="Goa")) is not None
+
+def test_service_serves_repeat_intents_from_cache():
+    service = CachedService(ResponseCache())
+
+    async def ask(query):
+        context = QueryContext(user_query=query, classification=sweets_in_agra())
+        return await service.aget_recommendations(query, context=context)
+
+    first = asyncio.run(ask("best sweets in Agra"))
+    second = asyncio.run(ask("where can I get sweets in agra?"))
+    assert service.fake_crew.calls == 1
+    assert "cache" not in first
+    assert second["cache"]["status"] == "hit"
+    assert second["run"] == 1
+    assert "cache" in second["stage_timings"]
+
+def test_stale_entry_is_served_and_revalidated_once():
+    cache = ResponseCache(ttl_seconds=0, stale_seconds=60)
+    service = CachedService(cache)
+
+    async def scenario():
+        context = QueryContext(user_query="sweets", classification=sweets_in_agra())
+        await service.aget_recommendations("sweets", context=context)
+        results = []
+        for _ in range(3):
+            context = QueryContext(user_query="sweets", classification=sweets_in_agra())
+            results.append(await service.aget_recommendations("sweets", context=context))
+        await asyncio.gather(*service._background_tasks)
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(result["cache"]["status"] == "stale" for result in results)
+    # One crew run to fill the cache plus one background revalidation
+    assert service.fake_crew.calls == 2
+    assert cache.get(sweets_in_agra()).value["run"] == 2
+
+def test_fallback_classifications_are_not_cached():
+    service = CachedService(ResponseCache())
+    context = QueryContext(user_query="sweets", classification=sweets_in_agra(tier="fallback"))
+    asyncio.run(service.aget_recommendations("sweets", context=context))
+    assert service.response_cache.get(sweets_in_agra()) is None
+
+def test_mutating_a_served_response_does_not_change_the_cache():
+    cache = ResponseCache()
+    cache.set(sweets_in_agra(), {"success": True, "full_data": [{"foodPlace": "Pinch of Spice", "images": []}]})
+
+    served = cache.get(sweets_in_agra()).value
+    served["full_data"][0]["images"].append("x.jpg")
+    served["full_data"].append({"foodPlace": "Injected"})
+
+    assert cache.get(sweets_in_agra()).value["full_data"] == [{"foodPlace": "Pinch of Spice", "images": []}]
+
+class SlowBackend(InMemoryResponseBackend):
+    """A networked backend stand-in: every call blocks its thread."""
+    name = "slow"
+    blocking = True
+
+    def get(self, key):
+        time.sleep(0.2)
+        return super().get(key)
+
+    def set(self, key, value, stored_at, expire_seconds):
+        time.sleep(0.2)
+        super().set(key, value, stored_at, expire_seconds)
+
+def test_blocking_backend_does_not_stall_the_event_loop():
+    service = CachedService(ResponseCache(backend=SlowBackend()))
+
+    async def scenario():
+        gaps = []
+        done = asyncio.Event()
+
+        async def ticker():
+            while not done.is_set():
+                started = time.perf_counter()
+                await asyncio.sleep(0.01)
+                gaps.append(time.perf_counter() - started)
+
+        ticks = asyncio.create_task(ticker())
+        context = QueryContext(user_query="sweets", classification=sweets_in_agra())
+        result = await service.aget_recommendations("sweets", context=context)
+        done.set()
+        await ticks
+        return result, gaps
+
+    result, gaps = asyncio.run(scenario())
+    assert result["success"] is True
+    # The lookup and the store each took 0.2s, yet the loop kept ticking
+    assert result["stage_timings"]["cache"] >= 0.2
+    assert max(gaps) < 0.1
@@ -0,0 +1,66 @@
+import pytest
+from pymongo import DESCENDING
+
+from yescity_recommendation_ai.database.collection_registry import DATA_COLLECTIONS
+from yescity_recommendation_ai.database import indexes
+from yescity_recommendation_ai.database.geo import GEO_COLLECTIONS
+from yescity_recommendation_ai.database.indexes import INDEX_REGISTRY
+from yescity_recommendation_ai.database.projections import (
+    FULL_VIEW_PROJECTIONS, LLM_VIEW_PROJECTIONS, NAME_FIELDS, get_name_field
+)
+from yescity_recommendation_ai.database.search_specs import (
+    SEARCH_SPECS, CollectionSpec, build_search_query, get_search_spec
+)
+from yescity_recommendation_ai.crew.yaml_loader import YAMLLoader
+
+def test_every_collection_has_a_spec_and_an_agent():
+    assert set(SEARCH_SPECS) == set(DATA_COLLECTIONS)
+    for spec in SEARCH_SPECS.values():
+        assert YAMLLoader.load_agent_config(spec.agent)["role"]
+
+def test_searchable_fields_and_rankings_are_indexed():
+    for spec in SEARCH_SPECS.values():
+        leading_keys = {spec_index.keys[:2] for spec_index in INDEX_REGISTRY[spec.collection]}
+        index_fields = {key for keys in leading_keys for key, _ in keys}
+        assert "cityName" in index_fields
+        for field in spec.fields:
+            if field.param == "category":
+                assert (("cityName", 1), ("category", 1)) in leading_keys
+        for field, direction in spec.ranking or ():
+            assert (("cityName", 1), (field, direction)) in leading_keys
+
+def test_indexes_names_and_projections_come_from_the_specs():
+    assert set(INDEX_REGISTRY) == set(NAME_FIELDS) == set(LLM_VIEW_PROJECTIONS) == set(SEARCH_SPECS)
+    for spec in SEARCH_SPECS.values():
+        assert get_name_field(spec.collection) == spec.name_field
+        assert spec.name_field in LLM_VIEW_PROJECTIONS[spec.collection]
+        assert FULL_VIEW_PROJECTIONS.get(spec.collection) == spec.full_view_projection()
+        has_location_index = any(index.name == "location_2dsphere" for index in INDEX_REGISTRY[spec.collection])
+        assert has_location_index == spec.geo == (spec.collection in GEO_COLLECTIONS)
+    assert get_name_field("foods") == "foodPlace"
+    assert "images" in FULL_VIEW_PROJECTIONS["foods"]
+
+def test_a_new_collection_is_declared_in_its_spec_only(monkeypatch):
+    spec = CollectionSpec(
+        "events", "events", "festivals and concerts",
+        name_field="title", indexes=((("cityName", 1), ("date", -1)),), geo=True, full_view=("_id", "title"),
+    )
+    monkeypatch.setattr(indexes, "SEARCH_SPECS", {"events": spec})
+
+    registry = indexes.build_index_registry("collation")
+    assert [index.name for index in registry["events"]] == ["cityName_date_ci", "location_2dsphere"]
+    assert spec.full_view_projection() == {"_id": 1, "title": 1}
+    assert spec.llm_view_projection()["title"] == 1
+
+def test_query_building_from_a_spec():
+    spec = get_search_spec("accommodations")
+    query_filter, collation, sort = build_search_query(spec, "Goa", {"category": "Hostel", "maxPrice": None})
+    assert query_filter == {"cityName": "Goa", "category": "Hostel"}
+    assert collation is not None
+    assert sort is None
+
+    assert build_search_query(get_search_spec("foods"), "Agra")[2] == [("compositeScore", DESCENDING)]
+    with pytest.raises(ValueError, match="Supported: category"):
+        build_search_query(spec, "Goa", {"flagship": "true"})
+    with pytest.raises(ValueError):
+        get_search_spec("restaurants")
@@ -0,0 +1,110 @@
+import os
+import re
+
+from bson import ObjectId
+
+# Tests run offline; keep litellm from fetching its model cost map in the background
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from yescity_recommendation_ai.crew.crew_manager import CATEGORY_TOOLS, crew_manager
+from yescity_recommendation_ai.database.projections import get_llm_view_projection
+from yescity_recommendation_ai.database.search_specs import SEARCH_SPECS, build_search_query
+from yescity_recommendation_ai.models.user_query import QueryCategory, QueryContext
+from yescity_recommendation_ai.tools import base_tool
+from yescity_recommendation_ai.tools.accomodation_tools import accommodation_search_tool
+from yescity_recommendation_ai.tools.food_tools import food_search_tool
+from yescity_recommendation_ai.tools.general_info_tools import city_info_search_tool
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, sort):
+        self.sorted_by = sort
+        return self
+
+    def limit(self, limit):
+        self.docs = self.docs[:limit]
+        return self
+
+    def __iter__(self):
+        return iter(self.docs)
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.filters = []
+        self.projections = []
+
+    def find(self, query_filter, projection=None, **kwargs):
+        self.filters.append(query_filter)
+        self.projections.append(projection)
+        return FakeCursor(list(self.docs))
+
+def test_generated_tool_runs_one_filtered_query(monkeypatch):
+    collection = FakeCollection([{"_id": ObjectId(), "name": f"Hostel {i}"} for i in range(5)])
+    monkeypatch.setattr(base_tool.mongodb_client, "get_collection", lambda name: collection)
+
+    results = accommodation_search_tool._run(cityName="Goa", category="Hostel", maxResults=2)
+
+    assert collection.filters == [{"cityName": "Goa", "category": "Hostel"}]
+    assert [doc["name"] for doc in results] == ["Hostel 0", "Hostel 1"]
+    assert isinstance(results[0]["_id"], str)
+    assert collection.projections == [get_llm_view_projection("accommodations")]
+
+class ExactMatchCollection(FakeCollection):
+    """Applies equality and regex conditions on category like MongoDB would."""
+
+    def find(self, query_filter, projection=None, **kwargs):
+        self.filters.append(query_filter)
+        condition = query_filter.get("category")
+        if isinstance(condition, dict):
+            pattern = re.compile(condition["$regex"], re.IGNORECASE)
+            docs = [doc for doc in self.docs if pattern.search(doc["category"])]
+        else:
+            docs = [doc for doc in self.docs if doc["category"].casefold() == condition.casefold()]
+        return FakeCursor(docs)
+
+STORED_FOOD_CATEGORIES = ["Sweets & Desserts", "Street Food", "Restaurant", "Cafe & Bakery"]
+
+def test_llm_category_falls_back_to_contained_words(monkeypatch):
+    collection = ExactMatchCollection([
+        {"_id": ObjectId(), "foodPlace": f"Place {i}", "category": category}
+        for i, category in enumerate(STORED_FOOD_CATEGORIES)
+    ])
+    monkeypatch.setattr(base_tool.mongodb_client, "get_collection", lambda name: collection)
+
+    results = food_search_tool._run(cityName="Agra", category="sweets")
+    assert [doc["category"] for doc in results] == ["Sweets & Desserts"]
+    assert len(collection.filters) == 2
+
+    collection.filters.clear()
+    results = food_search_tool._run(cityName="Agra", category="street food")
+    assert [doc["category"] for doc in results] == ["Street Food"]
+    assert len(collection.filters) == 1
+
+def test_veg_only_is_an_exact_match():
+    query_filter, collation, _ = build_search_query(SEARCH_SPECS["foods"], "Agra", {"vegOnly": True})
+    assert query_filter["vegOrNonVeg"] == "Veg"
+    assert collation is not None
+
+def test_generated_tool_reports_unsupported_filters():
+    results = city_info_search_tool._run(cityName="Goa", category="History")
+    assert "Unsupported filter" in results[0]["error"]
+
+def test_every_category_builds_a_crew():
+    assert len(CATEGORY_TOOLS) == 9
+    for category in CATEGORY_TOOLS:
+        context = QueryContext(
+            user_query=f"{category} in Goa",
+            classification=QueryCategory(category=category, cityName="Goa")
+        )
+        crew = crew_manager.create_crew(context)
+        assert "Goa" in crew.tasks[0].description
+        assert crew.agents[0].tools[0].name == CATEGORY_TOOLS[category][0].name
+
+def test_missing_city_is_reported_without_running_a_crew():
+    context = QueryContext(user_query="hostels", classification=QueryCategory(category="accommodations"))
+    result = crew_manager.process_query("hostels", context=context)
+    assert result["success"] is False
+    assert "places to stay" in result["error"]
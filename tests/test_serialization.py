@@ -0,0 +1,49 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from bson import Decimal128, ObjectId
+
+from yescity_recommendation_ai.utils import serialization
+from yescity_recommendation_ai.utils.serialization import BSONJSONResponse, dumps, to_jsonable
+
+def sample_doc():
+    return {
+        "_id": ObjectId("65a1b2c3d4e5f60718293a4b"),
+        "foodPlace": "Kashi Chat Bhandar",
+        "price": Decimal128("120.50"),
+        "updatedAt": datetime(2024, 1, 2, 3, 4, 5),
+        "reviews": [{"userId": ObjectId("65a1b2c3d4e5f60718293a4c"), "rating": 5}],
+        "tags": {"chaat"},
+    }
+
+def test_dumps_encodes_bson_types_in_place():
+    doc = sample_doc()
+    decoded = json.loads(dumps(doc))
+
+    assert decoded["_id"] == "65a1b2c3d4e5f60718293a4b"
+    assert decoded["price"] == 120.5
+    assert decoded["updatedAt"] == "2024-01-02T03:04:05"
+    assert decoded["reviews"][0]["userId"] == "65a1b2c3d4e5f60718293a4c"
+    assert decoded["tags"] == ["chaat"]
+    # The source document is not modified
+    assert isinstance(doc["_id"], ObjectId)
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    expected = json.loads(dumps(sample_doc()))
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert json.loads(dumps(sample_doc())) == expected
+
+def test_unknown_types_are_rejected():
+    with pytest.raises(TypeError):
+        dumps({"value": object()})
+
+def test_to_jsonable_and_response_render():
+    assert to_jsonable({"_id": ObjectId("65a1b2c3d4e5f60718293a4b"), "n": Decimal("1.5")}) == {
+        "_id": "65a1b2c3d4e5f60718293a4b", "n": 1.5
+    }
+
+    response = BSONJSONResponse({"data": [sample_doc()]})
+    assert response.media_type == "application/json"
+    assert json.loads(response.body)["data"][0]["foodPlace"] == "Kashi Chat Bhandar"
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from yescity_recommendation_ai.models.user_query import QueryCategory, QueryContext
+from yescity_recommendation_ai.services.recommendation_service import RecommendationService
+from yescity_recommendation_ai.services.response_cache import ResponseCache
+from yescity_recommendation_ai.services.single_flight import SingleFlight
+
+def test_concurrent_async_callers_share_one_run():
+    flights = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"value": 42}
+
+    async def scenario():
+        return await asyncio.gather(*[flights.ado("foods:agra", compute) for _ in range(10)])
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [shared for _, shared in results].count(False) == 1
+    assert all(result == {"value": 42} for result, _ in results)
+    assert flights.stats()["coalesced"] == 9
+    assert flights.stats()["in_flight"] == 0
+
+def test_followers_get_the_leaders_error():
+    flights = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("crew failed")
+
+    async def scenario():
+        return await asyncio.gather(*[flights.ado("k", compute) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flights.stats()["errors"] == 1
+
+    # Nothing is remembered once the flight lands
+    async def ok():
+        return "ok"
+    assert asyncio.run(flights.ado("k", ok)) == ("ok", False)
+
+def test_cancelled_leader_does_not_cancel_followers():
+    flights = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        leader = asyncio.create_task(flights.ado("k", compute))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flights.ado("k", compute)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return results
+
+    assert asyncio.run(scenario()) == [("done", True), ("done", True)]
+    assert len(calls) == 1
+    assert flights.stats()["in_flight"] == 0
+
+def test_work_is_cancelled_once_every_caller_is():
+    flights = SingleFlight()
+    cancelled = []
+
+    async def compute():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return "late"
+
+    async def ok():
+        return "ok"
+
+    async def scenario():
+        callers = [asyncio.create_task(flights.ado("k", compute)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        # A new caller starts its own computation instead of joining the cancelled one
+        return await flights.ado("k", ok)
+
+    assert asyncio.run(scenario()) == ("ok", False)
+    assert cancelled == [1]
+    assert flights.stats()["errors"] == 0
+
+class SlowCrewManager:
+    def __init__(self):
+        self.calls = 0
+
+    async def aprocess_query(self, user_query, context):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return {"success": True, "category": "foods", "recommendations": []}
+
+class CoalescingService(RecommendationService):
+    def __init__(self):
+        super().__init__(cache=ResponseCache(), flights=SingleFlight())
+        self.fake_crew = SlowCrewManager()
+
+    @property
+    def crew_manager(self):
+        return self.fake_crew
+
+def test_service_coalesces_identical_intents():
+    service = CoalescingService()
+
+    async def ask(query, city):
+        classification = QueryCategory(category="foods", cityName=city, parameters={"category": "Sweets"})
+        context = QueryContext(user_query=query, classification=classification)
+        return await service.aget_recommendations(query, context=context)
+
+    async def scenario():
+        return await asyncio.gather(
+            ask("best sweets in Agra", "Agra"),
+            ask("sweets agra", "agra"),
+            ask("sweets in Agra please", "Agra"),
+            ask("best sweets in Delhi", "Delhi"),
+        )
+
+    results = asyncio.run(scenario())
+    assert service.fake_crew.calls == 2
+    assert sum("coalesced" in result["stage_timings"] for result in results) == 2
+    assert service.flights.stats()["coalesced"] == 2
+    # Each caller finalized its own copy
+    assert len({id(result) for result in results}) == 4
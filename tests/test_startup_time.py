@@ -0,0 +1,57 @@
+"""
+Import-time budget for the API process.
+
+Run directly for a breakdown of the slowest imports:
+    python tests/test_startup_time.py
+"""
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+API_MODULE = "yescity_recommendation_ai.api.routes"
+HEAVY_MODULES = ("crewai", "litellm", "langchain_community")
+
+# Cumulative import time allowed for the router (about 0.65s measured; crewai alone is ~6s)
+IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "2000"))
+
+def measure_imports(module: str = API_MODULE) -> Tuple[List[Tuple[str, float]], List[str]]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        (module, cumulative ms) pairs and the heavy modules that got imported
+    """
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    env = {key: value for key, value in os.environ.items() if key != "MONGODB_URI"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, check=True
+    )
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        timings.append((name.strip(), int(cumulative) / 1000))
+    heavy = [name for name in result.stdout.strip().split(",") if name]
+    return timings, heavy
+
+def test_router_import_stays_within_budget():
+    timings, _ = measure_imports()
+    total_ms = dict(timings)[API_MODULE]
+    assert total_ms < IMPORT_BUDGET_MS, f"{API_MODULE} took {total_ms:.0f}ms to import (budget {IMPORT_BUDGET_MS:.0f}ms)"
+
+def test_router_import_skips_heavy_dependencies():
+    _, heavy = measure_imports()
+    assert heavy == []
+
+if __name__ == "__main__":
+    timings, heavy = measure_imports()
+    for name, cumulative_ms in sorted(timings, key=lambda item: item[1], reverse=True)[:20]:
+        print(f"{cumulative_ms:10.1f}ms  {name}")
+    print(f"Heavy modules imported: {heavy or 'none'}")